@@ -0,0 +1,174 @@
+"""
+Request interception for PDF renders: a content-addressed on-disk cache for
+immutable static assets and a block list for analytics/Firebase requests that
+never affect the printed page (and keep the network from going idle).
+
+Objects are stored as <cache_dir>/objects/<sha[:2]>/<sha>; index.json maps
+each URL to the object hash and the response headers needed to replay it.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from urllib.parse import urlsplit
+
+try:
+    from playwright.sync_api import Error as PlaywrightError
+except ImportError:  # Only Playwright routes ever reach AssetCache.handle()
+    PlaywrightError = Exception
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'pdf-assets')
+
+BLOCKED_HOSTS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'firebase.googleapis.com',
+    'firebaseinstallations.googleapis.com',
+    'firebaselogging.googleapis.com',
+    'firebaselogging-pa.googleapis.com',
+)
+CACHEABLE_TYPES = ('font', 'image', 'stylesheet', 'script')
+# Webpack emits content-hashed names (main.1a2b3c4d.js, KaTeX_Main.5e6f7a8b.woff2)
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}\.(?:chunk\.)?[a-z0-9]+$')
+REPLAYED_HEADERS = ('content-type', 'cache-control', 'access-control-allow-origin')
+
+
+def is_blocked(url):
+    """True for analytics and Firebase hosts"""
+    host = urlsplit(url).hostname or ''
+    return any(host == blocked or host.endswith(f".{blocked}") for blocked in BLOCKED_HOSTS)
+
+
+def is_cacheable(request, origin):
+    """Cache only responses that cannot change under the same URL.
+
+    Local assets qualify when webpack put a content hash in their name;
+    cross-origin fonts, styles and images (CDNs) are treated as versioned.
+    """
+    if request.method != 'GET' or request.resource_type not in CACHEABLE_TYPES:
+        return False
+    parts = urlsplit(request.url)
+    if parts.scheme not in ('http', 'https'):
+        return False
+    if HASHED_NAME.search(parts.path):
+        return True
+    return f"{parts.scheme}://{parts.netloc}" != origin and request.resource_type != 'script'
+
+
+class AssetCache:
+    """Playwright route handler backed by a content-addressed store"""
+
+    def __init__(self, cache_dir=CACHE_DIR, block=True):
+        self.cache_dir = cache_dir
+        self.block = block
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'blocked': 0, 'passthrough': 0, 'failed': 0, 'bytes_saved': 0}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.index = {}
+
+    def object_path(self, digest):
+        return os.path.join(self.cache_dir, 'objects', digest[:2], digest)
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def lookup(self, url):
+        """Return (headers, body) for a cached URL, or None"""
+        with self.lock:
+            entry = self.index.get(url)
+        if not entry:
+            return None
+        try:
+            with open(self.object_path(entry['sha256']), 'rb') as f:
+                return entry['headers'], f.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, url, headers, body):
+        """Write the body once per distinct content and point `url` at it"""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        kept = {name: value for name, value in headers.items() if name.lower() in REPLAYED_HEADERS}
+        with self.lock:
+            self.index[url] = {'sha256': digest, 'headers': kept}
+
+    def save(self):
+        """Persist the URL index, keeping entries another process saved meanwhile"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                on_disk = json.load(f)
+        except (FileNotFoundError, ValueError):
+            on_disk = {}
+        with self.lock:
+            data = json.dumps(on_disk | self.index, indent=1, sort_keys=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.index_path)
+
+    def attach(self, context, origin):
+        """Route every request made by `context` through this cache"""
+        context.route('**/*', lambda route: self.handle(route, origin))
+
+    def handle(self, route, origin):
+        request = route.request
+        if self.block and is_blocked(request.url):
+            self.count('blocked')
+            route.abort()
+            return
+        if not is_cacheable(request, origin):
+            self.count('passthrough')
+            route.continue_()
+            return
+
+        cached = self.lookup(request.url)
+        if cached:
+            headers, body = cached
+            self.count('hits')
+            self.count('bytes_saved', len(body))
+            route.fulfill(status=200, headers=headers, body=body)
+            return
+
+        self.count('misses')
+        try:
+            response = route.fetch()
+            body = response.body()
+        except PlaywrightError:
+            # Reset, timed out or the server is going away: let the browser
+            # try the request itself rather than leave the route unanswered
+            self.count('failed')
+            try:
+                route.continue_()
+            except PlaywrightError:
+                route.abort()
+            return
+        if response.status == 200:
+            self.store(request.url, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    def summary(self):
+        stats = self.stats
+        lookups = stats['hits'] + stats['misses']
+        hit_rate = 100 * stats['hits'] / lookups if lookups else 0
+        return (
+            f"{stats['hits']} hits, {stats['misses']} misses ({hit_rate:.0f}% hit rate), "
+            f"{stats['blocked']} blocked, {stats['passthrough']} passed through, {stats['failed']} failed fetches, "
+            f"{stats['bytes_saved'] / (1024 * 1024):.1f} MB served from cache"
+        )
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the blog PDF pipeline
+Generates fixture articles (math-heavy, image-heavy, table-heavy and
+long-form), serves them locally and runs the full generate, zip and index
+path of generate_blog_pdfs.py against them. No network access is needed.
+
+Results are written as JSON so runs can be compared between commits:
+    python scripts/benchmark_blog_pdfs.py [--workers N] [--copies N]
+    python scripts/benchmark_blog_pdfs.py --compare .cache/pdf-benchmarks/<old>.json
+
+Arguments after `--` are passed to the generator (e.g. -- --optimize).
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+
+import generate_blog_pdfs as generator
+from browser_memory import chromium_rss
+from pdf_catalog import count_pdf_pages
+from pdf_trace import percentile
+from static_build_server import serve_build
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+RESULTS_DIR = os.path.join(PROJECT_ROOT, '.cache', 'pdf-benchmarks')
+
+PAGE_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+    <style>
+        body {{ font-family: Georgia, serif; max-width: 760px; margin: 2rem auto; line-height: 1.6; }}
+        .katex {{ font-family: 'Times New Roman', serif; font-style: italic; white-space: nowrap; }}
+        .katex .mfrac {{ display: inline-flex; flex-direction: column; vertical-align: middle; }}
+        .katex .mfrac > span:first-child {{ border-bottom: 1px solid; }}
+        .katex-display {{ display: block; text-align: center; margin: 1em 0; }}
+        table {{ border-collapse: collapse; width: 100%; margin: 1em 0; }}
+        td, th {{ border: 1px solid #ccc; padding: 4px 8px; }}
+        img {{ max-width: 100%; display: block; margin: 1em auto; }}
+    </style>
+</head>
+<body>
+    <h1>{title}</h1>
+    <date>01 Jan 2025</date>
+{body}
+</body>
+</html>
+'''
+
+WORDS = (
+    'gravity orbit period stretch shift function tangent branch limit portal '
+    'sorting demon velocity kinetic entropy pipeline memory registry render'
+).split()
+
+
+def paragraph(rng, words=80):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def equation(rng):
+    """Markup shaped like KaTeX output: nested spans and fractions"""
+    a, b = rng.randint(1, 99), rng.randint(1, 99)
+    return (
+        f'<span class="katex"><span class="mord">x</span><span class="mbin">+</span>'
+        f'<span class="mfrac"><span>{a}</span><span>{b}</span></span>'
+        f'<span class="mrel">=</span><span class="mord">tan(x/{a} &minus; {b})</span></span>'
+    )
+
+
+def png_bytes(width, height, rng, noisy):
+    """Encode an RGB PNG; noisy images behave like photos, the rest like figures"""
+    rows = []
+    base = bytes(range(256)) * (width * 3 // 256 + 2)
+    for y in range(height):
+        row = rng.randbytes(width * 3) if noisy else base[y % 256:y % 256 + width * 3]
+        rows.append(b'\0' + row)
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(b''.join(rows), 6)) + chunk(b'IEND', b''))
+
+
+def fixture_math(rng, article_dir):
+    parts = []
+    for _ in range(30):
+        inline = ' '.join(equation(rng) for _ in range(6))
+        parts.append(f'    <p>{paragraph(rng, 30)} {inline}</p>')
+        parts.append(f'    <div class="katex-display">{equation(rng)}</div>')
+    return '\n'.join(parts)
+
+
+def fixture_images(rng, article_dir):
+    parts = []
+    for i in range(12):
+        name = f'figure-{i}.png'
+        with open(os.path.join(article_dir, name), 'wb') as f:
+            f.write(png_bytes(800, 600, rng, noisy=i % 2 == 0))
+        parts.append(f'    <p>{paragraph(rng, 40)}</p>\n    <img src="{name}" alt="Figure {i}">')
+    return '\n'.join(parts)
+
+
+def fixture_tables(rng, article_dir):
+    parts = []
+    for _ in range(15):
+        rows = '\n'.join(
+            '        <tr>' + ''.join(f'<td>{rng.random():.4f}</td>' for _ in range(6)) + '</tr>'
+            for _ in range(40)
+        )
+        header = ''.join(f'<th>{rng.choice(WORDS)}</th>' for _ in range(6))
+        parts.append(f'    <p>{paragraph(rng, 40)}</p>\n    <table>\n        <tr>{header}</tr>\n{rows}\n    </table>')
+    return '\n'.join(parts)
+
+
+def fixture_long_form(rng, article_dir):
+    parts = []
+    for section in range(40):
+        parts.append(f'    <h2>Section {section + 1}</h2>')
+        parts.extend(f'    <p>{paragraph(rng, 120)}</p>' for _ in range(8))
+    return '\n'.join(parts)
+
+
+FIXTURES = {
+    'math-heavy': fixture_math,
+    'image-heavy': fixture_images,
+    'table-heavy': fixture_tables,
+    'long-form': fixture_long_form,
+}
+
+
+def build_fixtures(site_dir, copies):
+    """Write fixture pages under site_dir/blog and a matching registry"""
+    os.makedirs(os.path.join(site_dir, 'blog'), exist_ok=True)
+    with open(os.path.join(site_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write('<!DOCTYPE html><title>fixtures</title>')
+
+    entries = []
+    for copy in range(copies):
+        for kind, build in FIXTURES.items():
+            slug = f'{kind}-{copy + 1}'
+            article_dir = os.path.join(site_dir, 'blog', slug)
+            os.makedirs(article_dir, exist_ok=True)
+            rng = random.Random(f'{slug}')
+            title = f'Fixture: {kind} #{copy + 1}'
+            with open(os.path.join(article_dir, 'index.html'), 'w', encoding='utf-8') as f:
+                f.write(PAGE_TEMPLATE.format(title=title, body=build(rng, article_dir)))
+            entries.append({'slug': slug, 'title': title, 'date': '01 Jan 2025', 'fileName': f'{slug}/index.html'})
+
+    registry_path = os.path.join(site_dir, 'blog-registry.json')
+    with open(registry_path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=2)
+    return registry_path
+
+
+class RssSampler(threading.Thread):
+    """Poll Chromium RSS in the background and keep the peak"""
+
+    def __init__(self, interval=0.2):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+        self.available = os.path.isdir('/proc')
+
+    def run(self):
+        while self.available and not self.stopped.is_set():
+            self.peak = max(self.peak, chromium_rss())
+            self.stopped.wait(self.interval)
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        return self.peak if self.available else None
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_benchmark(workspace, workers, copies, generator_args):
+    site_dir = os.path.join(workspace, 'site')
+    output_dir = os.path.join(workspace, 'pdfs')
+    report_dir = os.path.join(workspace, 'report')
+    registry_path = build_fixtures(site_dir, copies)
+
+    with serve_build(site_dir) as base_url:
+        argv = [
+            '--force', '--workers', str(workers),
+            '--base-url', f'{base_url}blog/',
+            '--registry', registry_path,
+            '--output-dir', output_dir,
+            '--report-dir', report_dir,
+            '--asset-cache-dir', os.path.join(workspace, 'asset-cache'),
+            '--history', os.path.join(workspace, 'render-history.json'),
+        ] + generator_args
+        sampler = RssSampler()
+        sampler.start()
+        started = time.perf_counter()
+        ok = generator.main(argv)
+        wall = time.perf_counter() - started
+        peak_rss = sampler.stop()
+
+    with open(os.path.join(report_dir, 'render-report.json'), 'r', encoding='utf-8') as f:
+        report = json.load(f)
+
+    # Every render counts; a slug rendered more than once contributes each sample
+    latencies = {}
+    for span in report['spans']:
+        if span['stage'] == 'article' and not span.get('args', {}).get('retry'):
+            latencies.setdefault(span['slug'], []).append(span['duration'])
+    pdfs = sorted(name for name in os.listdir(output_dir) if name.endswith('.pdf'))
+    pages = sum(count_pdf_pages(os.path.join(output_dir, name)) for name in pdfs)
+    pdf_bytes = sum(os.path.getsize(os.path.join(output_dir, name)) for name in pdfs)
+    values = [duration for durations in latencies.values() for duration in durations] or [0]
+
+    return {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'ok': ok,
+        'config': {'workers': workers, 'copies': copies, 'generator_args': generator_args},
+        'wall_seconds': wall,
+        'articles': len(pdfs),
+        'pages': pages,
+        'articles_per_minute': 60 * len(pdfs) / wall,
+        'pages_per_minute': 60 * pages / wall,
+        'latency_seconds': {
+            'p50': percentile(values, 0.5),
+            'p95': percentile(values, 0.95),
+            'max': max(values),
+            'mean': sum(values) / len(values),
+        },
+        'per_article_seconds': latencies,
+        'stages': report['stages'],
+        'chromium_peak_rss_mb': peak_rss / (1024 * 1024) if peak_rss is not None else None,
+        'output_bytes': {
+            'pdfs': pdf_bytes,
+            'zip': os.path.getsize(os.path.join(output_dir, 'all-blog-pdfs.zip')),
+            'index': os.path.getsize(os.path.join(output_dir, 'index.html')),
+        },
+    }
+
+
+COMPARED = (
+    ('wall_seconds', 'Wall time (s)', False),
+    ('pages_per_minute', 'Pages/minute', True),
+    ('articles_per_minute', 'Articles/minute', True),
+    ('latency_seconds.p50', 'Latency p50 (s)', False),
+    ('latency_seconds.p95', 'Latency p95 (s)', False),
+    ('chromium_peak_rss_mb', 'Chromium peak RSS (MB)', False),
+    ('output_bytes.pdfs', 'PDF bytes', False),
+    ('output_bytes.zip', 'Zip bytes', False),
+)
+
+
+def lookup(results, dotted):
+    value = results
+    for key in dotted.split('.'):
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def print_results(results, baseline=None):
+    print("\n" + "=" * 60)
+    print(f"BENCHMARK ({results['revision']})")
+    print("=" * 60)
+    for key, label, higher_is_better in COMPARED:
+        value = lookup(results, key)
+        if value is None:
+            continue
+        line = f"{label:<24} {value:>12.2f}"
+        old = lookup(baseline, key) if baseline else None
+        if old:
+            change = 100 * (value - old) / old
+            worse = change < 0 if higher_is_better else change > 0
+            line += f"   vs {old:>10.2f} ({change:+.1f}%{' ⚠' if worse and abs(change) > 5 else ''})"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the blog PDF pipeline on offline fixtures")
+    parser.add_argument('--workers', type=int, default=generator.DEFAULT_WORKERS)
+    parser.add_argument('--copies', type=int, default=2, help="copies of each fixture article (default: 2)")
+    parser.add_argument('--output', help=f"results file (default: {RESULTS_DIR}/<revision>-<time>.json)")
+    parser.add_argument('--compare', metavar='RESULTS', help="earlier results file to compare against")
+    parser.add_argument('--keep', action='store_true', help="keep the temporary workspace")
+    parser.add_argument('generator_args', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+    generator_args = [arg for arg in args.generator_args if arg != '--']
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    workspace = tempfile.mkdtemp(prefix='blog-pdf-bench-')
+    try:
+        results = run_benchmark(workspace, args.workers, args.copies, generator_args)
+    finally:
+        if args.keep:
+            print(f"Workspace kept at {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{results['revision']}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    print_results(results, baseline)
+    print(f"\nResults: {output}")
+    return results['ok']
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
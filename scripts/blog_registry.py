@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Load the blog registry straight from src/blog/*/*.mdx
+Extracts slug, title and date the same way scripts/refreshBlogRegistry.js
+does, so the Python tooling does not depend on the generated
+blog-registry.js. Articles are parsed in parallel and cached by file mtime
+and size, so an unchanged blog costs one stat per article.
+
+Usage:
+    python scripts/blog_registry.py [--write-json] [--no-cache]
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+BLOG_DIR = os.path.join(PROJECT_ROOT, 'src', 'blog')
+JSON_REGISTRY_PATH = os.path.join(PROJECT_ROOT, 'src', 'components', 'BlogShell', 'blog-registry.json')
+CACHE_PATH = os.path.join(PROJECT_ROOT, '.cache', 'blog-registry-cache.json')
+CACHE_VERSION = 1
+
+DATE_REGEX = re.compile(r'<date>(.*)</date>')
+# Formats Date.parse() accepts in the existing articles ("5 December 2025", "28 Feb 2026")
+DATE_FORMATS = ('%d %b %Y', '%d %B %Y', '%Y-%m-%d', '%B %d, %Y', '%b %d, %Y')
+DISPLAY_DATE_FORMAT = '%d %b %Y'  # moment's 'DD MMM YYYY'
+
+
+def parse_date(value):
+    value = value.strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    raise ValueError(f"unrecognised date {value!r}")
+
+
+def find_articles(blog_dir=BLOG_DIR):
+    """Relative posix paths of every .mdx file under blog_dir"""
+    paths = []
+    for root, dirs, files in os.walk(blog_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith('.mdx'):
+                relative = os.path.relpath(os.path.join(root, name), blog_dir)
+                paths.append(relative.replace(os.sep, '/'))
+    return paths
+
+
+def parse_article(blog_dir, file_name):
+    """Extract {slug, title, date, fileName} like refreshBlogRegistry.js"""
+    with open(os.path.join(blog_dir, file_name), 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+
+    slug = file_name.split('/')[0]
+    title_lines = [line for line in lines if line.startswith('# ')]
+    date_lines = [line for line in lines if DATE_REGEX.search(line)]
+    if not title_lines:
+        raise ValueError(f"{file_name} title is empty")
+    if not date_lines:
+        raise ValueError(f"{file_name} date is empty or invalid")
+
+    title = title_lines[0].split('# ')[1].strip()
+    try:
+        date = parse_date(DATE_REGEX.search(date_lines[0]).group(1))
+    except ValueError:
+        raise ValueError(f"{file_name} date is empty or invalid")
+    if not slug:
+        raise ValueError(f"{file_name} slug is empty")
+    if not title:
+        raise ValueError(f"{file_name} title is empty")
+
+    return {
+        'slug': slug,
+        'title': title,
+        'date': date.strftime(DISPLAY_DATE_FORMAT),
+        'fileName': file_name,
+    }
+
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return cache.get('entries', {}) if cache.get('version') == CACHE_VERSION else {}
+
+
+def save_cache(cache_path, entries):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'entries': entries}, f)
+    os.replace(tmp_path, cache_path)
+
+
+def load_registry(blog_dir=BLOG_DIR, cache_path=CACHE_PATH, workers=8):
+    """Return registry entries sorted newest first.
+
+    With a cache_path, files whose mtime and size are unchanged are not
+    re-read; pass cache_path=None to parse everything.
+    """
+    cached = load_cache(cache_path) if cache_path else {}
+    entries = {}
+    stale = []
+    for file_name in find_articles(blog_dir):
+        stat = os.stat(os.path.join(blog_dir, file_name))
+        key = [stat.st_mtime_ns, stat.st_size]
+        hit = cached.get(file_name)
+        if hit and hit['key'] == key:
+            entries[file_name] = hit
+        else:
+            stale.append((file_name, key))
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(stale)))) as pool:
+            parsed = pool.map(lambda item: parse_article(blog_dir, item[0]), stale)
+            for (file_name, key), entry in zip(stale, parsed):
+                entries[file_name] = {'key': key, 'entry': entry}
+
+    if cache_path and (stale or set(cached) != set(entries)):
+        save_cache(cache_path, entries)
+
+    items = [cached_entry['entry'] for cached_entry in entries.values()]
+    return sorted(items, key=lambda item: (-parse_date(item['date']).toordinal(), item['slug']))
+
+
+def write_json_registry(items, path=JSON_REGISTRY_PATH):
+    """Write the registry in the shape refreshBlogRegistry.js emits"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(items, indent=2, ensure_ascii=False) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the blog registry from src/blog")
+    parser.add_argument('--write-json', action='store_true', help=f"write {JSON_REGISTRY_PATH}")
+    parser.add_argument('--no-cache', action='store_true', help="re-parse every article")
+    args = parser.parse_args()
+
+    items = load_registry(cache_path=None if args.no_cache else CACHE_PATH)
+    for item in items:
+        print(f"{item['date']}  {item['slug']}: {item['title']}")
+    if args.write_json:
+        write_json_registry(items)
+        print(f"✓ Wrote {len(items)} entries to {JSON_REGISTRY_PATH}")
+
+
+if __name__ == "__main__":
+    main()
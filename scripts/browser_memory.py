@@ -0,0 +1,120 @@
+"""
+Chromium memory accounting from /proc (Linux only)
+
+MemoryMonitor follows one browser's process tree from a background thread
+so the generator can record each article's peak RSS and recycle contexts
+that grow past a ceiling. On other platforms every reading is None and
+only count-based recycling applies.
+"""
+
+import os
+import threading
+
+PROC_AVAILABLE = os.path.isdir('/proc')
+
+
+def process_tree():
+    """{pid: (ppid, name, rss_bytes)} for every process visible in /proc"""
+    processes = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+            with open(f'/proc/{entry}/statm', 'r') as f:
+                resident_pages = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        name = stat[stat.index('(') + 1:stat.rindex(')')]
+        ppid = int(stat[stat.rindex(')') + 2:].split()[1])
+        processes[int(entry)] = (ppid, name, resident_pages * os.sysconf('SC_PAGE_SIZE'))
+    return processes
+
+
+def descendants(processes, root):
+    """`root` and every process below it"""
+    found = {root}
+    changed = True
+    while changed:
+        changed = False
+        for pid, (ppid, _, _) in processes.items():
+            if ppid in found and pid not in found:
+                found.add(pid)
+                changed = True
+    return found
+
+
+def chromium_rss():
+    """Total RSS of Chromium processes started by this process (Linux only)"""
+    processes = process_tree()
+    tree = descendants(processes, os.getpid())
+    return sum(
+        rss for pid, (_, name, rss) in processes.items()
+        if pid in tree and ('chrom' in name.lower() or 'headless' in name.lower())
+    )
+
+
+def browser_pid(browser):
+    """PID of a Chromium browser's main process, or None if unavailable"""
+    try:
+        cdp = browser.new_browser_cdp_session()
+        try:
+            info = cdp.send('SystemInfo.getProcessInfo')
+        finally:
+            cdp.detach()
+    except Exception:
+        return None
+    for process in info.get('processInfo', []):
+        if process.get('type') == 'browser':
+            return process['id']
+    return None
+
+
+class MemoryMonitor(threading.Thread):
+    """Sample the RSS of a browser's process tree and keep the peak"""
+
+    def __init__(self, root_pid, interval=0.25):
+        super().__init__(daemon=True)
+        self.root_pid = root_pid
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.current = None
+        self.peak = None
+        self.stopped = threading.Event()
+
+    @classmethod
+    def start_for(cls, browser):
+        """Start monitoring `browser`; None where RSS cannot be measured"""
+        root_pid = browser_pid(browser) if PROC_AVAILABLE else None
+        if root_pid is None:
+            return None
+        monitor = cls(root_pid)
+        monitor.sample()
+        monitor.start()
+        return monitor
+
+    def sample(self):
+        processes = process_tree()
+        if self.root_pid not in processes:
+            return None
+        rss = sum(processes[pid][2] for pid in descendants(processes, self.root_pid))
+        with self.lock:
+            self.current = rss
+            self.peak = rss if self.peak is None else max(self.peak, rss)
+        return rss
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def take_peak(self):
+        """Peak RSS since the last call (sampling once more now)"""
+        self.sample()
+        with self.lock:
+            peak, self.peak = self.peak, self.current
+        return peak
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
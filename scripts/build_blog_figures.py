@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Build the figures drawn by Python scripts under src/blog
+Every .py file in an article directory that calls savefig() or
+export_figure() is a figure script; it is run in its own directory, as when
+run by hand, and writes its images next to itself. Scripts run in parallel
+subprocesses, slowest first (from the previous run's times).
+
+A script is skipped when its source, the sibling helper modules it imports
+(e.g. tan_sampling.py) and its output images are unchanged since the last
+successful run; the hashes are kept in .cache/blog-figures.json.
+
+Pass --watch to keep one process with numpy, matplotlib and the fonts
+loaded after the build and re-render a figure as soon as its script or one
+of its helpers is saved, reporting import, compute and savefig time.
+
+Usage:
+    python scripts/build_blog_figures.py [PATH ...] [--jobs N] [--force] [--timeout SECONDS] [--watch]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from figure_export import MANIFEST_SUFFIX
+from source_watcher import snapshot, wait_for_changes
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+BLOG_DIR = os.path.join(PROJECT_ROOT, 'src', 'blog')
+CACHE_PATH = os.path.join(PROJECT_ROOT, '.cache', 'blog-figures.json')
+CACHE_VERSION = 1
+DEFAULT_JOBS = os.cpu_count() or 1
+DEFAULT_TIMEOUT = 300
+
+FIGURE_CALL = re.compile(r'\b(?:savefig|export_figure)\(')
+IMPORT = re.compile(r'^\s*(?:from\s+(\w+)\s+import|import\s+(\w+))', re.M)
+OUTPUT_NAME = re.compile(r'''["']([\w.-]+\.(?:png|svg|webp|avif|jpe?g|pdf))["']''')
+MANIFEST_IMPORT = re.compile(r"^import \w+ from '\./([^']+)';$", re.M)
+IMAGE_EXTENSIONS = ('.png', '.svg', '.webp', '.avif', '.jpg', '.jpeg', '.pdf', '.pyc')
+
+
+def read_source(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def find_figure_scripts(paths):
+    """Every .py file under `paths` that saves or exports a matplotlib figure"""
+    scripts = []
+    for path in paths:
+        if os.path.isfile(path):
+            candidates = [path]
+        else:
+            candidates = []
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d != '__pycache__' and not d.startswith('.'))
+                candidates += [os.path.join(root, name) for name in sorted(files) if name.endswith('.py')]
+        scripts += [os.path.abspath(p) for p in candidates if FIGURE_CALL.search(read_source(p))]
+    return scripts
+
+
+def local_imports(script, source):
+    """Sibling modules `script` imports, followed transitively"""
+    directory = os.path.dirname(script)
+    found = []
+    pending = [source]
+    while pending:
+        for match in IMPORT.finditer(pending.pop()):
+            path = os.path.join(directory, f"{match.group(1) or match.group(2)}.py")
+            if path != script and path not in found and os.path.isfile(path):
+                found.append(path)
+                pending.append(read_source(path))
+    return sorted(found)
+
+
+def expected_outputs(script, source):
+    """Image files the script writes, from the file names in its source
+
+    When a figure was exported with figure_export.py, its manifest and every
+    variant the manifest imports count as outputs too.
+    """
+    directory = os.path.dirname(script)
+    names = sorted(set(OUTPUT_NAME.findall(source)))
+    if not names:
+        names = [f"{os.path.splitext(os.path.basename(script))[0]}.png"]
+    outputs = []
+    for name in names:
+        outputs.append(os.path.join(directory, name))
+        manifest = os.path.join(directory, f"{os.path.splitext(name)[0]}{MANIFEST_SUFFIX}")
+        if os.path.exists(manifest):
+            outputs.append(manifest)
+            variants = MANIFEST_IMPORT.findall(read_source(manifest))
+            outputs += [os.path.join(directory, variant) for variant in variants if variant != name]
+    return outputs
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def input_hash(script, helpers):
+    """Hash the script and its helper modules (names and contents)"""
+    digest = hashlib.sha256()
+    for path in [script] + helpers:
+        digest.update(os.path.relpath(path, PROJECT_ROOT).replace(os.sep, '/').encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(hash_file(path).encode('ascii'))
+    return digest.hexdigest()
+
+
+def load_cache(path=CACHE_PATH):
+    """{script: {'inputs', 'outputs': {name: sha256}, 'seconds'}} from the last builds"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return data.get('scripts', {}) if data.get('version') == CACHE_VERSION else {}
+
+
+def save_cache(scripts, path=CACHE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_VERSION, 'scripts': scripts}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def is_up_to_date(entry, inputs, outputs):
+    """True if the inputs match the last build and its outputs are untouched"""
+    if not entry or entry.get('inputs') != inputs:
+        return False
+    recorded = entry.get('outputs', {})
+    for path in outputs:
+        name = os.path.basename(path)
+        if name not in recorded or not os.path.exists(path) or hash_file(path) != recorded[name]:
+            return False
+    return True
+
+
+def record_build(cache, key, inputs, outputs, seconds=None):
+    """Store a successful build; `seconds` of None keeps the previous time, if any"""
+    previous = cache.get(key, {}).get('seconds')
+    cache[key] = {
+        'inputs': inputs,
+        'outputs': {os.path.basename(path): hash_file(path) for path in outputs},
+    }
+    if seconds is not None or previous is not None:
+        cache[key]['seconds'] = round(seconds, 3) if seconds is not None else previous
+
+
+def run_script(script, timeout):
+    """Run one figure script; returns (ok, seconds, error message)"""
+    env = dict(os.environ, MPLBACKEND='Agg', PYTHONDONTWRITEBYTECODE='1')
+    start = time.monotonic()
+    try:
+        result = subprocess.run(
+            [sys.executable, os.path.basename(script)],
+            cwd=os.path.dirname(script), env=env, capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return False, time.monotonic() - start, f"timed out after {timeout}s"
+    seconds = time.monotonic() - start
+    if result.returncode != 0:
+        lines = (result.stderr or result.stdout).strip().splitlines()
+        return False, seconds, lines[-1] if lines else f"exit status {result.returncode}"
+    return True, seconds, None
+
+
+def build_figures(scripts, jobs=DEFAULT_JOBS, force=False, timeout=DEFAULT_TIMEOUT, cache_path=CACHE_PATH):
+    """Run the scripts that changed; returns {script: (status, seconds, message)}
+
+    status is 'built', 'unchanged' or 'failed'.
+    """
+    cache = load_cache(cache_path)
+    results = {}
+    pending = []
+    for script in scripts:
+        source = read_source(script)
+        key = os.path.relpath(script, PROJECT_ROOT).replace(os.sep, '/')
+        inputs = input_hash(script, local_imports(script, source))
+        outputs = expected_outputs(script, source)
+        if not force and is_up_to_date(cache.get(key), inputs, outputs):
+            print(f"- {key} unchanged")
+            results[script] = ('unchanged', 0.0, None)
+        else:
+            pending.append((script, key, inputs, outputs))
+
+    # Slowest first, so a long script does not start last and hold up the run;
+    # untimed scripts count as slowest (older caches may hold 'seconds': None)
+    pending.sort(key=lambda job: cache.get(job[1], {}).get('seconds') or float('inf'), reverse=True)
+
+    def build(job):
+        script, key, inputs, outputs = job
+        started = time.time()
+        ok, seconds, message = run_script(script, timeout)
+        outputs = expected_outputs(script, read_source(script))
+        stale = [
+            os.path.basename(path) for path in outputs
+            if not os.path.exists(path) or os.path.getmtime(path) < started - 1
+        ]
+        if ok and stale:
+            ok, message = False, f"did not write {', '.join(stale)}"
+        return (script, key, inputs, outputs), ok, seconds, message
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for (script, key, inputs, outputs), ok, seconds, message in pool.map(build, pending):
+            relative = os.path.relpath(script, PROJECT_ROOT)
+            if ok:
+                record_build(cache, key, inputs, outputs, seconds)
+                print(f"✓ {relative} ({seconds:.2f}s)")
+                results[script] = ('built', seconds, None)
+            else:
+                cache.pop(key, None)
+                print(f"✗ {relative} ({seconds:.2f}s): {message}")
+                results[script] = ('failed', seconds, message)
+
+    save_cache(cache, cache_path)
+    return results
+
+
+def watch(paths, cache_path=CACHE_PATH):
+    """Re-render figures in one warm process as their sources change.
+
+    Runs until interrupted. A script is re-run when it or a helper module it
+    imports changes and its input hash differs from the cache; the cache is
+    updated so a later plain build skips it. Recorded times are kept from
+    subprocess builds, which include the startup cost the worker avoids.
+    """
+    from figure_worker import FigureWorker, format_timings
+
+    worker = FigureWorker()
+    state = snapshot(paths, IMAGE_EXTENSIONS)
+    print(
+        f"\nFigure worker ready (imports {worker.startup['import']:.2f}s, fonts {worker.startup['fonts']:.2f}s); "
+        f"watching for changes (Ctrl+C to stop)..."
+    )
+    try:
+        while True:
+            changed, state = wait_for_changes(paths, state, IMAGE_EXTENSIONS)
+            changed = {os.path.abspath(path) for path in changed if path.endswith('.py')}
+            cache = load_cache(cache_path)
+            for script in find_figure_scripts(paths):
+                source = read_source(script)
+                helpers = local_imports(script, source)
+                if script not in changed and not changed.intersection(helpers):
+                    continue
+                key = os.path.relpath(script, PROJECT_ROOT).replace(os.sep, '/')
+                inputs = input_hash(script, helpers)
+                outputs = expected_outputs(script, source)
+                if is_up_to_date(cache.get(key), inputs, outputs):
+                    continue
+
+                started = time.time()
+                report = worker.run(script)
+                outputs = expected_outputs(script, source)
+                stale = [
+                    os.path.basename(path) for path in outputs
+                    if not os.path.exists(path) or os.path.getmtime(path) < started - 1
+                ]
+                if report['ok'] and stale:
+                    report.update(ok=False, error=f"did not write {', '.join(stale)}")
+                if report['ok']:
+                    record_build(cache, key, inputs, outputs)
+                    print(f"✓ {key} in {report['total']:.2f}s ({format_timings(report)})")
+                else:
+                    cache.pop(key, None)
+                    print(f"✗ {key}: {report['error']}")
+            save_cache(cache, cache_path)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the figure scripts under src/blog whose inputs changed")
+    parser.add_argument(
+        'paths', nargs='*', metavar='PATH',
+        help="scripts or directories to build (default: src/blog)",
+    )
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=DEFAULT_JOBS,
+        help=f"scripts to run at once (default: {DEFAULT_JOBS})",
+    )
+    parser.add_argument('--force', action='store_true', help="run every script, even if unchanged")
+    parser.add_argument(
+        '--timeout', type=int, default=DEFAULT_TIMEOUT,
+        help=f"seconds a script may run before it is counted as failed (default: {DEFAULT_TIMEOUT})",
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="after building, keep a warm figure worker and re-render scripts as they change",
+    )
+    args = parser.parse_args(argv)
+
+    paths = [os.path.abspath(path) for path in args.paths] or [BLOG_DIR]
+    scripts = find_figure_scripts(paths)
+    if not scripts:
+        print("✗ Error: no figure scripts found")
+        return False
+
+    start = time.monotonic()
+    results = build_figures(scripts, args.jobs, args.force, args.timeout)
+    statuses = [status for status, _, _ in results.values()]
+
+    print(
+        f"\nBuilt {statuses.count('built')}, unchanged {statuses.count('unchanged')}, "
+        f"failed {statuses.count('failed')} of {len(scripts)} figure scripts in {time.monotonic() - start:.2f}s"
+    )
+    if args.watch:
+        watch(paths)
+    return 'failed' not in statuses
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,170 @@
+"""
+Export a matplotlib figure in every form the blog and the PDFs use (requires Pillow)
+
+Figure scripts call export_figure(fig, png_path) where they used to call
+plt.savefig(png_path). From the same figure it writes, next to the PNG:
+
+    <stem>.png              the original asset, unchanged (dpi as before)
+    <stem>.svg              vector copy, for figures without raster images
+    <stem>-<width>.webp     one per width, for a responsive srcset
+    <stem>-<width>.avif     the same, when formats include 'avif'
+    <stem>-print.png        high-DPI raster for the PDF pipeline
+    <stem>.figure.js        manifest of the files above with pixel sizes and
+                            bytes, imported by src/components/FigureImage
+
+The raster variants are scaled down from a single high-DPI render, so every
+width shows exactly the same drawing.
+
+Figure scripts put this directory on sys.path themselves, so they export
+the full set of files whether run by hand or by build_blog_figures.py.
+"""
+
+import contextlib
+import io
+import json
+import os
+import re
+
+from image_utils import Image, encode, require_pillow, write_atomic
+
+try:
+    from PIL import features
+except ImportError:  # Only needed when figures are exported
+    features = None
+
+DEFAULT_WIDTHS = (640, 960, 1280, 1920)
+DEFAULT_FORMATS = ('webp',)  # AVIF is ~20% smaller here but ten times slower to encode
+PRINT_DPI = 200              # twice the usual figure dpi; a full-width figure prints at ~400 dpi
+MANIFEST_SUFFIX = '.figure.js'
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+
+def raster_formats(formats):
+    """`formats` this Pillow can write, best compression first"""
+    supported = [fmt for fmt in ('avif', 'webp') if fmt in formats]
+    if 'avif' in supported and (features is None or not features.check('avif')):
+        supported.remove('avif')
+    return supported
+
+
+def has_raster_content(fig):
+    """True if the figure embeds images, which an SVG would only wrap"""
+    return bool(fig.images) or any(ax.images for ax in fig.axes)
+
+
+def render(fig, fmt, **kwargs):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+def render_svg(fig, stem, **kwargs):
+    """SVG with stable ids and no timestamp, whitespace between tags removed"""
+    import matplotlib
+
+    with matplotlib.rc_context({'svg.hashsalt': stem, 'svg.fonttype': 'path'}):
+        data = render(fig, 'svg', metadata={'Date': None}, **kwargs)
+    return re.sub(rb'>\s+<', b'><', data)
+
+
+def js_name(name):
+    """'step0_normal_tan-960.webp' -> 'step0NormalTan960Webp'"""
+    words = [word for word in re.split(r'[^0-9A-Za-z]+', name) if word]
+    identifier = words[0] + ''.join(word[:1].upper() + word[1:] for word in words[1:])
+    return identifier if not identifier[0].isdigit() else f"figure{identifier}"
+
+
+class Identifier(str):
+    """A string emitted as a bare JS identifier rather than a literal"""
+
+
+def js_literal(value, indent=0):
+    """`value` as JS source in the repo's ESLint style (single quotes, trailing commas)"""
+    pad, inner = '  ' * indent, '  ' * (indent + 1)
+    if isinstance(value, Identifier):
+        return str(value)
+    if isinstance(value, str):
+        return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, dict):
+        items = [f"{inner}{key}: {js_literal(item, indent + 1)},\n" for key, item in value.items()]
+        return '{\n' + ''.join(items) + pad + '}' if items else '{}'
+    if isinstance(value, (list, tuple)):
+        items = [f"{inner}{js_literal(item, indent + 1)},\n" for item in value]
+        return '[\n' + ''.join(items) + pad + ']' if items else '[]'
+    return json.dumps(value)
+
+
+def write_manifest(path, script_name, manifest):
+    """Write the manifest as an ES module whose `src` fields are bundled imports"""
+    names = {}
+
+    def asset(entry):
+        names[entry['file']] = js_name(entry['file'])
+        return {key: value for key, value in entry.items() if key != 'file'} | {'src': Identifier(names[entry['file']])}
+
+    figure = {
+        'width': manifest['width'],
+        'height': manifest['height'],
+        'fallback': asset(manifest['fallback']),
+        'vector': asset(manifest['vector']) if manifest['vector'] else None,
+        'print': asset(manifest['print']),
+        'sources': [
+            {'type': source['type'], 'srcSet': [asset(candidate) for candidate in source['srcSet']]}
+            for source in manifest['sources']
+        ],
+    }
+    lines = [f"// Generated by scripts/figure_export.py from {script_name}; do not edit.", '']
+    lines += [f"import {identifier} from './{name}';" for name, identifier in names.items()]
+    lines += ['', f"const figure = {js_literal(figure)};", '', 'export default figure;', '']
+    write_atomic(path, '\n'.join(lines).encode('utf-8'))
+
+
+def export_figure(fig, png_path, dpi=100, widths=DEFAULT_WIDTHS, formats=DEFAULT_FORMATS, print_dpi=PRINT_DPI,
+                  script_name=None, **kwargs):
+    """Write every variant of `fig` next to `png_path`; returns the manifest dict.
+
+    `kwargs` go to every savefig call (e.g. bbox_inches="tight"). Widths
+    wider than the print render are dropped.
+    """
+    require_pillow("Figure export")
+    directory, name = os.path.split(os.path.abspath(png_path))
+    stem = os.path.splitext(name)[0]
+
+    def entry(file_name, data, size=None):
+        write_atomic(os.path.join(directory, file_name), data)
+        result = {'file': file_name, 'bytes': len(data)}
+        if size:
+            result['width'], result['height'] = size
+        return result
+
+    png = render(fig, 'png', dpi=dpi, **kwargs)
+    with Image.open(io.BytesIO(png)) as image:
+        size = image.size
+    manifest = {'width': size[0], 'height': size[1], 'fallback': entry(name, png, size)}
+    manifest['vector'] = None if has_raster_content(fig) else entry(f"{stem}.svg", render_svg(fig, stem, **kwargs))
+
+    print_png = render(fig, 'png', dpi=print_dpi, **kwargs)
+    with contextlib.ExitStack() as images:
+        hires = images.enter_context(Image.open(io.BytesIO(print_png)))
+        if hires.mode == 'RGBA' and hires.getextrema()[3][0] == 255:
+            # opaque figure: the alpha channel only costs bytes
+            hires = images.enter_context(hires.convert('RGB'))
+        manifest['print'] = entry(f"{stem}-print.png", encode(hires, 'png'), hires.size)
+
+        sources = []
+        targets = [width for width in sorted(set(widths)) if width <= hires.width]
+        for fmt in raster_formats(formats):
+            candidates = []
+            for width in targets:
+                size = (width, round(hires.height * width / hires.width))
+                with hires.resize(size, Image.LANCZOS) as scaled:
+                    candidates.append(entry(f"{stem}-{width}.{fmt}", encode(scaled, fmt), scaled.size))
+            sources.append({'type': MIME_TYPES[fmt], 'srcSet': candidates})
+        manifest['sources'] = sources
+
+    write_manifest(os.path.join(directory, f"{stem}{MANIFEST_SUFFIX}"), script_name or f"{stem}.py", manifest)
+    return manifest
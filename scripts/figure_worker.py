@@ -0,0 +1,149 @@
+"""
+Run blog figure scripts inside one long-lived process
+
+A figure script run on its own spends most of its time importing numpy and
+matplotlib and loading fonts before it draws anything. FigureWorker pays
+that once, with the Agg backend and font cache warmed up, and then executes
+scripts on request, each in a fresh namespace (runpy, as `__main__`) with
+pyplot state, rcParams, the working directory and the script's sibling
+helper modules reset around it. Every run reports import, compute and
+savefig time separately.
+
+Used by `build_blog_figures.py --watch`.
+"""
+
+import builtins
+import contextlib
+import io
+import os
+import runpy
+import sys
+import time
+
+
+class ImportTimer:
+    """Wall time spent in top-level import statements while installed"""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.depth = 0
+        self.original = builtins.__import__
+
+    def __call__(self, *args, **kwargs):
+        if self.depth == 0:
+            start = time.perf_counter()
+        self.depth += 1
+        try:
+            return self.original(*args, **kwargs)
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self.seconds += time.perf_counter() - start
+
+    @contextlib.contextmanager
+    def installed(self):
+        builtins.__import__ = self
+        try:
+            yield self
+        finally:
+            builtins.__import__ = self.original
+
+
+class FigureWorker:
+    def __init__(self):
+        timer = ImportTimer()
+        with timer.installed():
+            import matplotlib
+            matplotlib.use('Agg')
+            import matplotlib.figure
+            import matplotlib.pyplot as plt
+            import numpy  # noqa: F401  (every figure script needs it)
+        self.matplotlib = matplotlib
+        self.plt = plt
+        start = time.perf_counter()
+        self.warm_up()
+        self.startup = {'import': timer.seconds, 'fonts': time.perf_counter() - start}
+
+    def warm_up(self):
+        """Draw a throwaway figure so the font cache and mathtext are loaded"""
+        fig, ax = self.plt.subplots()
+        ax.plot([0, 1], [0, 1], label='x')
+        ax.set_title('π ∞ $x^2$', fontweight='bold')
+        ax.legend()
+        fig.canvas.draw()
+        self.plt.close(fig)
+
+    @contextlib.contextmanager
+    def timed_savefig(self, totals):
+        """Accumulate the time spent in Figure.savefig into totals['savefig']"""
+        figure_class = self.matplotlib.figure.Figure
+        original = figure_class.savefig
+
+        def savefig(figure, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(figure, *args, **kwargs)
+            finally:
+                totals['savefig'] += time.perf_counter() - start
+
+        figure_class.savefig = savefig
+        try:
+            yield
+        finally:
+            figure_class.savefig = original
+
+    def run(self, script):
+        """Execute `script` as __main__; returns a report dict.
+
+        'ok', 'error' (last line of the exception), 'output' (what it
+        printed) and seconds for 'import', 'compute', 'savefig' and 'total'.
+        """
+        script = os.path.abspath(script)
+        directory = os.path.dirname(script)
+        # Sibling helpers may have been edited since the last run
+        local_modules = [
+            name for name, module in sys.modules.items()
+            if getattr(module, '__file__', None) and os.path.dirname(os.path.abspath(module.__file__)) == directory
+        ]
+        for name in local_modules:
+            del sys.modules[name]
+
+        totals = {'savefig': 0.0}
+        timer = ImportTimer()
+        output = io.StringIO()
+        error = None
+        previous_dir = os.getcwd()
+        sys.path.insert(0, directory)
+        start = time.perf_counter()
+        try:
+            os.chdir(directory)
+            with self.matplotlib.rc_context(), self.timed_savefig(totals), timer.installed(), \
+                    contextlib.redirect_stdout(output):
+                runpy.run_path(script, run_name='__main__')
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                error = str(e.code)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            total = time.perf_counter() - start
+            os.chdir(previous_dir)
+            sys.path.remove(directory)
+            self.plt.close('all')
+
+        return {
+            'ok': error is None,
+            'error': error,
+            'output': output.getvalue(),
+            'import': timer.seconds,
+            'savefig': totals['savefig'],
+            'compute': max(0.0, total - timer.seconds - totals['savefig']),
+            'total': total,
+        }
+
+
+def format_timings(report):
+    return (
+        f"import {report['import']:.2f}s, compute {report['compute']:.2f}s, "
+        f"savefig {report['savefig']:.2f}s"
+    )
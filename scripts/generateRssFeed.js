@@ -140,26 +140,10 @@ ${blogUrls}
 // Main function
 const main = async () => {
   try {
-    // Import the blog registry
-    const blogRegistryPath = path.join(__dirname, '..', 'src/components/BlogShell/blog-registry.js');
-
-    // Read and parse the registry file to extract blog posts
-    const registryContent = await fs.readFile(blogRegistryPath, 'utf-8');
-
-    // Extract blog posts from the registry (parse the JavaScript array)
-    const blogRegistryMatch = registryContent.match(/export const blogRegistry = \[([\s\S]*?)\];/);
-    if (!blogRegistryMatch) {
-      throw new Error('Could not parse blog registry');
-    }
-
-    // Parse blog posts manually from the registry
-    const postMatches = registryContent.matchAll(/\{\s*slug:\s*'([^']+)',\s*title:\s*'((?:[^'\\]|\\.)*)',\s*component:[^,]+,\s*date:\s*'([^']+)',?\s*\}/g);
-
-    const posts = Array.from(postMatches).map((match) => ({
-      slug: match[1],
-      title: match[2].replace(/\\'/g, "'"), // Unescape single quotes
-      date: match[3],
-    }));
+    // Read the JSON registry written by refresh-registry (or scripts/blog_registry.py)
+    const blogRegistryPath = path.join(__dirname, '..', 'src/components/BlogShell/blog-registry.json');
+    const registry = JSON.parse(await fs.readFile(blogRegistryPath, 'utf-8'));
+    const posts = registry.map(({ slug, title, date }) => ({ slug, title, date }));
 
     // eslint-disable-next-line no-console
     console.log(`Found ${posts.length} blog posts`);
@@ -1,15 +1,80 @@
 #!/usr/bin/env python3
 """
-Generate PDF files for all blog articles from localhost:3000
-Automatically retries failed generations with longer timeout
+Generate PDF files for all blog articles with a pool of headless Chromium workers
+Pages come from the production build served in-process (--serve-build) or
+from the `bun start` dev server on localhost:3000. Failed articles are
+retried with longer deadlines and exponential backoff while the rest keep
+rendering; deadlines and render order come from each article's past render
+times (.cache/pdf-render-history.json)
+
+Only articles whose inputs changed since the last run are re-rendered; the
+hashes are kept in public/pdfs/.build-manifest.json. Size, page count, date
+and render time of every PDF are kept in public/pdfs/.catalog.json, which
+index.html and all-blog-pdfs.zip are built from.
+
+--serve-build renders the output of `bun run build` from a static server
+started inside this process, so no dev server has to be running.
+
+Pass --linearize to rewrite each PDF for Fast Web View (validated with
+qpdf's linearization check), after --optimize when both are given.
+
+Pass --book to also merge the article PDFs (no re-rendering) into one
+all-blog-posts.pdf with a cover, contents page and bookmarks.
+
+Pass --previews to also capture thumbnail / Open Graph images (and with
+--full-page a full-page screenshot) from the page loaded for each PDF.
+
+Long runs can bound Chromium's memory with --recycle-after N and/or
+--max-rss MB, which replace a worker's browser context after N articles or
+once its RSS crosses the ceiling; each article's peak RSS is reported.
+
+Pass --hashed-names to also publish <slug>.<hash8>.pdf copies (linked from
+index.html) that can be cached forever; the matching Cache-Control rules are
+written to firebase.json.
+
+Pass --shard i/N to render only the i-th of N cost-balanced subsets of the
+articles (e.g. one per CI runner); scripts/merge_pdf_shards.py then combines
+the shard outputs and builds the zip and index once.
+
+Pass --watch to keep a browser warm after the run and re-render articles as
+their sources under src/blog change, refreshing the zip and index each time.
+
+Usage:
+    python scripts/generate_blog_pdfs.py [--workers N] [--force] [--only SLUG ...]
+                                         [--serve-build [--build-dir DIR]] [--watch]
+                                         [--previews [--preview-widths W,...] [--full-page]]
+                                         [--shard i/N] [--hashed-names]
 """
 
+import argparse
+import contextlib
+import hashlib
+import html
+import json
 import os
-import time
-import zipfile
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlsplit
 from playwright.sync_api import sync_playwright
+import pdf_book
+import pdf_linearize
+from asset_cache import CACHE_DIR, AssetCache
+from browser_memory import MemoryMonitor
+from blog_registry import load_registry
+from hashed_assets import publish_hashed, remove_hashed, update_firebase_headers
+from page_previews import DEFAULT_FORMATS, DEFAULT_WIDTHS, capture_previews, parse_formats, parse_widths, require_pillow
+from pdf_archive import PdfArchive
+from pdf_catalog import CATALOG_NAME, PdfCatalog, hash_file
+from pdf_deps import require_pikepdf
+from pdf_optimize import DEFAULT_TARGET_DPI, format_report, optimize_pdf
+from pdf_trace import RenderTrace, diff_cdp_metrics, percentile, read_cdp_metrics
+from render_scheduler import (
+    HISTORY_PATH, MAX_ATTEMPTS, RenderHistory, RenderScheduler, assign_shards, parse_shard,
+)
+from source_watcher import snapshot, wait_for_changes
+from static_build_server import BUILD_DIR, serve_build
 
 BASE_URL = 'http://localhost:3000/blog/'
 
@@ -20,40 +85,96 @@ PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 # Set paths relative to project root
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, 'public', 'pdfs')
 BLOG_REGISTRY_PATH = os.path.join(PROJECT_ROOT, 'src', 'components', 'BlogShell', 'blog-registry.js')
+BLOG_DIR = os.path.join(PROJECT_ROOT, 'src', 'blog')
+ZIP_PATH = os.path.join(OUTPUT_DIR, 'all-blog-pdfs.zip')
+REPORT_DIR = os.path.join(PROJECT_ROOT, '.cache', 'pdf-reports')
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, '.build-manifest.json')
+CATALOG_PATH = os.path.join(OUTPUT_DIR, CATALOG_NAME)
+
+# Code shared by every article page. A change here invalidates every PDF.
+SHARED_INPUTS = [
+    os.path.join(PROJECT_ROOT, 'src', 'components', 'BlogShell'),
+    os.path.join(PROJECT_ROOT, 'src', 'components', 'WrappedImage'),
+    os.path.join(PROJECT_ROOT, 'src', 'components', 'FigureImage'),
+    os.path.join(PROJECT_ROOT, 'src', 'pages', 'BlogPage.js'),
+    os.path.join(PROJECT_ROOT, 'src', 'App.js'),
+]
+# The registry is regenerated whenever an article is added and stories never
+# reach the page, so neither should invalidate existing PDFs.
+SHARED_INPUT_EXCLUDES = ('blog-registry.js', 'blog-registry.json', '.stories.js')
 
 # Configuration
-INITIAL_TIMEOUT = 60000  # 60 seconds
+INITIAL_TIMEOUT = 60000  # 60 seconds, first attempt of an article with no history
 RETRY_TIMEOUT = 120000   # 120 seconds for retry
-INITIAL_WAIT = 3         # seconds
-RETRY_WAIT = 5           # seconds
-
-def parse_blog_registry():
-    """Parse the blog-registry.js file to extract slugs and titles"""
+INITIAL_READY_DEADLINE = 15000  # ms the page gets to become print-ready
+RETRY_READY_DEADLINE = 45000    # ms, the final attempt renders anyway once it passes
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+MANIFEST_VERSION = 1
+
+PDF_OPTIONS = {
+    'format': 'A4',
+    'print_background': True,
+    'margin': {
+        'top': '20px',
+        'right': '20px',
+        'bottom': '20px',
+        'left': '20px'
+    },
+    'prefer_css_page_size': False,
+}
+
+def parse_blog_registry(registry_path=None):
+    """Load blog slugs, titles and dates.
+
+    By default the articles under src/blog are scanned directly. A JSON
+    registry (blog-registry.json) or the generated blog-registry.js can be
+    passed instead.
+    """
     try:
-        with open(BLOG_REGISTRY_PATH, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Extract blog entries using regex
-        # Pattern matches: slug: 'value', title: 'value'
-        pattern = r"\{\s*slug:\s*['\"]([^'\"]+)['\"]\s*,\s*title:\s*['\"]([^'\"]+)['\"]\s*,"
-
-        matches = re.findall(pattern, content)
-
-        if not matches:
+        if registry_path is None:
+            blogs = load_registry()
+            source = BLOG_DIR
+        elif registry_path.endswith('.json'):
+            with open(registry_path, 'r', encoding='utf-8') as f:
+                blogs = json.load(f)
+            source = registry_path
+        else:
+            with open(registry_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+            # Extract blog entries using regex
+            # Pattern matches: slug: 'value', title: 'value' (titles may contain escaped quotes)
+            pattern = r"""\{\s*slug:\s*(['"])(.+?)\1\s*,\s*title:\s*(['"])((?:\\.|(?!\3).)*)\3\s*,"""
+            blogs = [
+                {'slug': slug, 'title': re.sub(r'\\(.)', r'\1', title)}
+                for _, slug, _, title in re.findall(pattern, content)
+            ]
+            source = registry_path
+
+        if not blogs:
             raise ValueError("No blog entries found in registry")
 
-        blogs = [{'slug': slug, 'title': title} for slug, title in matches]
-
-        print(f"✓ Loaded {len(blogs)} blogs from registry")
+        if source.startswith(PROJECT_ROOT):
+            source = os.path.relpath(source, PROJECT_ROOT)
+        print(f"✓ Loaded {len(blogs)} blogs from {source}")
         return blogs
 
     except FileNotFoundError:
-        print(f"✗ Error: Could not find blog registry at {BLOG_REGISTRY_PATH}")
+        print(f"✗ Error: Could not find blog registry at {registry_path}")
         raise
     except Exception as e:
         print(f"✗ Error parsing blog registry: {e}")
         raise
 
+def set_output_dir(output_dir):
+    """Point the generator (PDFs, zip, index and manifest) at another directory"""
+    global OUTPUT_DIR, ZIP_PATH, MANIFEST_PATH, CATALOG_PATH
+    OUTPUT_DIR = os.path.abspath(output_dir)
+    ZIP_PATH = os.path.join(OUTPUT_DIR, 'all-blog-pdfs.zip')
+    MANIFEST_PATH = os.path.join(OUTPUT_DIR, '.build-manifest.json')
+    CATALOG_PATH = os.path.join(OUTPUT_DIR, CATALOG_NAME)
+
+
 def ensure_output_dir():
     """Create output directory if it doesn't exist"""
     if not os.path.exists(OUTPUT_DIR):
@@ -61,37 +182,185 @@ def ensure_output_dir():
         print(f"Created directory: {OUTPUT_DIR}")
 
 
+def iter_input_files(path, excludes=()):
+    """Yield files under `path` (or `path` itself) in a stable order"""
+    if os.path.isfile(path):
+        yield path
+        return
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')  # figure helpers imported by scripts
+        for name in sorted(files):
+            if name.endswith(excludes) or name.startswith('.'):
+                continue
+            yield os.path.join(root, name)
+
+
+def hash_files(paths, excludes=()):
+    """Hash the relative names and contents of every file under `paths`"""
+    digest = hashlib.sha256()
+    for path in paths:
+        for file_path in iter_input_files(path, excludes):
+            digest.update(os.path.relpath(file_path, PROJECT_ROOT).replace(os.sep, '/').encode('utf-8'))
+            digest.update(b'\0')
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 16), b''):
+                    digest.update(chunk)
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def compute_shared_hash(settings=None):
+    """Hash the inputs every article depends on: shell code and PDF settings.
+
+    `settings` holds any other options that change the output (optimization).
+    """
+    digest = hashlib.sha256()
+    digest.update(hash_files(SHARED_INPUTS, SHARED_INPUT_EXCLUDES).encode('ascii'))
+    digest.update(json.dumps(PDF_OPTIONS, sort_keys=True).encode('utf-8'))
+    if settings:
+        digest.update(json.dumps(settings, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def compute_input_hash(slug, shared_hash):
+    """Hash an article's own directory (MDX, images, figures) plus the shared inputs"""
+    digest = hashlib.sha256()
+    digest.update(shared_hash.encode('ascii'))
+    digest.update(hash_files([os.path.join(BLOG_DIR, slug)]).encode('ascii'))
+    return digest.hexdigest()
+
+
+def load_manifest(path=None):
+    """Load the build manifest, starting fresh if it is missing or outdated"""
+    try:
+        with open(path or MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'version': MANIFEST_VERSION, 'articles': {}}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'articles': {}}
+    return manifest
+
+
+def save_manifest(manifest, path=None):
+    """Write the build manifest atomically"""
+    path = path or MANIFEST_PATH
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def shard_paths(shard, count):
+    """(manifest, catalog, render history) a --shard run writes instead of the shared files"""
+    suffix = f"shard-{shard}-of-{count}.json"
+    return (
+        os.path.join(OUTPUT_DIR, f".build-manifest.{suffix}"),
+        os.path.join(OUTPUT_DIR, f".catalog.{suffix}"),
+        os.path.join(OUTPUT_DIR, f".render-history.{suffix}"),
+    )
+
+
+def select_shard(blogs, shard, count, catalog):
+    """Slugs of `blogs` in shard `shard` of `count`, balanced by past render time.
+
+    Costs come from the shared catalog, which shard runs never write (only
+    merge_pdf_shards.py does), so every shard computes the same split.
+    """
+    costs = {blog['slug']: (catalog.get(blog['slug']) or {}).get('render_seconds') for blog in blogs}
+    return set(assign_shards(costs, count)[shard - 1])
+
+
+def is_up_to_date(manifest, slug, input_hash):
+    """True if the PDF exists and was rendered from the same inputs"""
+    entry = manifest['articles'].get(slug)
+    pdf_path = os.path.join(OUTPUT_DIR, f"{slug}.pdf")
+    return bool(entry) and entry.get('hash') == input_hash and os.path.exists(pdf_path)
+
+
+def format_size(size_bytes):
+    """Format a byte count in human-readable form"""
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    elif size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.1f} KB"
+    else:
+        return f"{size_bytes / (1024 * 1024):.1f} MB"
+
+
 def get_pdf_size(slug):
     """Get the file size of a PDF in human-readable format"""
     pdf_path = os.path.join(OUTPUT_DIR, f"{slug}.pdf")
     if os.path.exists(pdf_path):
-        size_bytes = os.path.getsize(pdf_path)
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        else:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
+        return format_size(os.path.getsize(pdf_path))
     return "N/A"
 
-def create_zip_archive(successful_blogs):
-    """Create a zip file containing all PDFs"""
-    zip_path = os.path.join(OUTPUT_DIR, 'all-blog-pdfs.zip')
+def create_zip_archive(entries, archive=None):
+    """Create a zip file containing all PDFs listed in the catalog `entries`.
 
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for blog in successful_blogs:
-            slug = blog['slug']
-            pdf_path = os.path.join(OUTPUT_DIR, f"{slug}.pdf")
-            if os.path.exists(pdf_path):
-                # Add PDF to zip with just the filename (no directory structure)
-                zipf.write(pdf_path, f"{slug}.pdf")
+    `archive` is a PdfArchive that render workers may already have streamed
+    fresh PDFs into; unchanged PDFs are copied from the previous zip.
+    """
+    if archive is None:
+        archive = PdfArchive(ZIP_PATH)
 
-    zip_size = os.path.getsize(zip_path)
-    print(f"✓ Created zip archive: all-blog-pdfs.zip ({zip_size / (1024 * 1024):.1f} MB)")
+    # Add PDFs to zip with just the filename (no directory structure)
+    members = {entry['file']: os.path.join(OUTPUT_DIR, entry['file']) for entry in entries}
+    zip_size = archive.close(members)
+    print(f"✓ Created zip archive: all-blog-pdfs.zip ({zip_size / (1024 * 1024):.1f} MB; {archive.summary()})")
     return zip_size
 
-def generate_index_html(successful_blogs, zip_size=None):
-    """Generate an index.html file listing all PDFs"""
+def publish_entries(entries, hashed_names=False):
+    """Catalog entries plus the `href` index.html links to.
+
+    With `hashed_names` that is a content-hashed copy of the PDF; otherwise
+    the plain file, and hashed copies left from earlier runs are removed.
+    """
+    published = []
+    for entry in entries:
+        if hashed_names:
+            href = publish_hashed(os.path.join(OUTPUT_DIR, entry['file']), entry['sha256'])
+        else:
+            remove_hashed(OUTPUT_DIR, entry['file'])
+            href = entry['file']
+        published.append(dict(entry, href=href))
+    return published
+
+
+def publish_zip(hashed_names=False):
+    """File name index.html links to for the zip (see publish_entries())"""
+    name = os.path.basename(ZIP_PATH)
+    if hashed_names:
+        return publish_hashed(ZIP_PATH, hash_file(ZIP_PATH))
+    remove_hashed(OUTPUT_DIR, name)
+    return name
+
+
+def publish_book(entries, hashed_names=False):
+    """Build (or reuse) the combined book PDF; returns {'href', 'bytes', 'pages'}"""
+    report = pdf_book.build_book(entries, OUTPUT_DIR)
+    print(f"✓ {pdf_book.format_report(report)}")
+    book_path = os.path.join(OUTPUT_DIR, pdf_book.BOOK_NAME)
+    if hashed_names:
+        href = publish_hashed(book_path, hash_file(book_path))
+    else:
+        remove_hashed(OUTPUT_DIR, pdf_book.BOOK_NAME)
+        href = pdf_book.BOOK_NAME
+    return {'href': href, 'bytes': report['bytes'], 'pages': report['pages']}
+
+
+def generate_index_html(entries, zip_size=None, zip_href='all-blog-pdfs.zip', book=None):
+    """Generate an index.html file listing the catalog `entries` (newest first)"""
+    book_button = ''
+    if book:
+        book_button = f'''
+            <a href="{book['href']}" class="download-all-btn" download="{pdf_book.BOOK_NAME}">
+                <span class="btn-icon">📖</span>
+                Download as One Book
+                <span class="btn-size">({book['pages']} pages, {book['bytes'] / (1024 * 1024):.1f} MB)</span>
+            </a>
+'''
     index_path = os.path.join(OUTPUT_DIR, 'index.html')
 
     html_content = f'''<!DOCTYPE html>
@@ -207,6 +476,12 @@ def generate_index_html(successful_blogs, zip_size=None):
             align-items: center;
         }}
 
+        .pdf-date {{
+            font-size: 0.85rem;
+            color: #718096;
+            white-space: nowrap;
+        }}
+
         .pdf-size {{
             font-size: 0.85rem;
             color: #718096;
@@ -246,6 +521,10 @@ def generate_index_html(successful_blogs, zip_size=None):
             box-shadow: 0 4px 12px rgba(102, 126, 234, 0.3);
         }}
 
+        .download-all-btn + .download-all-btn {{
+            margin-top: -1rem;
+        }}
+
         .download-all-btn:hover {{
             transform: translateY(-2px);
             box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4);
@@ -278,34 +557,35 @@ def generate_index_html(successful_blogs, zip_size=None):
         <div class="content">
             <div class="stats">
                 <div class="stat">
-                    <div class="stat-value">{len(successful_blogs)}</div>
+                    <div class="stat-value">{len(entries)}</div>
                     <div class="stat-label">Total PDFs</div>
                 </div>
                 <div class="stat">
-                    <div class="stat-value">{sum([os.path.getsize(os.path.join(OUTPUT_DIR, f"{blog['slug']}.pdf")) for blog in successful_blogs]) / (1024 * 1024):.1f} MB</div>
+                    <div class="stat-value">{sum(entry['bytes'] for entry in entries) / (1024 * 1024):.1f} MB</div>
                     <div class="stat-label">Total Size</div>
                 </div>
             </div>
 
-            <a href="all-blog-pdfs.zip" class="download-all-btn" download>
+            <a href="{zip_href}" class="download-all-btn" download="all-blog-pdfs.zip">
                 <span class="btn-icon">📦</span>
                 Download All PDFs
                 {f'<span class="btn-size">({zip_size / (1024 * 1024):.1f} MB)</span>' if zip_size else ''}
             </a>
-
+{book_button}
             <ul class="pdf-list">
 '''
 
     # Add each PDF to the list
-    for blog in successful_blogs:
-        slug = blog['slug']
-        title = blog['title']
-        size = get_pdf_size(slug)
+    for entry in entries:
+        title = html.escape(entry['title'])
+        size = format_size(entry['bytes'])
+        pages = f"{entry['pages']} pages · " if entry.get('pages') else ''
         html_content += f'''                <li class="pdf-item">
-                    <a href="{slug}.pdf" target="_blank">
+                    <a href="{entry.get('href', entry['file'])}" target="_blank">
                         <span class="pdf-title">{title}</span>
                         <div class="pdf-info">
-                            <span class="pdf-size">{size}</span>
+                            <span class="pdf-date">{entry.get('date', '')}</span>
+                            <span class="pdf-size">{pages}{size}</span>
                             <span class="download-icon">⬇</span>
                         </div>
                     </a>
@@ -326,151 +606,737 @@ def generate_index_html(successful_blogs, zip_size=None):
     with open(index_path, 'w', encoding='utf-8') as f:
         f.write(html_content)
 
-    print(f"\n✓ Generated index.html with {len(successful_blogs)} PDFs")
-
-def generate_pdf(page, slug, timeout=INITIAL_TIMEOUT, wait_time=INITIAL_WAIT, retry=False):
-    """Generate PDF for a single blog post"""
-    url = f"{BASE_URL}{slug}"
+    print(f"\n✓ Generated index.html with {len(entries)} PDFs")
+
+# Resolves once the article is print-ready, or after `deadline` ms with the
+# conditions that never settled. react-katex typesets synchronously when the
+# MDX component mounts, so KaTeX is done once its CSS and fonts are loaded.
+READY_SCRIPT = '''async ({ deadline }) => {
+    const started = performance.now();
+    const pending = new Set(['content', 'fonts', 'images', 'layout']);
+    const marks = {};
+    const settle = (condition) => {
+        pending.delete(condition);
+        marks[condition] = performance.now() - started;
+    };
+    const nextFrame = () => new Promise((resolve) => requestAnimationFrame(() => resolve()));
+    const waitFor = (predicate) => new Promise((resolve) => {
+        if (predicate()) {
+            resolve();
+            return;
+        }
+        const observer = new MutationObserver(() => {
+            if (predicate()) {
+                observer.disconnect();
+                resolve();
+            }
+        });
+        observer.observe(document.documentElement, { childList: true, subtree: true });
+    });
+
+    const ready = (async () => {
+        // Lazy MDX chunk loaded: every article starts with its "# Title"
+        await waitFor(() => document.querySelector('h1'));
+        settle('content');
+
+        // Figures with a print-resolution variant (FigureImage) use it in the PDF
+        document.querySelectorAll('picture > source[media="print"]').forEach((source) => {
+            source.media = 'all';
+        });
+
+        // Lay out once so newly referenced web fonts start loading
+        await nextFrame();
+        await document.fonts.ready;
+        settle('fonts');
+
+        await Promise.all(Array.from(document.images).map((img) => {
+            img.loading = 'eager';
+            return img.decode().catch(() => {});
+        }));
+        settle('images');
+
+        // Layout is stable once the page height holds for a few frames
+        let lastHeight = -1;
+        let stableFrames = 0;
+        while (stableFrames < 3) {
+            await nextFrame();
+            const height = document.documentElement.scrollHeight;
+            stableFrames = height === lastHeight ? stableFrames + 1 : 0;
+            lastHeight = height;
+        }
+        settle('layout');
+    })();
+
+    const timedOut = await Promise.race([
+        ready.then(() => false),
+        new Promise((resolve) => setTimeout(() => resolve(true), deadline)),
+    ]);
+    return { timedOut, pending: Array.from(pending), marks, elapsed: performance.now() - started };
+}'''
+
+
+def wait_until_ready(page, deadline):
+    """Block until the page is print-ready or `deadline` ms have passed"""
+    return page.evaluate(READY_SCRIPT, {'deadline': deadline})
+
+
+def record_ready_spans(trace, slug, ready_start, state):
+    """Split the readiness wait into one span per condition, in settle order"""
+    previous = 0
+    for condition, offset in sorted(state['marks'].items(), key=lambda mark: mark[1]):
+        trace.add_span(slug, f"ready:{condition}", ready_start + previous / 1000, ready_start + offset / 1000)
+        previous = offset
+
+
+def generate_pdf(page, slug, timeout=INITIAL_TIMEOUT, ready_deadline=INITIAL_READY_DEADLINE, retry=False,
+                 base_url=BASE_URL, trace=None, previews=None):
+    """Generate PDF for a single blog post.
+
+    With a RenderTrace, each stage is timed and CDP performance metrics for
+    the article are recorded alongside. With `previews` (capture_previews()
+    options), preview images are taken from the same loaded page; a failed
+    capture is reported but does not fail the PDF.
+    """
+    url = f"{base_url}{slug}"
     output_path = os.path.join(OUTPUT_DIR, f"{slug}.pdf")
+    stage = trace.span if trace else lambda *args, **kwargs: contextlib.nullcontext()
 
     print(f"Loading: {url}")
+    cdp = None
+    started = time.perf_counter()
     try:
-        # Navigate to the page
-        wait_until = 'domcontentloaded' if retry else 'networkidle'
-        page.goto(url, wait_until=wait_until, timeout=timeout)
-
-        # Initial wait for content to load
-        if retry:
-            print(f"  Waiting {wait_time}s for content to load...")
-            time.sleep(wait_time)
-
-        # Wait for KaTeX to render (check for .katex elements)
-        print("  Waiting for LaTeX rendering...")
-        try:
-            page.wait_for_selector('.katex', timeout=5000 if not retry else 10000)
-            print("  ✓ KaTeX elements found")
-            if retry:
-                time.sleep(3)  # Extra wait for KaTeX to finish rendering
-        except:
-            print("  - No KaTeX elements (or already loaded)")
-
-        # Wait for all images to load
-        print("  Waiting for images to load...")
-        try:
-            page.evaluate('''() => {
-                return Promise.all(
-                    Array.from(document.images)
-                        .filter(img => !img.complete)
-                        .map(img => new Promise(resolve => {
-                            img.onload = img.onerror = resolve;
-                        }))
-                );
-            }''')
-            print("  ✓ Images loaded")
-        except:
-            print("  - Image loading check skipped")
-
-        # Wait for Mantine tables to render
-        try:
-            page.wait_for_selector('table', timeout=2000)
-            print("  ✓ Tables found")
-        except:
-            print("  - No tables found")
-
-        # Additional wait for any animations or dynamic content
-        if not retry:
-            time.sleep(2)
+        if trace:
+            cdp = page.context.new_cdp_session(page)
+            cdp.send('Performance.enable')
+            metrics_before = read_cdp_metrics(cdp)
+
+        # Navigate to the page; readiness is detected in the page itself
+        with stage(slug, 'navigate', retry=retry):
+            page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+
+        ready_start = time.perf_counter()
+        state = wait_until_ready(page, ready_deadline)
+        if trace:
+            trace.add_span(slug, 'ready', ready_start, time.perf_counter(), timed_out=state['timedOut'])
+            record_ready_spans(trace, slug, ready_start, state)
+        if state['timedOut']:
+            pending = ', '.join(state['pending'])
+            if not retry:
+                raise TimeoutError(f"Page not ready after {ready_deadline} ms (waiting on: {pending})")
+            print(f"  [{slug}] - Not ready after {ready_deadline} ms (waiting on: {pending}), rendering anyway")
         else:
-            time.sleep(3)
+            print(f"  [{slug}] ✓ Ready in {state['elapsed']:.0f} ms")
 
         # Generate PDF
-        print(f"  Generating PDF: {output_path}")
-        page.pdf(
-            path=output_path,
-            format='A4',
-            print_background=True,
-            margin={
-                'top': '20px',
-                'right': '20px',
-                'bottom': '20px',
-                'left': '20px'
-            },
-            prefer_css_page_size=False
-        )
+        print(f"  [{slug}] Generating PDF: {output_path}")
+        with stage(slug, 'pdf'):
+            page.pdf(path=output_path, **PDF_OPTIONS)
+
+        if cdp:
+            trace.add_metrics(slug, diff_cdp_metrics(metrics_before, read_cdp_metrics(cdp)))
+
+        if previews:
+            try:
+                with stage(slug, 'previews'):
+                    files = capture_previews(page, slug, OUTPUT_DIR, **previews)
+                print(f"  [{slug}] ✓ Captured {len(files)} preview image(s)")
+            except Exception as e:
+                print(f"  [{slug}] - Preview capture failed: {str(e).splitlines()[0]}")
 
         print(f"✓ Successfully generated: {slug}.pdf")
         return True
     except Exception as e:
         error_msg = str(e).split('\n')[0]  # Get first line of error
-        print(f"✗ Error: {error_msg}")
+        print(f"✗ [{slug}] Error: {error_msg}")
         return False
+    finally:
+        if trace:
+            trace.add_span(slug, 'article', started, time.perf_counter(), retry=retry)
+        if cdp:
+            try:
+                cdp.detach()
+            except Exception:
+                pass
+
+def output_settings(optimize_settings=None, previews=None, linearize=False):
+    """Options besides the sources that change what a render produces"""
+    settings = dict(optimize_settings or {})
+    if previews:
+        settings['previews'] = previews
+    if linearize:
+        settings['linearize'] = True
+    return settings or None
+
+
+def optimize_rendered(slug, settings):
+    """Run the --optimize stage on a freshly rendered PDF; None if it failed"""
+    budget = settings['size_budget'] * 1024 if settings['size_budget'] else None
+    try:
+        report = optimize_pdf(os.path.join(OUTPUT_DIR, f"{slug}.pdf"), settings['target_dpi'], budget)
+    except Exception as e:
+        print(f"  [{slug}] - Optimization skipped: {str(e).splitlines()[0]}")
+        return None
+    print(f"  {format_report(slug, report)}")
+    return report
+
+
+def open_page(browser, asset_cache, base_url):
+    """Fresh context and page, with the asset cache attached"""
+    context = browser.new_context()
+    if asset_cache:
+        parts = urlsplit(base_url)
+        asset_cache.attach(context, f"{parts.scheme}://{parts.netloc}")
+    return context, context.new_page()
+
+
+def linearize_rendered(slug):
+    """Run the --linearize stage on a rendered PDF; None if it failed"""
+    try:
+        report = pdf_linearize.linearize_pdf(os.path.join(OUTPUT_DIR, f"{slug}.pdf"))
+    except Exception as e:
+        print(f"  [{slug}] - Linearization skipped: {str(e).splitlines()[0]}")
+        return None
+    print(f"  {pdf_linearize.format_report(slug, report)}")
+    return report
+
+
+def render_worker(scheduler, pdf_kwargs, history, asset_cache, on_rendered, recycle_after=0, max_rss=None):
+    """Render jobs from the scheduler with a dedicated browser and context.
+
+    The sync Playwright API is bound to the thread that started it, so every
+    worker owns its own driver, browser and context instead of sharing one.
+
+    The context is replaced after `recycle_after` articles, or once the
+    browser's RSS exceeds `max_rss` bytes, so memory from heavy pages does
+    not accumulate over a long run.
+    """
+    base_url = pdf_kwargs.get('base_url', BASE_URL)
+    trace = pdf_kwargs.get('trace')
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        monitor = MemoryMonitor.start_for(browser)
+        context, page = open_page(browser, asset_cache, base_url)
+        rendered_in_context = 0
+        try:
+            while True:
+                job = scheduler.next()
+                if job is None:
+                    break
+                slug = job.blog['slug']
+                ok = False
+                # Every job handed out must be finished, or the other workers
+                # wait forever for it in scheduler.next()
+                try:
+                    timeout, ready_deadline = job.deadlines(INITIAL_TIMEOUT, INITIAL_READY_DEADLINE)
+                    if monitor:
+                        monitor.take_peak()
+                    started = time.perf_counter()
+                    ok = generate_pdf(page, slug, timeout=timeout, ready_deadline=ready_deadline,
+                                      retry=job.final, **pdf_kwargs)
+                    rendered_in_context += 1
+                    if monitor:
+                        peak = monitor.take_peak()
+                        if trace and peak is not None:
+                            trace.add_metrics(slug, {'PeakRSS': peak})
+                    if ok:
+                        history.record(slug, time.perf_counter() - started)
+                        if on_rendered:
+                            on_rendered(job.blog)
+                except Exception as e:
+                    ok = False
+                    print(f"  [{slug}] ✗ Error: {e}")
+                finally:
+                    delay = scheduler.finish(job, ok)
+                if delay is not None:
+                    print(f"  [{slug}] Retrying in {delay}s (attempt {job.attempt + 1}/{MAX_ATTEMPTS})")
+
+                reason = None
+                if recycle_after and rendered_in_context >= recycle_after:
+                    reason = f"after {rendered_in_context} articles"
+                elif max_rss and monitor and (monitor.current or 0) > max_rss:
+                    reason = f"RSS {monitor.current / (1024 * 1024):.0f} MB over ceiling"
+                if reason:
+                    print(f"  [{slug}] ♻ Recycling browser context ({reason})")
+                    with contextlib.suppress(Exception):
+                        context.close()
+                    try:
+                        context, page = open_page(browser, asset_cache, base_url)
+                    except Exception as e:
+                        # Leave the queue to the other workers (render_blogs()
+                        # fails whatever is left if this was the last one)
+                        print(f"  ✗ Could not open a new browser context, stopping this worker: {e}")
+                        break
+                    rendered_in_context = 0
+                    if monitor:
+                        monitor.sample()
+        finally:
+            if monitor:
+                monitor.stop()
+            # The browser may already have crashed; closing it must not mask why
+            with contextlib.suppress(Exception):
+                context.close()
+            with contextlib.suppress(Exception):
+                browser.close()
+
+
+def render_blogs(blogs, workers, history, asset_cache=None, on_rendered=None, recycle_after=0, max_rss=None,
+                 **pdf_kwargs):
+    """Render (index, blog) pairs across `workers` browsers.
+
+    Articles are scheduled slowest-first from `history`, each with deadlines
+    derived from its past renders; failures are retried with backoff up to
+    MAX_ATTEMPTS times. `pdf_kwargs` are passed to generate_pdf().
+    `recycle_after` and `max_rss` bound each worker's memory (render_worker()).
+
+    `on_rendered(blog)` is called from the worker thread after each success.
+    A worker whose browser context cannot be recycled stops and leaves the
+    queue to the others; jobs still queued when every worker has stopped
+    count as failed.
+
+    Returns (successful, failed) lists of (index, blog) in registry order.
+    """
+    scheduler = RenderScheduler(blogs, history)
+    workers = max(1, min(workers, len(blogs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                render_worker, scheduler, pdf_kwargs, history, asset_cache, on_rendered, recycle_after, max_rss
+            )
+            for _ in range(workers)
+        ]
+        for future in futures:
+            future.result()
+    scheduler.abandon()
+
+    return sorted(scheduler.succeeded, key=lambda item: item[0]), sorted(scheduler.failed, key=lambda item: item[0])
+
+
+def affected_slugs(changed, slugs):
+    """Articles whose output may change with the `changed` files.
+
+    A file in an article directory affects that article; anything else
+    (shell components, pages) affects every article.
+    """
+    affected = set()
+    for path in changed:
+        relative = os.path.relpath(path, BLOG_DIR)
+        if relative.startswith('..') or os.sep not in relative:
+            return set(slugs)
+        affected.add(relative.split(os.sep)[0])
+    return affected & set(slugs)
+
+
+def refresh_outputs(blogs, catalog, hashed_names=False, book=False):
+    """Rebuild the zip (reusing unchanged members) and index.html from the catalog"""
+    archive = PdfArchive(ZIP_PATH)
+    present = []
+    for blog in blogs:
+        pdf_path = os.path.join(OUTPUT_DIR, f"{blog['slug']}.pdf")
+        if os.path.exists(pdf_path):
+            catalog.ensure(blog, pdf_path)
+            present.append(blog['slug'])
+    catalog.drop_missing(blog['slug'] for blog in blogs)
+    catalog.save()
+    entries = publish_entries(catalog.select(present), hashed_names)
+    if not entries:
+        archive.abort()
+        return
+    zip_size = create_zip_archive(entries, archive)
+    zip_href = publish_zip(hashed_names)
+    generate_index_html(entries, zip_size, zip_href, publish_book(entries, hashed_names) if book else None)
+
+
+def watch(args, catalog, optimize_settings=None, asset_cache=None, previews=None):
+    """Re-render articles as their sources change, with one warm browser.
+
+    Runs on the calling thread until interrupted. Each change is mapped to
+    the affected articles, which are re-rendered only if their input hash
+    differs from the manifest (saving a file unchanged does nothing).
+    """
+    watched = [BLOG_DIR] + SHARED_INPUTS
+    state = snapshot(watched, SHARED_INPUT_EXCLUDES)
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context, page = open_page(browser, asset_cache, args.base_url)
+        print(f"\nWatching {os.path.relpath(BLOG_DIR, PROJECT_ROOT)} for changes (Ctrl+C to stop)...")
+        try:
+            while True:
+                changed, state = wait_for_changes(watched, state, SHARED_INPUT_EXCLUDES)
+                started = time.perf_counter()
+                try:
+                    blogs = parse_blog_registry(args.registry)
+                except Exception as e:
+                    print(f"✗ Error: {e}")
+                    continue
+
+                manifest = load_manifest()
+                shared_hash = compute_shared_hash(output_settings(optimize_settings, previews, args.linearize))
+                stale = []
+                for slug in sorted(affected_slugs(changed, [blog['slug'] for blog in blogs])):
+                    input_hash = compute_input_hash(slug, shared_hash)
+                    if not is_up_to_date(manifest, slug, input_hash):
+                        stale.append((slug, input_hash))
+
+                rendered = []
+                for slug, input_hash in stale:
+                    blog = next(blog for blog in blogs if blog['slug'] == slug)
+                    render_start = time.perf_counter()
+                    ok = generate_pdf(page, slug, base_url=args.base_url, previews=previews)
+                    if not ok:
+                        ok = generate_pdf(page, slug, timeout=RETRY_TIMEOUT, ready_deadline=RETRY_READY_DEADLINE,
+                                          retry=True, base_url=args.base_url, previews=previews)
+                    if not ok:
+                        manifest['articles'].pop(slug, None)
+                        continue
+                    render_seconds = time.perf_counter() - render_start
+                    if optimize_settings:
+                        optimize_rendered(slug, optimize_settings)
+                    if args.linearize:
+                        linearize_rendered(slug)
+                    catalog.record(blog, os.path.join(OUTPUT_DIR, f"{slug}.pdf"), render_seconds)
+                    manifest['articles'][slug] = {
+                        'hash': input_hash,
+                        'generated': datetime.now().isoformat(timespec='seconds'),
+                    }
+                    rendered.append(slug)
+                save_manifest(manifest)
+
+                if rendered or set(catalog.entries) != {blog['slug'] for blog in blogs}:
+                    refresh_outputs(blogs, catalog, args.hashed_names, args.book)
+                if asset_cache:
+                    asset_cache.save()
+                if stale:
+                    print(f"✓ Updated {len(rendered)}/{len(stale)} PDF(s) in {time.perf_counter() - started:.1f}s")
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+        finally:
+            context.close()
+            browser.close()
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Generate PDF files for all blog articles")
+    parser.add_argument(
+        '--workers', type=int, default=DEFAULT_WORKERS,
+        help=f"number of articles rendered concurrently (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help="re-render articles even if their inputs are unchanged",
+    )
+    parser.add_argument(
+        '--base-url', default=BASE_URL,
+        help=f"URL articles are loaded from, followed by the slug (default: {BASE_URL})",
+    )
+    parser.add_argument(
+        '--serve-build', action='store_true',
+        help="render the production build served in-process instead of the dev server",
+    )
+    parser.add_argument(
+        '--build-dir', default=BUILD_DIR,
+        help=f"production build served by --serve-build (default: {BUILD_DIR})",
+    )
+    parser.add_argument(
+        '--no-asset-cache', action='store_true',
+        help="fetch every request from the network and do not block analytics",
+    )
+    parser.add_argument(
+        '--asset-cache-dir', default=CACHE_DIR,
+        help=f"on-disk cache for static assets (default: {CACHE_DIR})",
+    )
+    parser.add_argument(
+        '--recycle-after', type=int, default=0, metavar='N',
+        help="open a fresh browser context after every N articles per worker (default: never)",
+    )
+    parser.add_argument(
+        '--max-rss', type=int, metavar='MB',
+        help="open a fresh browser context once a worker's Chromium RSS exceeds this (Linux)",
+    )
+    parser.add_argument(
+        '--optimize', action='store_true',
+        help="shrink each PDF after rendering (downsample images, merge duplicate objects)",
+    )
+    parser.add_argument(
+        '--target-dpi', type=int, default=DEFAULT_TARGET_DPI,
+        help=f"resolution images are downsampled to by --optimize (default: {DEFAULT_TARGET_DPI})",
+    )
+    parser.add_argument(
+        '--size-budget', type=int, metavar='KB',
+        help="per-article size budget for --optimize; larger PDFs are reported",
+    )
+    parser.add_argument(
+        '--previews', action='store_true',
+        help="also capture preview images of each article's first screen (requires Pillow)",
+    )
+    parser.add_argument(
+        '--preview-widths', type=parse_widths, default=DEFAULT_WIDTHS, metavar='W,...',
+        help=f"preview widths in pixels (default: {','.join(map(str, DEFAULT_WIDTHS))})",
+    )
+    parser.add_argument(
+        '--preview-formats', type=parse_formats, default=DEFAULT_FORMATS, metavar='FMT,...',
+        help=f"preview image formats (default: {','.join(DEFAULT_FORMATS)})",
+    )
+    parser.add_argument(
+        '--full-page', action='store_true',
+        help="with --previews, also capture a full-page screenshot of each article",
+    )
+    parser.add_argument(
+        '--linearize', action='store_true',
+        help="linearize each PDF (Fast Web View) so viewers show page one early (requires pikepdf)",
+    )
+    parser.add_argument(
+        '--book', action='store_true',
+        help=f"also merge all PDFs into {pdf_book.BOOK_NAME} with a cover, contents and outline (requires pikepdf)",
+    )
+    parser.add_argument(
+        '--output-dir',
+        help=f"where PDFs, the zip and index.html are written (default: {OUTPUT_DIR})",
+    )
+    parser.add_argument(
+        '--registry',
+        help="blog-registry.json or blog-registry.js to read articles from (default: scan src/blog)",
+    )
+    parser.add_argument(
+        '--report-dir', default=REPORT_DIR,
+        help=f"where the timing report and Chrome trace are written (default: {REPORT_DIR})",
+    )
+    parser.add_argument(
+        '--history', default=HISTORY_PATH,
+        help=f"per-article render times used to schedule and set deadlines (default: {HISTORY_PATH})",
+    )
+    parser.add_argument(
+        '--only', action='append', metavar='SLUG', default=[],
+        help="render only this slug, regardless of staleness (repeatable)",
+    )
+    parser.add_argument(
+        '--hashed-names', action='store_true',
+        help="link index.html to content-hashed PDF copies and write cache headers to firebase.json",
+    )
+    parser.add_argument(
+        '--shard', type=parse_shard, metavar='i/N',
+        help="render only shard i of N (balanced by past render time); merge with merge_pdf_shards.py",
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="after the run, keep the browser open and re-render articles as src/blog changes",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.recycle_after < 0:
+        parser.error("--recycle-after must not be negative")
+    if args.full_page and not args.previews:
+        parser.error("--full-page needs --previews")
+    if args.watch and args.shard:
+        parser.error("--watch cannot be combined with --shard")
+    if args.watch and args.serve_build:
+        parser.error("--watch renders from the dev server; the production build does not change with edits")
+    if args.book:
+        try:
+            pdf_book.require_book()
+        except RuntimeError as e:
+            parser.error(str(e))
+    return args
 
-def main():
+
+def main(argv=None):
     """Main function to generate all PDFs with automatic retry"""
+    args = parse_args(argv)
+
     print("=" * 60)
     print("Blog PDF Generator")
     print("=" * 60)
 
+    if args.output_dir:
+        set_output_dir(args.output_dir)
+
     # Parse blog registry to get slugs and titles
-    blogs = parse_blog_registry()
+    blogs = parse_blog_registry(args.registry)
+
+    unknown = set(args.only) - {blog['slug'] for blog in blogs}
+    if unknown:
+        print(f"✗ Error: unknown slug(s): {', '.join(sorted(unknown))}")
+        return False
 
     ensure_output_dir()
 
-    with sync_playwright() as p:
-        # Launch browser in headless mode
-        print("\nLaunching browser...")
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    manifest = load_manifest()
+    catalog = PdfCatalog(CATALOG_PATH)
+    history = RenderHistory(args.history)
+    shard_slugs = None
+    if args.shard:
+        # Shards read the shared manifest but write their own files, so
+        # several shards can share an output directory until they are merged
+        shard, count = args.shard
+        shard_slugs = select_shard(blogs, shard, count, catalog)
+        shard_manifest_path, shard_catalog_path, shard_history_path = shard_paths(shard, count)
+        manifest['articles'].update(load_manifest(shard_manifest_path)['articles'])
+        catalog = PdfCatalog(shard_catalog_path)
+        print(f"Shard {shard}/{count}: {len(shard_slugs)} of {len(blogs)} articles")
+
+    optimize_settings = None
+    if args.optimize:
+        try:
+            require_pikepdf("PDF optimization", pillow=True)
+        except RuntimeError as e:
+            print(f"✗ Error: {e}")
+            return False
+        optimize_settings = {'target_dpi': args.target_dpi, 'size_budget': args.size_budget}
+    previews = None
+    if args.previews:
+        try:
+            require_pillow()
+        except RuntimeError as e:
+            print(f"✗ Error: {e}")
+            return False
+        previews = {
+            'widths': list(args.preview_widths),
+            'formats': list(args.preview_formats),
+            'full_page': args.full_page,
+        }
+    if args.linearize:
+        try:
+            require_pikepdf("PDF linearization")
+        except RuntimeError as e:
+            print(f"✗ Error: {e}")
+            return False
+    shared_hash = compute_shared_hash(output_settings(optimize_settings, previews, args.linearize))
+    input_hashes = {}
+
+    # Queue every stale blog post
+    successful = []
+    pending = []
+
+    for i, blog in enumerate(blogs, 1):
+        slug = blog['slug']
+        pdf_exists = os.path.exists(os.path.join(OUTPUT_DIR, f"{slug}.pdf"))
 
-        # First pass: Generate PDFs for all blog posts
-        successful = []
-        failed = []
+        if shard_slugs is not None and slug not in shard_slugs:
+            continue  # Another shard's article
 
-        print(f"\nGenerating PDFs for {len(blogs)} blog posts...")
-        print("-" * 60)
+        if args.only and slug not in args.only:
+            # Not selected: keep whatever is already on disk in the zip and index
+            if pdf_exists:
+                successful.append((i, blog))
+            continue
 
-        for i, blog in enumerate(blogs, 1):
-            slug = blog['slug']
-            pdf_path = os.path.join(OUTPUT_DIR, f"{slug}.pdf")
-            print(f"\n[{i}/{len(blogs)}] Processing: {slug}")
+        input_hashes[slug] = compute_input_hash(slug, shared_hash)
+        if not args.force and not args.only and is_up_to_date(manifest, slug, input_hashes[slug]):
+            print(f"[{i}/{len(blogs)}] ✓ Skipping (up to date): {slug}.pdf ({get_pdf_size(slug)})")
+            successful.append((i, blog))
+        else:
+            reason = 'stale' if pdf_exists else 'missing'
+            if args.force or args.only:
+                reason = 'forced'
+            print(f"[{i}/{len(blogs)}] Queued ({reason}): {slug}")
+            pending.append((i, blog))
 
-            # Skip if PDF already exists
-            if os.path.exists(pdf_path):
-                print(f"✓ Skipping (already exists): {slug}.pdf ({get_pdf_size(slug)})")
-                successful.append(blog)
-                continue
+    failed = []
+    asset_cache = None if args.no_asset_cache else AssetCache(args.asset_cache_dir)
 
-            if generate_pdf(page, slug, timeout=INITIAL_TIMEOUT, wait_time=INITIAL_WAIT, retry=False):
-                successful.append(blog)
-            else:
-                failed.append(blog)
+    # Stream fresh PDFs into the zip while the remaining articles render
+    # (shards leave the zip and index to merge_pdf_shards.py)
+    archive = None if args.shard else PdfArchive(ZIP_PATH)
 
-        # Second pass: Retry failed generations with longer timeout
-        if failed:
-            print("\n" + "=" * 60)
-            print(f"Retrying {len(failed)} failed blog posts with longer timeout...")
-            print("=" * 60)
+    optimize_reports = {}
+    trace = RenderTrace()
 
-            retry_failed = []
-            for i, blog in enumerate(failed, 1):
-                slug = blog['slug']
-                print(f"\n[Retry {i}/{len(failed)}] Processing: {slug}")
-                if generate_pdf(page, slug, timeout=RETRY_TIMEOUT, wait_time=RETRY_WAIT, retry=True):
-                    successful.append(blog)
-                else:
-                    retry_failed.append(blog)
+    def on_rendered(blog):
+        slug = blog['slug']
+        pdf_path = os.path.join(OUTPUT_DIR, f"{slug}.pdf")
+        if optimize_settings:
+            with trace.span(slug, 'optimize'):
+                report = optimize_rendered(slug, optimize_settings)
+            if report:
+                optimize_reports[slug] = report
+        if args.linearize:
+            with trace.span(slug, 'linearize'):
+                linearize_rendered(slug)
+        catalog.record(blog, pdf_path, trace.last_duration(slug, 'article'))
+        if archive:
+            with trace.span(slug, 'zip'):
+                archive.add(f"{slug}.pdf", pdf_path)
+
+    if pending:
+        with contextlib.ExitStack() as stack:
+            base_url = args.base_url
+            if args.serve_build:
+                try:
+                    base_url = stack.enter_context(serve_build(args.build_dir)) + 'blog/'
+                except FileNotFoundError as e:
+                    print(f"✗ Error: {e}")
+                    if archive:
+                        archive.abort()
+                    return False
+                print(f"\nServing production build {args.build_dir} at {base_url}")
+
+            print(f"\nGenerating PDFs for {len(pending)} blog posts with {args.workers} worker(s)...")
+            print("-" * 60)
+            rendered, failed = render_blogs(
+                pending, args.workers, history, base_url=base_url, trace=trace, previews=previews,
+                asset_cache=asset_cache, on_rendered=on_rendered, recycle_after=args.recycle_after,
+                max_rss=args.max_rss * 1024 * 1024 if args.max_rss else None
+            )
+            successful.extend(rendered)
+        if args.shard:
+            history.save(shard_history_path, slugs=shard_slugs)
+        else:
+            history.save()
 
-            failed = retry_failed
+    successful = [blog for _, blog in sorted(successful, key=lambda item: item[0])]
+    failed = [blog for _, blog in failed]
 
-        browser.close()
+    # Record the inputs of everything rendered in this run
+    failed_slugs = {blog['slug'] for blog in failed}
+    for _, blog in pending:
+        slug = blog['slug']
+        if slug in failed_slugs:
+            manifest['articles'].pop(slug, None)
+        else:
+            manifest['articles'][slug] = {
+                'hash': input_hashes[slug],
+                'generated': datetime.now().isoformat(timespec='seconds'),
+            }
+    if args.shard:
+        shard_articles = {slug: manifest['articles'][slug] for slug in shard_slugs if slug in manifest['articles']}
+        save_manifest({'version': MANIFEST_VERSION, 'articles': shard_articles}, shard_manifest_path)
+    else:
+        save_manifest(manifest)
+    if asset_cache:
+        asset_cache.save()
+
+    # Describe up-to-date PDFs too (a stat each unless they changed on disk)
+    rendered_slugs = {blog['slug'] for _, blog in pending}
+    for blog in successful:
+        if blog['slug'] not in rendered_slugs:
+            catalog.ensure(blog, os.path.join(OUTPUT_DIR, f"{blog['slug']}.pdf"))
+    catalog.drop_missing(blog['slug'] for blog in blogs if shard_slugs is None or blog['slug'] in shard_slugs)
+    catalog.save()
+    entries = catalog.select([blog['slug'] for blog in successful])
 
     # Generate zip archive and index.html
-    if successful:
+    if args.shard:
+        print(f"\nShard {shard}/{count} done; run scripts/merge_pdf_shards.py to build the zip and index")
+    elif successful:
         print("\n" + "=" * 60)
         print("Creating zip archive and index...")
         print("=" * 60)
-        zip_size = create_zip_archive(successful)
-        generate_index_html(successful, zip_size)
+        entries = publish_entries(entries, args.hashed_names)
+        with trace.span('*', 'zip:finalize'):
+            zip_size = create_zip_archive(entries, archive)
+            zip_href = publish_zip(args.hashed_names)
+        book = None
+        if args.book:
+            with trace.span('*', 'book'):
+                book = publish_book(entries, args.hashed_names)
+        with trace.span('*', 'index'):
+            generate_index_html(entries, zip_size, zip_href, book)
+        if args.hashed_names and update_firebase_headers():
+            print("✓ Updated Cache-Control headers in firebase.json")
+    else:
+        archive.abort()
 
     # Summary
     print("\n" + "=" * 60)
@@ -479,6 +1345,36 @@ def main():
     print(f"Total blog posts: {len(blogs)}")
     print(f"Successfully generated: {len(successful)}")
     print(f"Failed: {len(failed)}")
+    if asset_cache and pending:
+        print(f"Asset cache: {asset_cache.summary()}")
+    peaks = {slug: metrics['PeakRSS'] for slug, metrics in trace.metrics.items() if 'PeakRSS' in metrics}
+    if peaks:
+        heaviest = max(peaks, key=peaks.get)
+        print(
+            f"Peak Chromium RSS per article: p50 {percentile(list(peaks.values()), 0.5) / (1024 * 1024):.0f} MB, "
+            f"max {peaks[heaviest] / (1024 * 1024):.0f} MB ({heaviest})"
+        )
+    if optimize_reports:
+        before = sum(report['before'] for report in optimize_reports.values())
+        after = sum(report['after'] for report in optimize_reports.values())
+        print(f"Optimized: {before / (1024 * 1024):.1f} MB -> {after / (1024 * 1024):.1f} MB")
+        over_budget = [slug for slug, report in optimize_reports.items() if report['over_budget']]
+        if over_budget:
+            print(f"Over size budget ({args.size_budget} KB): {', '.join(sorted(over_budget))}")
+
+    if trace.spans:
+        os.makedirs(args.report_dir, exist_ok=True)
+        # Concurrent shards each write their own; merge_pdf_shards.py combines them
+        suffix = f".shard-{shard}-of-{count}" if args.shard else ''
+        report_path = os.path.join(args.report_dir, f"render-report{suffix}.json")
+        trace_path = os.path.join(args.report_dir, f"render-trace{suffix}.json")
+        trace.write_json(report_path)
+        trace.write_chrome_trace(trace_path)
+        print("\nStage timings:")
+        for line in trace.summary_table():
+            print(f"  {line}")
+        print(f"Timing report: {report_path}")
+        print(f"Chrome trace: {trace_path}")
 
     if failed:
         print(f"\nFailed blog posts:")
@@ -486,10 +1382,13 @@ def main():
             print(f"  - {blog['slug']}")
 
     print(f"\nPDFs saved to: {OUTPUT_DIR}")
-    if successful:
+    if successful and not args.shard:
         print(f"Index page: {OUTPUT_DIR}/index.html")
     print("=" * 60)
 
+    if args.watch:
+        watch(args, catalog, optimize_settings, asset_cache, previews)
+
     return len(failed) == 0
 
 if __name__ == "__main__":
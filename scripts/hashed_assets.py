@@ -0,0 +1,97 @@
+"""
+Content-addressed copies of the published PDFs and matching Firebase headers
+
+With --hashed-names the generator publishes `<slug>.<hash8>.pdf` (and
+`all-blog-pdfs.<hash8>.zip`) next to the plain files and links index.html to
+them. A hashed name never changes content, so hosting can cache it for a
+year; index.html and the plain names get a short lifetime instead.
+"""
+
+import json
+import os
+import re
+import shutil
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+FIREBASE_CONFIG = os.path.join(PROJECT_ROOT, 'firebase.json')
+
+HASH_LENGTH = 8
+URL_PREFIX = '/pdfs/'
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+SHORT_CACHE = 'public, max-age=300, must-revalidate'
+
+
+def hashed_name(name, digest):
+    """'slug.pdf' + sha256 hex -> 'slug.0123abcd.pdf'"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def remove_hashed(directory, name, keep=None):
+    """Delete hashed copies of `name` in `directory` other than `keep`"""
+    stem, ext = os.path.splitext(name)
+    pattern = re.compile(rf'{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(ext)}')
+    for entry in os.listdir(directory):
+        if entry != keep and pattern.fullmatch(entry):
+            os.remove(os.path.join(directory, entry))
+
+
+def publish_hashed(path, digest):
+    """Copy `path` to its content-hashed name and drop older hashed copies.
+
+    A copy rather than a hard link: Chromium rewrites the plain file in
+    place on the next render, which must not change a published hash.
+    """
+    directory, name = os.path.split(path)
+    target = hashed_name(name, digest)
+    target_path = os.path.join(directory, target)
+    if not os.path.exists(target_path):
+        tmp_path = f"{target_path}.tmp"
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, target_path)
+    remove_hashed(directory, name, keep=target)
+    return target
+
+
+def firebase_headers(prefix=URL_PREFIX):
+    """Hosting `headers` rules: hashed files immutable, everything else short"""
+    base = re.escape(prefix)
+    return [
+        {
+            'regex': rf'^{base}[^/.]+\.[0-9a-f]{{{HASH_LENGTH}}}\.(?:pdf|zip)$',
+            'headers': [{'key': 'Cache-Control', 'value': IMMUTABLE_CACHE}],
+        },
+        {
+            'regex': rf'^{base}(?:index\.html)?$|^{base}[^/.]+\.(?:pdf|zip)$',
+            'headers': [{'key': 'Cache-Control', 'value': SHORT_CACHE}],
+        },
+    ]
+
+
+def update_firebase_headers(config_path=FIREBASE_CONFIG, prefix=URL_PREFIX):
+    """Merge the PDF cache rules into firebase.json; True if it changed.
+
+    Rules for other paths are kept; rules previously written for `prefix`
+    are replaced, so repeated runs leave the file unchanged.
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    hosting = config.setdefault('hosting', {})
+    rules = firebase_headers(prefix)
+    ours = {rule['regex'] for rule in rules}
+    base = re.escape(prefix)
+    kept = [
+        rule for rule in hosting.get('headers', [])
+        if rule.get('regex') not in ours and not rule.get('regex', '').startswith(f'^{base}')
+    ]
+    headers = kept + rules
+    if hosting.get('headers') == headers:
+        return False
+    hosting['headers'] = headers
+    tmp_path = f"{config_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, config_path)
+    return True
@@ -0,0 +1,44 @@
+"""
+Pillow and file helpers shared by the PDF page previews and the figure export
+
+Pillow is optional: Image is None without it, and require_pillow() raises
+once something actually needs to encode an image.
+"""
+
+import io
+import os
+
+try:
+    from PIL import Image
+except ImportError:  # Only needed when images are encoded
+    Image = None
+
+WEBP_QUALITY = 82
+JPEG_QUALITY = 85
+AVIF_QUALITY = 70
+
+
+def require_pillow(purpose="Image encoding"):
+    if Image is None:
+        raise RuntimeError(f"{purpose} needs Pillow (pip install pillow)")
+
+
+def encode(image, fmt):
+    """`image` encoded as 'png', 'webp', 'jpeg' or 'avif' bytes"""
+    buffer = io.BytesIO()
+    if fmt == 'webp':
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    elif fmt == 'avif':
+        image.save(buffer, 'AVIF', quality=AVIF_QUALITY)
+    elif fmt == 'jpeg':
+        image.convert('RGB').save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+    else:
+        image.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
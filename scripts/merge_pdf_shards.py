@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Merge the outputs of `generate_blog_pdfs.py --shard i/N` runs
+Each shard writes its PDFs plus a .build-manifest.shard-i-of-N.json,
+.catalog.shard-i-of-N.json and .render-history.shard-i-of-N.json next to
+them. This collects every shard found in the given directories into the
+output directory (copying PDFs and previews when the shard ran elsewhere),
+folds the shard files into the shared manifest, catalog and render history,
+and builds all-blog-pdfs.zip and index.html once. Timing reports that local
+shards wrote to the report directory are combined as well.
+
+Usage:
+    python scripts/merge_pdf_shards.py [SHARD_DIR ...] [--output-dir DIR] [--registry PATH] [--hashed-names] [--book]
+
+With no SHARD_DIR, shards written into the output directory itself are merged.
+"""
+
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+
+import generate_blog_pdfs as generator
+import pdf_book
+from hashed_assets import update_firebase_headers
+from page_previews import PREVIEW_DIR_NAME
+from pdf_catalog import PdfCatalog
+from pdf_trace import RenderTrace
+from render_scheduler import HISTORY_PATH, RenderHistory
+
+SHARD_CATALOG_GLOB = '.catalog.shard-*-of-*.json'
+
+
+def find_shards(directories):
+    """[(directory, catalog path, manifest path, history path)] for every shard in `directories`"""
+    shards = []
+    for directory in directories:
+        for catalog_path in sorted(glob.glob(os.path.join(directory, SHARD_CATALOG_GLOB))):
+            suffix = os.path.basename(catalog_path)[len('.catalog.'):]
+            shards.append((
+                directory, catalog_path,
+                os.path.join(directory, f".build-manifest.{suffix}"),
+                os.path.join(directory, f".render-history.{suffix}"),
+            ))
+    return shards
+
+
+def copy_if_elsewhere(source, destination):
+    """Copy `source` unless it already is `destination`; keeps the mtime"""
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        return
+    tmp_path = f"{destination}.tmp"
+    shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, destination)
+
+
+def merge_shards(shards, catalog, manifest):
+    """Fold shard catalogs and manifests into `catalog` and `manifest`.
+
+    Returns {slug: shard catalog path}. When two shards rendered the same
+    article, the most recent render wins.
+    """
+    merged = {}
+    for directory, catalog_path, manifest_path, _ in shards:
+        shard_catalog = PdfCatalog(catalog_path)
+        shard_manifest = generator.load_manifest(manifest_path)
+        name = os.path.basename(catalog_path)
+        for slug, entry in shard_catalog.entries.items():
+            source = os.path.join(directory, entry['file'])
+            if not os.path.exists(source):
+                print(f"  - {name}: {entry['file']} is missing, skipped")
+                continue
+            previous = catalog.get(slug) if slug in merged else None
+            if previous and previous['updated'] > entry['updated']:
+                print(f"  - {slug} is in several shards, keeping the newer render")
+                continue
+
+            destination = os.path.join(generator.OUTPUT_DIR, entry['file'])
+            copy_if_elsewhere(source, destination)
+            for preview in glob.glob(os.path.join(directory, PREVIEW_DIR_NAME, f"{glob.escape(slug)}-*")):
+                preview_dir = os.path.join(generator.OUTPUT_DIR, PREVIEW_DIR_NAME)
+                os.makedirs(preview_dir, exist_ok=True)
+                copy_if_elsewhere(preview, os.path.join(preview_dir, os.path.basename(preview)))
+
+            catalog.adopt(entry, destination)
+            if slug in shard_manifest['articles']:
+                manifest['articles'][slug] = shard_manifest['articles'][slug]
+            merged[slug] = catalog_path
+        print(f"✓ Merged {name} ({len(shard_catalog.entries)} articles)")
+    return merged
+
+
+def merge_histories(shards, history):
+    """Fold each shard's render times into `history` (shards only hold their own articles)"""
+    for _, _, _, history_path in shards:
+        if os.path.exists(history_path):
+            history.update(RenderHistory(history_path).durations)
+
+
+def merge_reports(report_dir):
+    """Combine per-shard timing reports and Chrome traces; returns how many were merged"""
+    report_paths = sorted(glob.glob(os.path.join(report_dir, 'render-report.shard-*-of-*.json')))
+    if not report_paths:
+        return 0
+    trace = RenderTrace()
+    for path in report_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        trace.spans += report['spans']
+        for slug, metrics in report['metrics'].items():
+            trace.add_metrics(slug, metrics)
+    trace.write_json(os.path.join(report_dir, 'render-report.json'))
+
+    # Each shard was its own process, so its events already carry a distinct pid
+    trace_paths = sorted(glob.glob(os.path.join(report_dir, 'render-trace.shard-*-of-*.json')))
+    events = []
+    for path in trace_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            events += json.load(f)['traceEvents']
+    if events:
+        with open(os.path.join(report_dir, 'render-trace.json'), 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    for path in report_paths + trace_paths:
+        os.remove(path)
+    return len(report_paths)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge sharded blog PDF outputs into the zip and index")
+    parser.add_argument('shard_dirs', nargs='*', metavar='SHARD_DIR')
+    parser.add_argument(
+        '--output-dir',
+        help=f"where merged PDFs, the zip and index.html are written (default: {generator.OUTPUT_DIR})",
+    )
+    parser.add_argument(
+        '--registry',
+        help="blog-registry.json or blog-registry.js to read articles from (default: scan src/blog)",
+    )
+    parser.add_argument(
+        '--hashed-names', action='store_true',
+        help="link index.html to content-hashed PDF copies and write cache headers to firebase.json",
+    )
+    parser.add_argument(
+        '--book', action='store_true',
+        help="also merge all PDFs into one book PDF (requires pikepdf)",
+    )
+    parser.add_argument(
+        '--history', default=HISTORY_PATH,
+        help=f"render history the shards' render times are merged into (default: {HISTORY_PATH})",
+    )
+    parser.add_argument(
+        '--report-dir', default=generator.REPORT_DIR,
+        help=f"where shard timing reports are combined (default: {generator.REPORT_DIR})",
+    )
+    args = parser.parse_args(argv)
+    if args.book:
+        try:
+            pdf_book.require_book()
+        except RuntimeError as e:
+            parser.error(str(e))
+
+    if args.output_dir:
+        generator.set_output_dir(args.output_dir)
+    generator.ensure_output_dir()
+
+    shards = find_shards(args.shard_dirs or [generator.OUTPUT_DIR])
+    if not shards:
+        print("✗ Error: no shard outputs found")
+        return False
+
+    blogs = generator.parse_blog_registry(args.registry)
+    catalog = PdfCatalog(generator.CATALOG_PATH)
+    manifest = generator.load_manifest()
+    merged = merge_shards(shards, catalog, manifest)
+    generator.save_manifest(manifest)
+    catalog.save()
+    history = RenderHistory(args.history)
+    merge_histories(shards, history)
+    history.save()
+    if os.path.isdir(args.report_dir) and merge_reports(args.report_dir):
+        print(f"✓ Combined shard timing reports in {args.report_dir}")
+
+    # Shard files are folded into the shared ones now
+    for _, catalog_path, manifest_path, history_path in shards:
+        for path in (catalog_path, manifest_path, history_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    generator.refresh_outputs(blogs, catalog, args.hashed_names, args.book)
+    if args.hashed_names and update_firebase_headers():
+        print("✓ Updated Cache-Control headers in firebase.json")
+
+    missing = [
+        blog['slug'] for blog in blogs
+        if not os.path.exists(os.path.join(generator.OUTPUT_DIR, f"{blog['slug']}.pdf"))
+    ]
+    print(f"\n✓ Merged {len(merged)} articles from {len(shards)} shard(s) into {generator.OUTPUT_DIR}")
+    if missing:
+        print("Articles without a PDF:")
+        for slug in missing:
+            print(f"  - {slug}")
+    return not missing
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
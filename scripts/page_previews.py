@@ -0,0 +1,78 @@
+"""
+Preview images captured from an already-loaded article page (requires Pillow)
+
+The generator calls capture_previews() right after page.pdf(), so thumbnails
+and Open Graph images reuse the navigation, KaTeX and image loading that the
+PDF already paid for. One screenshot is taken at the Open Graph size and
+scaled down to each requested width; an optional full-page screenshot is
+taken at the page's own viewport.
+
+Files are written to <output dir>/previews/:
+    <slug>-<width>.<format>    first screen, 1200x630 scaled to width
+    <slug>-full.png            whole article (--full-page)
+"""
+
+import io
+import os
+
+from image_utils import Image, encode, write_atomic
+from image_utils import require_pillow as require_image_support
+
+PREVIEW_DIR_NAME = 'previews'
+PREVIEW_SIZE = (1200, 630)  # Open Graph / Twitter large card
+DEFAULT_WIDTHS = (1200, 600, 300)
+DEFAULT_FORMATS = ('png', 'webp')
+FORMATS = ('png', 'webp', 'jpeg')
+
+
+def require_pillow():
+    require_image_support("Preview images")
+
+
+def parse_widths(value):
+    """'1200,600' -> (1200, 600), largest first"""
+    widths = sorted({int(width) for width in value.split(',') if width.strip()}, reverse=True)
+    if not widths or widths[-1] < 1 or widths[0] > PREVIEW_SIZE[0]:
+        raise ValueError(f"widths must be between 1 and {PREVIEW_SIZE[0]}")
+    return tuple(widths)
+
+
+def parse_formats(value):
+    formats = tuple(dict.fromkeys(fmt.strip().lower() for fmt in value.split(',') if fmt.strip()))
+    unknown = set(formats) - set(FORMATS)
+    if not formats or unknown:
+        raise ValueError(f"formats must be among {', '.join(FORMATS)}")
+    return formats
+
+
+def capture_previews(page, slug, output_dir, widths=DEFAULT_WIDTHS, formats=DEFAULT_FORMATS, full_page=False):
+    """Screenshot the loaded page into preview files; returns their paths"""
+    preview_dir = os.path.join(output_dir, PREVIEW_DIR_NAME)
+    os.makedirs(preview_dir, exist_ok=True)
+    written = []
+
+    if full_page:
+        path = os.path.join(preview_dir, f"{slug}-full.png")
+        write_atomic(path, page.screenshot(type='png', full_page=True))
+        written.append(path)
+
+    viewport = page.viewport_size
+    width, height = PREVIEW_SIZE
+    page.set_viewport_size({'width': width, 'height': height})
+    try:
+        page.evaluate('() => window.scrollTo(0, 0)')
+        screenshot = Image.open(io.BytesIO(page.screenshot(type='png')))
+        screenshot.load()
+    finally:
+        if viewport:
+            page.set_viewport_size(viewport)
+
+    for target in widths:
+        image = screenshot
+        if target != width:
+            image = screenshot.resize((target, round(height * target / width)), Image.LANCZOS)
+        for fmt in formats:
+            path = os.path.join(preview_dir, f"{slug}-{target}.{fmt}")
+            write_atomic(path, encode(image, fmt))
+            written.append(path)
+    return written
@@ -0,0 +1,185 @@
+"""
+Incremental builder for all-blog-pdfs.zip
+
+Members whose PDF is unchanged since the previous archive (same size and
+modification time) are copied over as raw compressed bytes; only new or
+re-rendered PDFs are read and compressed. Chromium PDFs are mostly deflated
+streams already, so each member is stored unless deflating a sample of it
+saves at least ZIP_MIN_GAIN.
+"""
+
+import os
+import shutil
+import struct
+import threading
+import zipfile
+import zlib
+
+ZIP_SAMPLE_BYTES = 256 * 1024
+ZIP_MIN_GAIN = 0.05  # fraction of the sample deflate has to save
+LOCAL_HEADER_SIZE = 30
+DATA_DESCRIPTOR_FLAG = 0x08
+ZIPFILE_INTERNALS = ('fp', 'start_dir', 'filelist', 'NameToInfo', '_didModify')  # used by copy_previous()
+
+
+def choose_compression(path):
+    """Pick ZIP_STORED or ZIP_DEFLATED from the gain measured on a sample"""
+    with open(path, 'rb') as f:
+        sample = f.read(ZIP_SAMPLE_BYTES)
+    if not sample:
+        return zipfile.ZIP_STORED
+    gain = 1 - len(zlib.compress(sample, 6)) / len(sample)
+    return zipfile.ZIP_DEFLATED if gain >= ZIP_MIN_GAIN else zipfile.ZIP_STORED
+
+
+def is_unchanged(info, path):
+    """True if a member was written from the file currently at `path`"""
+    stat = os.stat(path)
+    return (
+        info.file_size == stat.st_size
+        and info.date_time == zipfile.ZipInfo.from_file(path).date_time
+    )
+
+
+class PdfArchive:
+    """Write a new archive next to the old one, reusing unchanged members.
+
+    add() may be called from render workers as soon as a PDF is written;
+    close() fills in the remaining members and swaps the archive into place.
+    """
+
+    def __init__(self, zip_path):
+        self.zip_path = zip_path
+        self.tmp_path = f"{zip_path}.{os.getpid()}.tmp"  # concurrent builds and merges
+        self.lock = threading.Lock()
+        self.written = set()
+        self.stats = {'added': 0, 'reused': 0, 'stored': 0, 'deflated': 0}
+        self.previous = None
+        if os.path.exists(zip_path):
+            try:
+                self.previous = zipfile.ZipFile(zip_path, 'r')
+            except zipfile.BadZipFile:
+                self.previous = None
+        self.zip = zipfile.ZipFile(self.tmp_path, 'w')
+
+    def add(self, name, path):
+        """Compress `path` into the archive as `name`, replacing any old member"""
+        compression = choose_compression(path)
+        with self.lock:
+            if name in self.written:
+                return
+            self.zip.write(path, name, compress_type=compression)
+            self.written.add(name)
+            self.stats['added'] += 1
+            self.stats['deflated' if compression == zipfile.ZIP_DEFLATED else 'stored'] += 1
+
+    def copy_previous(self, info):
+        """Append an old member's compressed bytes verbatim.
+
+        zipfile has no public raw-copy API, so the local header is rewritten
+        here and the entry is registered the way ZipFile.write() does. That
+        relies on ZipFile internals (fp, start_dir, filelist, NameToInfo,
+        _didModify) that every CPython 3 release so far has (tested on
+        3.11); if they are missing the member is decompressed and
+        compressed again instead.
+        """
+        if not all(hasattr(self.zip, name) for name in ZIPFILE_INTERNALS):
+            self.zip.writestr(info, self.previous.read(info), compress_type=info.compress_type)
+            return
+        src = self.previous.fp
+        src.seek(info.header_offset)
+        header = src.read(LOCAL_HEADER_SIZE)
+        name_length, extra_length = struct.unpack('<HH', header[26:30])
+        src.seek(info.header_offset + LOCAL_HEADER_SIZE + name_length + extra_length)
+
+        copied = zipfile.ZipInfo(info.filename, info.date_time)
+        copied.compress_type = info.compress_type
+        copied.external_attr = info.external_attr
+        copied.create_system = info.create_system
+        copied.flag_bits = info.flag_bits & ~DATA_DESCRIPTOR_FLAG
+        copied.CRC = info.CRC
+        copied.compress_size = info.compress_size
+        copied.file_size = info.file_size
+
+        out = self.zip.fp
+        copied.header_offset = out.tell()
+        out.write(copied.FileHeader())
+        shutil.copyfileobj(_LimitedReader(src, info.compress_size), out)
+        self.zip.start_dir = out.tell()
+        self.zip.filelist.append(copied)
+        self.zip.NameToInfo[copied.filename] = copied
+        self.zip._didModify = True
+
+    def close(self, members):
+        """Finish the archive with exactly `members` ({name: path}) and return its size"""
+        with self.lock:
+            for name, path in members.items():
+                if name in self.written or not os.path.exists(path):
+                    continue
+                info = None
+                if self.previous is not None and name in self.previous.NameToInfo:
+                    info = self.previous.getinfo(name)
+                if info is not None and is_unchanged(info, path):
+                    self.copy_previous(info)
+                    self.written.add(name)
+                    self.stats['reused'] += 1
+                else:
+                    compression = choose_compression(path)
+                    self.zip.write(path, name, compress_type=compression)
+                    self.written.add(name)
+                    self.stats['added'] += 1
+                    self.stats['deflated' if compression == zipfile.ZIP_DEFLATED else 'stored'] += 1
+
+            stale = self.written - set(members)
+            self.zip.close()
+            if self.previous is not None:
+                self.previous.close()
+
+        if stale:
+            # Members streamed in but not wanted (e.g. failed later): rebuild once
+            rebuilt_path = f"{self.zip_path}.{os.getpid()}.rebuild"
+            os.replace(self.tmp_path, rebuilt_path)
+            self.previous = zipfile.ZipFile(rebuilt_path, 'r')
+            self.zip = zipfile.ZipFile(self.tmp_path, 'w')
+            for name in members:
+                if name in self.previous.NameToInfo:
+                    self.copy_previous(self.previous.getinfo(name))
+            self.zip.close()
+            self.previous.close()
+            os.remove(rebuilt_path)
+
+        os.replace(self.tmp_path, self.zip_path)
+        return os.path.getsize(self.zip_path)
+
+    def abort(self):
+        """Discard the partially written archive and keep the old one"""
+        with self.lock:
+            self.zip.close()
+            if self.previous is not None:
+                self.previous.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def summary(self):
+        stats = self.stats
+        return (
+            f"{stats['reused']} reused, {stats['added']} added "
+            f"({stats['stored']} stored, {stats['deflated']} deflated)"
+        )
+
+
+class _LimitedReader:
+    """File-like view of the next `remaining` bytes of `fp`"""
+
+    def __init__(self, fp, remaining):
+        self.fp = fp
+        self.remaining = remaining
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fp.read(size)
+        self.remaining -= len(data)
+        return data
@@ -0,0 +1,238 @@
+"""
+Combined "book" PDF of every article (requires pikepdf)
+
+The per-article PDFs are concatenated in registry order (newest first)
+behind a generated cover and table of contents, with a bookmark outline and
+clickable contents entries. Nothing is re-rendered: pages are copied as they
+are and identical streams, fonts and descriptors across articles are merged
+into one object, so the book is smaller than the sum of its parts.
+
+The inputs (article hashes, titles and dates) are recorded next to the book;
+when they are unchanged the existing book is kept as is, and a changed
+article costs one merge (seconds) instead of a full render.
+
+Usage:
+    python scripts/pdf_book.py [--output-dir DIR] [--force]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import math
+import os
+import sys
+from datetime import datetime
+
+from pdf_catalog import CATALOG_NAME, PdfCatalog
+from pdf_deps import pikepdf, require_pikepdf
+from pdf_optimize import dedupe_objects
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+DEFAULT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, 'public', 'pdfs')
+BOOK_NAME = 'all-blog-posts.pdf'
+STATE_NAME = '.book.json'
+BOOK_VERSION = 1
+BOOK_TITLE = 'Ad Absurdum'
+BOOK_SUBTITLE = 'Collected articles'
+
+PAGE_SIZE = (595.28, 841.89)  # A4 in points, like PDF_OPTIONS
+MARGIN = 72
+TOC_ENTRY_HEIGHT = 30
+TOC_FIRST_Y = PAGE_SIZE[1] - MARGIN - 60
+TOC_ENTRIES_PER_PAGE = int((TOC_FIRST_Y - MARGIN) // TOC_ENTRY_HEIGHT) + 1
+TITLE_CHARS = 68      # Helvetica averages ~0.5 em, so this fills the line at 12 pt
+DIGIT_WIDTH = 0.556   # every Helvetica digit is 556/1000 em wide
+
+
+def book_key(entries):
+    """Hash of everything the book is built from"""
+    parts = [(entry['slug'], entry['sha256'], entry['title'], entry.get('date', '')) for entry in entries]
+    return hashlib.sha256(json.dumps([BOOK_VERSION, BOOK_TITLE, parts]).encode('utf-8')).hexdigest()
+
+
+def load_state(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def pdf_text(text):
+    """A string Helvetica can show with WinAnsiEncoding"""
+    return pikepdf.String(text.encode('cp1252', errors='replace'))
+
+
+def truncate(text, limit):
+    return text if len(text) <= limit else text[:limit - 3].rstrip() + '...'
+
+
+def text_page(book, lines, fonts):
+    """Append a page of (font, size, gray, x, y, text) runs and return it"""
+    operations = []
+    for font, size, gray, x, y, text in lines:
+        operations += [
+            ([], 'BT'),
+            ([gray], 'g'),
+            ([pikepdf.Name(font), size], 'Tf'),
+            ([x, y], 'Td'),
+            ([pdf_text(text)], 'Tj'),
+            ([], 'ET'),
+        ]
+    page = pikepdf.Dictionary(
+        Type=pikepdf.Name.Page,
+        MediaBox=[0, 0, *PAGE_SIZE],
+        Resources=pikepdf.Dictionary(Font=fonts),
+        Contents=book.make_stream(pikepdf.unparse_content_stream(operations)),
+    )
+    book.pages.append(pikepdf.Page(page))
+    return book.pages[-1]
+
+
+def cover_lines(entries):
+    dates = [entry['date'] for entry in entries if entry.get('date')]
+    span = f"{dates[-1]} - {dates[0]}" if dates else ''
+    return [
+        ('/F2', 32, 0, MARGIN, PAGE_SIZE[1] * 0.62, BOOK_TITLE),
+        ('/F1', 16, 0.35, MARGIN, PAGE_SIZE[1] * 0.62 - 34, BOOK_SUBTITLE),
+        ('/F1', 11, 0.45, MARGIN, PAGE_SIZE[1] * 0.62 - 70, f"{len(entries)} articles  {span}"),
+        ('/F1', 9, 0.55, MARGIN, MARGIN, f"Generated {datetime.now().strftime('%d %b %Y')}"),
+    ]
+
+
+def toc_lines(chunk, first_number, starts, show_heading):
+    """Text runs and link rectangles for one contents page"""
+    lines = [('/F2', 20, 0, MARGIN, PAGE_SIZE[1] - MARGIN - 20, 'Contents')] if show_heading else []
+    links = []
+    right = PAGE_SIZE[0] - MARGIN
+    for offset, entry in enumerate(chunk):
+        y = TOC_FIRST_Y - offset * TOC_ENTRY_HEIGHT
+        number = str(starts[first_number + offset] + 1)
+        lines.append(('/F1', 12, 0, MARGIN, y, truncate(entry['title'], TITLE_CHARS)))
+        lines.append(('/F1', 12, 0, right - len(number) * DIGIT_WIDTH * 12, y, number))
+        if entry.get('date'):
+            lines.append(('/F1', 9, 0.45, MARGIN, y - 12, entry['date']))
+        links.append(([MARGIN, y - 14, right, y + 12], starts[first_number + offset]))
+    return lines, links
+
+
+def require_book():
+    """Raise RuntimeError if the book cannot be built here; call before any work"""
+    require_pikepdf("The book PDF")
+
+
+def build_book(entries, output_dir, force=False):
+    """Write the book for catalog `entries`; returns a report dict.
+
+    `reused` is True when the existing book already matched the inputs.
+    """
+    require_book()
+    book_path = os.path.join(output_dir, BOOK_NAME)
+    state_path = os.path.join(output_dir, STATE_NAME)
+    key = book_key(entries)
+    state = load_state(state_path)
+    if not force and state.get('key') == key and os.path.exists(book_path):
+        return dict(state['report'], reused=True)
+
+    with contextlib.ExitStack() as stack:
+        # Sources must stay open until the book is saved
+        sources = [stack.enter_context(pikepdf.open(os.path.join(output_dir, entry['file']))) for entry in entries]
+        toc_pages = max(1, math.ceil(len(entries) / TOC_ENTRIES_PER_PAGE))
+        starts = []
+        next_page = 1 + toc_pages
+        for source in sources:
+            starts.append(next_page)
+            next_page += len(source.pages)
+
+        book = pikepdf.new()
+        fonts = pikepdf.Dictionary()
+        for name, base_font in (('/F1', '/Helvetica'), ('/F2', '/Helvetica-Bold')):
+            fonts[name] = book.make_indirect(pikepdf.Dictionary(
+                Type=pikepdf.Name.Font, Subtype=pikepdf.Name.Type1,
+                BaseFont=pikepdf.Name(base_font), Encoding=pikepdf.Name.WinAnsiEncoding,
+            ))
+        text_page(book, cover_lines(entries), fonts)
+        toc_links = []
+        for number in range(toc_pages):
+            first = number * TOC_ENTRIES_PER_PAGE
+            lines, links = toc_lines(entries[first:first + TOC_ENTRIES_PER_PAGE], first, starts, number == 0)
+            toc_links.append((text_page(book, lines, fonts), links))
+
+        for source in sources:
+            if hasattr(book, 'add_pages_from'):  # newer pikepdf also carries named destinations
+                book.add_pages_from(source)
+            else:
+                book.pages.extend(source.pages)
+
+        for page, links in toc_links:
+            page.obj.Annots = book.make_indirect(pikepdf.Array([
+                book.make_indirect(pikepdf.Dictionary(
+                    Type=pikepdf.Name.Annot, Subtype=pikepdf.Name.Link, Rect=rect, Border=[0, 0, 0],
+                    Dest=[book.pages[target].obj, pikepdf.Name.XYZ, None, None, None],
+                ))
+                for rect, target in links
+            ]))
+
+        with book.open_outline() as outline:
+            outline.root.append(pikepdf.OutlineItem('Contents', 1))
+            for entry, start in zip(entries, starts):
+                outline.root.append(pikepdf.OutlineItem(entry['title'], start))
+        book.Root.PageMode = pikepdf.Name.UseOutlines
+        book.docinfo['/Title'] = f"{BOOK_TITLE} - {BOOK_SUBTITLE}"
+
+        merged = dedupe_objects(book)
+        tmp_path = f"{book_path}.{os.getpid()}.tmp"
+        book.save(tmp_path, compress_streams=True, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+        os.replace(tmp_path, book_path)
+
+    report = {
+        'articles': len(entries),
+        'pages': next_page,
+        'bytes': os.path.getsize(book_path),
+        'parts': sum(entry['bytes'] for entry in entries),
+        'merged': merged,
+    }
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'key': key, 'report': report}, f, indent=2)
+    os.replace(tmp_path, state_path)
+    return dict(report, reused=False)
+
+
+def format_report(report):
+    if report['reused']:
+        return f"{BOOK_NAME} is up to date ({report['pages']} pages, {report['bytes'] / (1024 * 1024):.1f} MB)"
+    return (
+        f"Built {BOOK_NAME}: {report['articles']} articles, {report['pages']} pages, "
+        f"{report['bytes'] / (1024 * 1024):.1f} MB (parts {report['parts'] / (1024 * 1024):.1f} MB, "
+        f"{report['merged']} shared objects merged)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Combine the article PDFs into one book PDF")
+    parser.add_argument(
+        '--output-dir', default=DEFAULT_OUTPUT_DIR,
+        help=f"directory holding the PDFs and {CATALOG_NAME} (default: {DEFAULT_OUTPUT_DIR})",
+    )
+    parser.add_argument('--force', action='store_true', help="rebuild even if the inputs are unchanged")
+    args = parser.parse_args()
+    try:
+        require_book()
+    except RuntimeError as e:
+        parser.error(str(e))
+
+    output_dir = os.path.abspath(args.output_dir)
+    catalog = PdfCatalog(os.path.join(output_dir, CATALOG_NAME))
+    entries = catalog.select(list(catalog.entries))
+    if not entries:
+        print(f"✗ Error: no catalogued PDFs in {output_dir}; run generate_blog_pdfs.py first")
+        return False
+    print(f"✓ {format_report(build_book(entries, output_dir, args.force))}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,139 @@
+"""
+Persistent metadata catalog for the rendered blog PDFs
+
+One JSON file next to the PDFs records, per slug: title, date, file name,
+byte size, page count, content hash and render time. The generator updates
+an entry as each PDF is written; index.html and the zip read the catalog
+instead of walking and stat'ing the output directory.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+from blog_registry import parse_date
+
+CATALOG_NAME = '.catalog.json'  # next to the PDFs
+CATALOG_VERSION = 1
+
+
+def count_pdf_pages(path):
+    """Count the pages of a PDF without a PDF library.
+
+    Chromium writes page objects uncompressed; files repacked into object
+    streams (e.g. by --optimize) are counted with pikepdf when available.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    count = len(re.findall(rb'/Type\s*/Page(?![a-zA-Z])', data))
+    if count or b'/ObjStm' not in data:
+        return count
+    try:
+        import pikepdf
+    except ImportError:
+        return 0
+    with pikepdf.open(path) as pdf:
+        return len(pdf.pages)
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def date_ordinal(entry):
+    """Sort key for catalog dates; undated entries sort last"""
+    try:
+        return parse_date(entry.get('date') or '').toordinal()
+    except ValueError:
+        return 0
+
+
+class PdfCatalog:
+    """Thread-safe {slug: metadata} store backed by a JSON file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        self.entries = data.get('articles', {}) if data.get('version') == CATALOG_VERSION else {}
+
+    def record(self, blog, pdf_path, render_seconds=None):
+        """Describe the PDF just written for `blog` (reads the file once)"""
+        stat = os.stat(pdf_path)
+        entry = {
+            'slug': blog['slug'],
+            'title': blog['title'],
+            'date': blog.get('date', ''),
+            'file': os.path.basename(pdf_path),
+            'bytes': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'pages': count_pdf_pages(pdf_path),
+            'sha256': hash_file(pdf_path),
+            'render_seconds': render_seconds,
+            'updated': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self.lock:
+            previous = self.entries.get(blog['slug'], {})
+            if render_seconds is None:
+                entry['render_seconds'] = previous.get('render_seconds')
+            self.entries[blog['slug']] = entry
+        return entry
+
+    def ensure(self, blog, pdf_path):
+        """Return the entry for an existing PDF, re-describing it only if the
+        file changed on disk since it was recorded (one stat otherwise)"""
+        with self.lock:
+            entry = self.entries.get(blog['slug'])
+        stat = os.stat(pdf_path)
+        if (entry and entry['bytes'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+                and entry['file'] == os.path.basename(pdf_path)):
+            if entry['title'] != blog['title'] or entry['date'] != blog.get('date', entry['date']):
+                with self.lock:
+                    entry.update(title=blog['title'], date=blog.get('date', entry['date']))
+            return entry
+        return self.record(blog, pdf_path)
+
+    def adopt(self, entry, pdf_path):
+        """Take over an entry recorded by another catalog (e.g. a shard) for
+        its PDF copied to `pdf_path`, without re-reading the file"""
+        stat = os.stat(pdf_path)
+        entry = dict(entry, file=os.path.basename(pdf_path), bytes=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        with self.lock:
+            self.entries[entry['slug']] = entry
+        return entry
+
+    def get(self, slug):
+        with self.lock:
+            return self.entries.get(slug)
+
+    def select(self, slugs):
+        """Entries for `slugs`, newest first"""
+        with self.lock:
+            chosen = [self.entries[slug] for slug in slugs if slug in self.entries]
+        return sorted(chosen, key=lambda entry: -date_ordinal(entry))
+
+    def drop_missing(self, keep):
+        """Forget articles that are no longer in the registry"""
+        with self.lock:
+            for slug in set(self.entries) - set(keep):
+                del self.entries[slug]
+
+    def save(self):
+        with self.lock:
+            data = {'version': CATALOG_VERSION, 'articles': self.entries}
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, sort_keys=True, ensure_ascii=False)
+                f.write('\n')
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,28 @@
+"""
+Optional dependencies of the PDF post-processing stages
+
+--optimize, --linearize and --book need pikepdf (and --optimize also
+Pillow); plain renders need neither. Each stage imports pikepdf from here
+and calls require_pikepdf() with its own name, so a missing package is
+reported once, before any work starts.
+"""
+
+from image_utils import Image
+
+try:
+    import pikepdf
+except ImportError:  # Only needed by the stages above
+    pikepdf = None
+
+
+def require_pikepdf(purpose, pillow=False):
+    """Raise RuntimeError naming `purpose` if pikepdf (or Pillow, if asked) is missing"""
+    missing = []
+    if pikepdf is None:
+        missing.append(('pikepdf', 'pikepdf'))
+    if pillow and Image is None:
+        missing.append(('Pillow', 'pillow'))
+    if missing:
+        names = ' and '.join(name for name, _ in missing)
+        packages = ' '.join(package for _, package in missing)
+        raise RuntimeError(f"{purpose} needs {names} (pip install {packages})")
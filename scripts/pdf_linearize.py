@@ -0,0 +1,96 @@
+"""
+Linearize ("Fast Web View") rendered PDFs (requires pikepdf)
+
+Chromium's page.pdf() writes the page tree and shared resources at the end
+of the file, so a browser has to fetch all of it before page one appears.
+A linearized file starts with a hint table and everything page one needs,
+letting PDF viewers display it after the first range request. Every
+rewritten file is validated with qpdf's linearization check before it
+replaces the original.
+
+Usage:
+    python scripts/pdf_linearize.py [--check] PDF ...
+"""
+
+import argparse
+import io
+import os
+import re
+
+from pdf_deps import pikepdf, require_pikepdf
+
+# /E in the linearization dictionary: offset of the end of the first page
+FIRST_PAGE_END = re.compile(rb'/Linearized\b.*?/E\s+(\d+)', re.S)
+
+
+def check_linearized(path):
+    """None if `path` is a valid linearized PDF, else a description of the problem"""
+    require_pikepdf("PDF linearization")
+    messages = io.StringIO()
+    with pikepdf.open(path) as pdf:
+        if not pdf.is_linearized:
+            return "not linearized"
+        if not pdf.check_linearization(messages):
+            lines = messages.getvalue().strip().splitlines()
+            return lines[0] if lines else "linearization check failed"
+    return None
+
+
+def first_page_end(path):
+    """Bytes a viewer needs before it can draw page one (None if not linearized)"""
+    with open(path, 'rb') as f:
+        head = f.read(2048)
+    match = FIRST_PAGE_END.search(head)
+    return int(match.group(1)) if match else None
+
+
+def linearize_pdf(path):
+    """Linearize `path` in place and return {'bytes', 'first_page'}.
+
+    Raises ValueError, leaving the original untouched, if the rewritten file
+    does not pass validation.
+    """
+    require_pikepdf("PDF linearization")
+    tmp_path = f"{path}.lin"
+    with pikepdf.open(path) as pdf:
+        pdf.save(tmp_path, linearize=True, compress_streams=True)
+    problem = check_linearized(tmp_path)
+    if problem:
+        os.remove(tmp_path)
+        raise ValueError(f"linearized output failed validation: {problem}")
+    os.replace(tmp_path, path)
+    return {'bytes': os.path.getsize(path), 'first_page': first_page_end(path)}
+
+
+def format_report(name, report):
+    return (
+        f"{name}: linearized, page one in the first {report['first_page'] / 1024:.0f} KB "
+        f"of {report['bytes'] / 1024:.0f} KB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Linearize rendered blog PDFs in place")
+    parser.add_argument('pdfs', nargs='+')
+    parser.add_argument('--check', action='store_true', help="only validate, do not rewrite")
+    args = parser.parse_args()
+
+    ok = True
+    for path in args.pdfs:
+        name = os.path.basename(path)
+        try:
+            if args.check:
+                problem = check_linearized(path)
+                if problem:
+                    raise ValueError(problem)
+                print(f"✓ {name}: linearized ({first_page_end(path) / 1024:.0f} KB to page one)")
+            else:
+                print(f"✓ {format_report(name, linearize_pdf(path))}")
+        except ValueError as e:
+            print(f"✗ {name}: {e}")
+            ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
@@ -0,0 +1,248 @@
+"""
+Optional size optimization for rendered PDFs (requires pikepdf and Pillow)
+
+- raster images drawn above the target DPI are downsampled, and photos are
+  re-encoded as JPEG when that at least halves their size
+- identical streams, fonts and font descriptors are merged into one object
+- objects are packed into compressed object streams
+- articles still above the size budget are retried at lower DPIs
+
+Usage:
+    python scripts/pdf_optimize.py [--target-dpi 150] [--size-budget KB] PDF ...
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import zlib
+
+from image_utils import Image
+from pdf_deps import pikepdf, require_pikepdf
+
+DEFAULT_TARGET_DPI = 150
+FALLBACK_DPIS = (110, 72)  # tried in order while over the size budget
+JPEG_QUALITY = 85
+JPEG_MIN_GAIN = 0.5   # JPEG must be at most half the lossless size
+MIN_IMAGE_BYTES = 16 * 1024
+DEDUPE_TYPES = ('/Font', '/FontDescriptor', '/ExtGState')
+IDENTITY = (1, 0, 0, 1, 0, 0)
+
+
+def multiply(m1, m2):
+    """Concatenate two PDF transformation matrices (m1 applied first)"""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (
+        a1 * a2 + b1 * c2, a1 * b2 + b1 * d2,
+        c1 * a2 + d1 * c2, c1 * b2 + d1 * d2,
+        e1 * a2 + f1 * c2 + e2, e1 * b2 + f1 * d2 + f2,
+    )
+
+
+def collect_image_placements(container, ctm, placements, seen_forms):
+    """Record the largest on-page size (in points) each image is drawn at"""
+    resources = container.get('/Resources', {})
+    xobjects = resources.get('/XObject', {})
+    stack = []
+    for operands, operator in pikepdf.parse_content_stream(container):
+        op = str(operator)
+        if op == 'q':
+            stack.append(ctm)
+        elif op == 'Q' and stack:
+            ctm = stack.pop()
+        elif op == 'cm':
+            ctm = multiply(tuple(float(v) for v in operands), ctm)
+        elif op == 'Do':
+            xobject = xobjects.get(operands[0])
+            if xobject is None:
+                continue
+            if xobject.get('/Subtype') == '/Image':
+                a, b, c, d = ctm[:4]
+                width = (a * a + b * b) ** 0.5
+                height = (c * c + d * d) ** 0.5
+                key = xobject.objgen
+                previous = placements.get(key, (0, 0))
+                placements[key] = (max(previous[0], width), max(previous[1], height))
+            elif xobject.get('/Subtype') == '/Form' and xobject.objgen not in seen_forms:
+                matrix = tuple(float(v) for v in xobject.get('/Matrix', IDENTITY))
+                collect_image_placements(xobject, multiply(matrix, ctm), placements, seen_forms | {xobject.objgen})
+
+
+def downsample_images(pdf, target_dpi):
+    """Resample images drawn above `target_dpi`; returns how many changed"""
+    placements = {}
+    for page in pdf.pages:
+        collect_image_placements(page.obj, IDENTITY, placements, frozenset())
+
+    changed = 0
+    for objgen, (width_pt, height_pt) in placements.items():
+        image = pdf.get_object(objgen)
+        raw_size = len(image.read_raw_bytes())
+        if raw_size < MIN_IMAGE_BYTES or width_pt <= 0 or height_pt <= 0:
+            continue
+        if '/Mask' in image or image.get('/ImageMask', False):
+            continue
+        pixels_w, pixels_h = int(image.Width), int(image.Height)
+        scale = min(1.0, target_dpi * width_pt / 72 / pixels_w, target_dpi * height_pt / 72 / pixels_h)
+        try:
+            pil = pikepdf.PdfImage(image).as_pil_image()
+        except (pikepdf.PdfError, NotImplementedError, ValueError):
+            continue
+        if pil.mode not in ('RGB', 'L'):
+            continue
+        if scale < 0.95:
+            pil = pil.resize((max(1, round(pixels_w * scale)), max(1, round(pixels_h * scale))), Image.LANCZOS)
+        elif image.get('/Filter') == '/DCTDecode':
+            continue  # already JPEG at an acceptable resolution
+
+        lossless = zlib.compress(pil.tobytes(), 9)
+        data, filter_name = lossless, pikepdf.Name.FlateDecode
+        if '/SMask' not in image:
+            jpeg = io.BytesIO()
+            pil.save(jpeg, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+            if jpeg.tell() <= len(lossless) * JPEG_MIN_GAIN:
+                data, filter_name = jpeg.getvalue(), pikepdf.Name.DCTDecode
+        if len(data) >= raw_size:
+            continue
+
+        image.write(data, filter=filter_name)
+        image.Width, image.Height = pil.width, pil.height
+        image.ColorSpace = pikepdf.Name.DeviceRGB if pil.mode == 'RGB' else pikepdf.Name.DeviceGray
+        image.BitsPerComponent = 8
+        for key in ('/DecodeParms', '/Decode'):
+            if key in image:
+                del image[key]
+        changed += 1
+    return changed
+
+
+def object_key(obj):
+    """Identity of an object's content, ignoring where it lives in the file"""
+    digest = hashlib.sha256()
+    if isinstance(obj, pikepdf.Stream):
+        stream_dict = pikepdf.Dictionary({k: v for k, v in obj.stream_dict.items() if k != '/Length'})
+        digest.update(stream_dict.unparse())
+        digest.update(obj.read_raw_bytes())
+    else:
+        digest.update(obj.unparse())
+    return digest.hexdigest()
+
+
+def remap_references(obj, remap):
+    """Point references to merged objects at their canonical copy"""
+    if isinstance(obj, pikepdf.Array):
+        items = enumerate(list(obj))
+    elif isinstance(obj, (pikepdf.Dictionary, pikepdf.Stream)):
+        items = list(obj.items())
+    else:
+        return
+    for key, value in items:
+        if not isinstance(value, pikepdf.Object):
+            continue
+        if value.is_indirect:
+            if value.objgen in remap:
+                obj[key] = remap[value.objgen]
+        else:
+            remap_references(value, remap)
+
+
+def dedupe_objects(pdf):
+    """Merge identical streams, fonts and descriptors; returns objects merged"""
+    merged = 0
+    # Merging leaf objects (font files, soft masks) can make their parents identical
+    for _ in range(3):
+        canonical = {}
+        remap = {}
+        for obj in pdf.objects:
+            is_shared_dict = isinstance(obj, pikepdf.Dictionary) and obj.get('/Type') in DEDUPE_TYPES
+            if not isinstance(obj, pikepdf.Stream) and not is_shared_dict:
+                continue
+            key = object_key(obj)
+            if key in canonical:
+                remap[obj.objgen] = canonical[key]
+            else:
+                canonical[key] = obj
+        if not remap:
+            break
+        for obj in pdf.objects:
+            remap_references(obj, remap)
+        merged += len(remap)
+    return merged
+
+
+def optimize_once(path, output_path, target_dpi):
+    with pikepdf.open(path) as pdf:
+        images = downsample_images(pdf, target_dpi)
+        merged = dedupe_objects(pdf)
+        pdf.remove_unreferenced_resources()
+        pdf.save(
+            output_path,
+            compress_streams=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+        )
+    return images, merged
+
+
+def optimize_pdf(path, target_dpi=DEFAULT_TARGET_DPI, size_budget=None):
+    """Shrink `path` in place and return a report of what happened.
+
+    `size_budget` is in bytes; while the result is over it, lower DPIs from
+    FALLBACK_DPIS are tried. The original is kept if nothing got smaller.
+    """
+    require_pikepdf("PDF optimization", pillow=True)
+    before = os.path.getsize(path)
+    tmp_path = f"{path}.opt"
+    report = {'before': before, 'after': before, 'images': 0, 'merged': 0, 'dpi': None, 'over_budget': False}
+
+    for dpi in (target_dpi,) + tuple(d for d in FALLBACK_DPIS if d < target_dpi):
+        images, merged = optimize_once(path, tmp_path, dpi)
+        size = os.path.getsize(tmp_path)
+        if size < report['after']:
+            os.replace(tmp_path, f"{path}.best")
+            report.update(after=size, images=images, merged=merged, dpi=dpi)
+        if not size_budget or report['after'] <= size_budget:
+            break
+
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    if os.path.exists(f"{path}.best"):
+        os.replace(f"{path}.best", path)
+    report['over_budget'] = bool(size_budget) and report['after'] > size_budget
+    return report
+
+
+def format_report(name, report):
+    saved = report['before'] - report['after']
+    percent = 100 * saved / report['before'] if report['before'] else 0
+    line = (
+        f"{name}: {report['before'] / 1024:.0f} KB -> {report['after'] / 1024:.0f} KB "
+        f"(-{percent:.0f}%, {report['images']} images resampled, {report['merged']} objects merged)"
+    )
+    if report['over_budget']:
+        line += " ⚠ over size budget"
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shrink rendered blog PDFs in place")
+    parser.add_argument('pdfs', nargs='+')
+    parser.add_argument('--target-dpi', type=int, default=DEFAULT_TARGET_DPI)
+    parser.add_argument('--size-budget', type=int, metavar='KB', help="per-file size budget in KB")
+    args = parser.parse_args()
+
+    budget = args.size_budget * 1024 if args.size_budget else None
+    total_before = total_after = 0
+    over_budget = False
+    for path in args.pdfs:
+        report = optimize_pdf(path, args.target_dpi, budget)
+        total_before += report['before']
+        total_after += report['after']
+        over_budget = over_budget or report['over_budget']
+        print(format_report(os.path.basename(path), report))
+    print(f"Total: {total_before / (1024 * 1024):.1f} MB -> {total_after / (1024 * 1024):.1f} MB")
+    return not over_budget
+
+
+if __name__ == "__main__":
+    exit(0 if main() else 1)
@@ -0,0 +1,170 @@
+"""
+Per-stage timing and browser metrics for the PDF generator
+
+Spans are recorded per slug and stage from every worker thread and written
+both as a JSON report and as a Chrome trace-event file that can be opened in
+chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+
+# Counters from CDP Performance.getMetrics are cumulative, so they are
+# reported as the difference across one article; the rest are snapshots.
+CDP_COUNTERS = ('LayoutCount', 'RecalcStyleCount', 'LayoutDuration', 'RecalcStyleDuration',
+                'ScriptDuration', 'TaskDuration')
+CDP_GAUGES = ('JSHeapUsedSize', 'JSHeapTotalSize', 'Nodes', 'Documents', 'Frames')
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def read_cdp_metrics(cdp):
+    """Return Performance.getMetrics as a {name: value} dict"""
+    return {metric['name']: metric['value'] for metric in cdp.send('Performance.getMetrics')['metrics']}
+
+
+def diff_cdp_metrics(before, after):
+    """Counters as deltas over the article, gauges as their final value"""
+    metrics = {name: after[name] - before.get(name, 0) for name in CDP_COUNTERS if name in after}
+    metrics.update({name: after[name] for name in CDP_GAUGES if name in after})
+    return metrics
+
+
+class RenderTrace:
+    """Thread-safe collector of timing spans and per-article metrics"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+        self.spans = []
+        self.metrics = {}
+        self.threads = {}
+        self.thread_names = {}
+
+    def thread_id(self):
+        ident = threading.get_ident()
+        with self.lock:
+            if ident not in self.threads:
+                tid = len(self.threads) + 1
+                self.threads[ident] = tid
+                self.thread_names[tid] = threading.current_thread().name
+            return self.threads[ident]
+
+    def add_span(self, slug, stage, start, end, **args):
+        """Record a span given perf_counter() start and end times"""
+        span = {
+            'slug': slug,
+            'stage': stage,
+            'start': start - self.origin,
+            'duration': end - start,
+            'thread': self.thread_id(),
+        }
+        if args:
+            span['args'] = args
+        with self.lock:
+            self.spans.append(span)
+
+    @contextlib.contextmanager
+    def span(self, slug, stage, **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(slug, stage, start, time.perf_counter(), **args)
+
+    def last_duration(self, slug, stage):
+        """Duration of the most recent `stage` span for `slug`, or None"""
+        with self.lock:
+            for span in reversed(self.spans):
+                if span['slug'] == slug and span['stage'] == stage:
+                    return span['duration']
+        return None
+
+    def add_metrics(self, slug, metrics):
+        with self.lock:
+            self.metrics.setdefault(slug, {}).update(metrics)
+
+    def stage_durations(self):
+        """{stage: [seconds, ...]} over every recorded span"""
+        durations = {}
+        with self.lock:
+            for span in self.spans:
+                durations.setdefault(span['stage'], []).append(span['duration'])
+        return durations
+
+    def write_json(self, path):
+        with self.lock:
+            report = {
+                'generated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'spans': list(self.spans),
+                'metrics': dict(self.metrics),
+            }
+        report['stages'] = {
+            stage: {
+                'count': len(values),
+                'p50': percentile(values, 0.5),
+                'p95': percentile(values, 0.95),
+                'total': sum(values),
+            }
+            for stage, values in self.stage_durations().items()
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    def write_chrome_trace(self, path):
+        """Write complete ("X") events, one track per worker thread"""
+        events = [
+            {'ph': 'M', 'name': 'process_name', 'pid': os.getpid(), 'args': {'name': 'generate_blog_pdfs'}},
+        ]
+        with self.lock:
+            for tid, name in self.thread_names.items():
+                events.append({
+                    'ph': 'M', 'name': 'thread_name', 'pid': os.getpid(), 'tid': tid,
+                    'args': {'name': name},
+                })
+            for span in self.spans:
+                events.append({
+                    'ph': 'X',
+                    'name': span['stage'],
+                    'cat': 'render',
+                    'pid': os.getpid(),
+                    'tid': span['thread'],
+                    'ts': span['start'] * 1e6,
+                    'dur': span['duration'] * 1e6,
+                    'args': {'slug': span['slug'], **span.get('args', {})},
+                })
+            for slug, metrics in self.metrics.items():
+                end = max(
+                    (s['start'] + s['duration'] for s in self.spans if s['slug'] == slug),
+                    default=0,
+                )
+                if 'JSHeapUsedSize' in metrics:
+                    events.append({
+                        'ph': 'C', 'name': 'JSHeapUsedSize', 'pid': os.getpid(), 'ts': end * 1e6,
+                        'args': {'MB': metrics['JSHeapUsedSize'] / (1024 * 1024)},
+                    })
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def summary_table(self):
+        """Lines of a p50/p95 table per stage, in first-seen order"""
+        durations = self.stage_durations()
+        if not durations:
+            return []
+        width = max(len(stage) for stage in durations)
+        lines = [f"{'Stage':<{width}}  {'n':>4}  {'p50':>8}  {'p95':>8}  {'total':>8}"]
+        for stage, values in durations.items():
+            lines.append(
+                f"{stage:<{width}}  {len(values):>4}  {percentile(values, 0.5):>7.2f}s  "
+                f"{percentile(values, 0.95):>7.2f}s  {sum(values):>7.1f}s"
+            )
+        return lines
@@ -6,6 +6,8 @@ const moment = require('moment');
 
 const BLOG_DIRECTORY = 'src/blog';
 const BLOG_REGISTRY_FILE = 'src/components/BlogShell/blog-registry.js';
+// Plain-data copy of the registry, also emitted by scripts/blog_registry.py
+const BLOG_REGISTRY_JSON_FILE = 'src/components/BlogShell/blog-registry.json';
 
 const validateEntry = (entry) => {
   if (!entry.slug) throw Error(`${entry.fileName} slug is empty`);
@@ -66,6 +68,16 @@ export const slugToId = blogRegistry.reduce((acc, next, idx) => ({
   return fileContents;
 };
 
+const templateJsonRegistry = (items) => {
+  const entries = items.map((item) => ({
+    slug: item.slug,
+    title: item.title.trim(),
+    date: moment(item.date).format('DD MMM YYYY'),
+    fileName: item.fileName,
+  }));
+  return `${JSON.stringify(entries, null, 2)}\n`;
+};
+
 const main = async () => {
   const filePaths = await recursive(BLOG_DIRECTORY);
   const markdownFiles = filePaths.filter((filePath) => filePath.endsWith('.mdx'));
@@ -77,5 +89,6 @@ const main = async () => {
   const sortedItems = validItems.sort((a, b) => b.date - a.date);
   const fileContents = templateBlogRegistry(sortedItems);
   await fs.writeFile(BLOG_REGISTRY_FILE, fileContents);
+  await fs.writeFile(BLOG_REGISTRY_JSON_FILE, templateJsonRegistry(sortedItems));
 };
 main();
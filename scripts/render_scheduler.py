@@ -0,0 +1,206 @@
+"""
+Schedule article renders from their historical durations
+
+RenderHistory keeps the last few successful render times per slug in
+.cache/. RenderScheduler hands out jobs longest-expected-first so slow
+articles do not end up in the tail of the run, gives each attempt a deadline
+derived from that history, and re-queues failures with exponential backoff
+while the other workers keep going. assign_shards() splits the articles
+into cost-balanced subsets for `--shard i/N`.
+"""
+
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+HISTORY_PATH = os.path.join(PROJECT_ROOT, '.cache', 'pdf-render-history.json')
+HISTORY_VERSION = 1
+HISTORY_LENGTH = 5
+
+MIN_TIMEOUT = 15000          # ms, floor for navigation timeouts from history
+MAX_TIMEOUT = 120000         # ms, ceiling for any attempt
+TIMEOUT_FACTOR = 4           # navigation timeout = slowest recent render x this
+MIN_READY_DEADLINE = 15000   # ms the page gets to become print-ready
+MAX_READY_DEADLINE = 45000
+READY_FACTOR = 3
+MAX_ATTEMPTS = 3
+BACKOFF_SECONDS = 2          # wait before attempt n+1 is 2 * 2**(n-1) s
+
+
+class RenderHistory:
+    """{slug: [seconds, ...]} of recent successful renders, newest last"""
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            data = {}
+        self.durations = data.get('articles', {}) if data.get('version') == HISTORY_VERSION else {}
+
+    def expected(self, slug):
+        """Slowest of the recent renders (seconds), or None if never rendered"""
+        with self.lock:
+            durations = self.durations.get(slug)
+        return max(durations) if durations else None
+
+    def record(self, slug, seconds):
+        with self.lock:
+            durations = self.durations.setdefault(slug, [])
+            durations.append(round(seconds, 3))
+            del durations[:-HISTORY_LENGTH]
+
+    def update(self, durations):
+        """Take over the recent renders of every slug in `durations`"""
+        with self.lock:
+            self.durations.update(durations)
+
+    def save(self, path=None, slugs=None):
+        """Write the history to `path` (default: where it was read), limited to `slugs` if given"""
+        path = path or self.path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.lock:
+            articles = self.durations if slugs is None else {
+                slug: durations for slug, durations in self.durations.items() if slug in slugs
+            }
+            data = {'version': HISTORY_VERSION, 'articles': articles}
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
+
+
+def clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+class RenderJob:
+    def __init__(self, index, blog, expected):
+        self.index = index
+        self.blog = blog
+        self.expected = expected
+        self.attempt = 0
+
+    @property
+    def final(self):
+        """Last attempt: render even if the page never reports ready"""
+        return self.attempt >= MAX_ATTEMPTS
+
+    def deadlines(self, initial_timeout, initial_ready_deadline):
+        """(navigation timeout, ready deadline) in ms for the current attempt.
+
+        The first attempt of a known article gets a multiple of its slowest
+        recent render; unknown articles get the defaults. Each retry doubles.
+        """
+        if self.expected is None:
+            timeout, ready_deadline = initial_timeout, initial_ready_deadline
+        else:
+            timeout = clamp(self.expected * 1000 * TIMEOUT_FACTOR, MIN_TIMEOUT, initial_timeout)
+            ready_deadline = clamp(self.expected * 1000 * READY_FACTOR, MIN_READY_DEADLINE, initial_ready_deadline)
+        scale = 2 ** (self.attempt - 1)
+        return (
+            int(min(timeout * scale, MAX_TIMEOUT)),
+            int(min(ready_deadline * scale, MAX_READY_DEADLINE)),
+        )
+
+
+class RenderScheduler:
+    """Thread-safe work queue of RenderJobs ordered by (not-before, -expected)"""
+
+    def __init__(self, blogs, history):
+        """`blogs` is a list of (index, blog) pairs in registry order"""
+        self.condition = threading.Condition()
+        self.heap = []
+        self.counter = itertools.count()
+        self.in_flight = 0
+        self.succeeded = []
+        self.failed = []
+        jobs = [RenderJob(index, blog, history.expected(blog['slug'])) for index, blog in blogs]
+        # Never-rendered articles first (unknown cost), then slowest first
+        jobs.sort(key=lambda job: (job.expected is not None, -(job.expected or 0), job.index))
+        for job in jobs:
+            self._push(job, 0)
+
+    def _push(self, job, not_before):
+        heapq.heappush(self.heap, (not_before, next(self.counter), job))
+
+    def next(self):
+        """Block until a job is due; None once nothing is queued or running"""
+        with self.condition:
+            while True:
+                if self.heap:
+                    wait = self.heap[0][0] - time.monotonic()
+                    if wait <= 0:
+                        job = heapq.heappop(self.heap)[2]
+                        job.attempt += 1
+                        self.in_flight += 1
+                        return job
+                    self.condition.wait(wait)
+                elif self.in_flight:
+                    self.condition.wait()
+                else:
+                    return None
+
+    def finish(self, job, ok):
+        """Record an attempt; failures are re-queued with backoff until MAX_ATTEMPTS.
+
+        Returns the backoff in seconds if the job was re-queued, else None.
+        """
+        with self.condition:
+            self.in_flight -= 1
+            delay = None
+            if ok:
+                self.succeeded.append((job.index, job.blog))
+            elif job.final:
+                self.failed.append((job.index, job.blog))
+            else:
+                delay = BACKOFF_SECONDS * 2 ** (job.attempt - 1)
+                self._push(job, time.monotonic() + delay)
+            self.condition.notify_all()
+            return delay
+
+    def abandon(self):
+        """Fail every job still queued (no worker is left to render it)"""
+        with self.condition:
+            while self.heap:
+                job = heapq.heappop(self.heap)[2]
+                self.failed.append((job.index, job.blog))
+            self.condition.notify_all()
+
+
+def parse_shard(value):
+    """'2/4' -> (2, 4); shards are numbered from 1"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"expected i/N, got {value!r}")
+    if not 1 <= index <= count:
+        raise ValueError(f"shard {index} is not between 1 and {count}")
+    return index, count
+
+
+def assign_shards(costs, count):
+    """Split {slug: seconds or None} into `count` lists of similar total cost.
+
+    Longest-processing-time-first: articles are placed slowest first onto the
+    least loaded shard. Unknown costs count as the mean of the known ones.
+    Ties break on slug and shard number, so every process that sees the same
+    costs computes the same split.
+    """
+    known = [cost for cost in costs.values() if cost is not None]
+    default = sum(known) / len(known) if known else 1.0
+    loads = [(0.0, shard) for shard in range(count)]
+    shards = [[] for _ in range(count)]
+    for slug in sorted(costs, key=lambda slug: (-(costs[slug] if costs[slug] is not None else default), slug)):
+        load, shard = heapq.heappop(loads)
+        shards[shard].append(slug)
+        cost = costs[slug] if costs[slug] is not None else default
+        heapq.heappush(loads, (load + cost, shard))
+    return shards
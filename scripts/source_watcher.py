@@ -0,0 +1,63 @@
+"""
+Poll source files for changes with a debounce
+
+Used by `generate_blog_pdfs.py --watch`. Polling keeps the watcher portable
+and dependency-free; one poll of src/blog is a few hundred stat() calls.
+"""
+
+import os
+import time
+
+DEFAULT_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 0.3
+
+
+def snapshot(paths, excludes=()):
+    """{file: (mtime_ns, size)} for every file under `paths`, skipping dotfiles"""
+    state = {}
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [name for name in dirs if not name.startswith('.')]
+            for name in files:
+                if name.startswith('.') or name.endswith(excludes):
+                    continue
+                file_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue  # removed while walking
+                state[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def diff_snapshots(before, after):
+    """Files added, removed or modified between two snapshots"""
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+
+def wait_for_changes(paths, previous, excludes=(), interval=DEFAULT_INTERVAL, debounce=DEFAULT_DEBOUNCE):
+    """Block until files under `paths` change, then until they stop changing.
+
+    Editors often write a file in several steps (truncate, write, rename), so
+    changes are collected until nothing has moved for `debounce` seconds.
+    Returns (changed paths, new snapshot).
+    """
+    while True:
+        time.sleep(interval)
+        current = snapshot(paths, excludes)
+        changed = diff_snapshots(previous, current)
+        if changed:
+            break
+
+    while True:
+        time.sleep(debounce)
+        settled = snapshot(paths, excludes)
+        more = diff_snapshots(current, settled)
+        if not more:
+            return changed | diff_snapshots(previous, settled), settled
+        changed |= more
+        current = settled
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Serve the production build (build/) from an in-process threaded HTTP server
+Mirrors the SPA rewrite in firebase.json: any path that is not a file (or a
+directory with an index.html) falls back to /index.html, so /blog/<slug>
+loads the app like it does when hosted.
+
+Usage:
+    python scripts/static_build_server.py [--port 5000] [BUILD_DIR]
+"""
+
+import argparse
+import contextlib
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, unquote
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+BUILD_DIR = os.path.join(PROJECT_ROOT, 'build')
+
+
+class SpaRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler with the firebase.json "**" -> /index.html rewrite"""
+
+    def send_head(self):
+        local_path = self.translate_path(unquote(urlsplit(self.path).path))
+        is_page = os.path.isfile(os.path.join(local_path, 'index.html'))
+        if not os.path.isfile(local_path) and not is_page:
+            self.path = '/index.html'
+        return super().send_head()
+
+    def end_headers(self):
+        # Hashed bundles under /static never change within a build
+        if self.path.startswith('/static/'):
+            self.send_header('Cache-Control', 'public, max-age=31536000, immutable')
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def ensure_build(build_dir):
+    """Fail early with a useful message if there is no production build"""
+    if not os.path.isfile(os.path.join(build_dir, 'index.html')):
+        raise FileNotFoundError(
+            f"No production build at {build_dir} (run `bun run build` first)"
+        )
+
+
+@contextlib.contextmanager
+def serve_build(build_dir=BUILD_DIR, host='127.0.0.1', port=0):
+    """Serve `build_dir` on a background thread and yield its base URL"""
+    ensure_build(build_dir)
+    handler = partial(SpaRequestHandler, directory=build_dir)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def main():
+    """Serve the build in the foreground until interrupted"""
+    parser = argparse.ArgumentParser(description="Serve the production build with SPA rewrites")
+    parser.add_argument('build_dir', nargs='?', default=BUILD_DIR)
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+
+    with serve_build(args.build_dir, port=args.port) as base_url:
+        print(f"Serving {args.build_dir} at {base_url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import asset_cache
+from asset_cache import AssetCache
+
+ORIGIN = 'http://localhost:3000'
+FONT_URL = f"{ORIGIN}/static/media/KaTeX_Main.5e6f7a8b.woff2"
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type='font', method='GET'):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+
+class FakeResponse:
+    def __init__(self, body, status=200):
+        self.status = status
+        self.headers = {'content-type': 'font/woff2', 'set-cookie': 'dropped'}
+        self._body = body
+
+    def body(self):
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, url, response=None, error=None, **request):
+        self.request = FakeRequest(url, **request)
+        self.response = response
+        self.error = error
+        self.outcome = None
+
+    def fetch(self):
+        if self.error:
+            raise self.error
+        return self.response
+
+    def fulfill(self, **kwargs):
+        self.outcome = ('fulfill', kwargs)
+
+    def continue_(self):
+        self.outcome = ('continue', None)
+
+    def abort(self):
+        self.outcome = ('abort', None)
+
+
+def test_blocked_and_uncacheable_requests(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    route = FakeRoute('https://www.google-analytics.com/analytics.js', resource_type='script')
+    cache.handle(route, ORIGIN)
+    assert route.outcome[0] == 'abort'
+
+    route = FakeRoute(f"{ORIGIN}/blog/some-article", resource_type='document')
+    cache.handle(route, ORIGIN)
+    assert route.outcome[0] == 'continue'
+    assert cache.stats['blocked'] == 1 and cache.stats['passthrough'] == 1
+
+
+def test_miss_is_stored_and_replayed(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    cache.handle(FakeRoute(FONT_URL, FakeResponse(b'font bytes')), ORIGIN)
+    cache.save()
+
+    reloaded = AssetCache(str(tmp_path))
+    route = FakeRoute(FONT_URL, error=AssertionError("must not fetch a cached asset"))
+    reloaded.handle(route, ORIGIN)
+    action, kwargs = route.outcome
+    assert action == 'fulfill' and kwargs['body'] == b'font bytes'
+    assert kwargs['headers'] == {'content-type': 'font/woff2'}
+    assert reloaded.stats['hits'] == 1 and reloaded.stats['bytes_saved'] == len(b'font bytes')
+
+
+def test_failed_fetch_continues_the_request_and_is_not_cached(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    route = FakeRoute(FONT_URL, error=asset_cache.PlaywrightError("net::ERR_CONNECTION_RESET"))
+    cache.handle(route, ORIGIN)
+    assert route.outcome[0] == 'continue'
+    assert cache.stats['failed'] == 1
+    assert cache.lookup(FONT_URL) is None
+
+
+def test_error_responses_are_not_cached(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    cache.handle(FakeRoute(FONT_URL, FakeResponse(b'not found', status=404)), ORIGIN)
+    assert cache.lookup(FONT_URL) is None
+
+
+def test_save_keeps_entries_saved_by_another_process(tmp_path):
+    first, second = AssetCache(str(tmp_path)), AssetCache(str(tmp_path))
+    first.store(f"{ORIGIN}/a.1234abcd.js", {}, b'a')
+    first.save()
+    second.store(f"{ORIGIN}/b.1234abcd.js", {}, b'b')
+    second.save()
+    assert set(AssetCache(str(tmp_path)).index) == {f"{ORIGIN}/a.1234abcd.js", f"{ORIGIN}/b.1234abcd.js"}
@@ -0,0 +1,112 @@
+import json
+import os
+
+import pytest
+
+import blog_registry
+import generate_blog_pdfs as generator
+from blog_registry import load_registry, parse_article, parse_date
+
+
+def write_article(blog_dir, slug, title, date):
+    article = blog_dir / slug
+    article.mkdir(parents=True, exist_ok=True)
+    path = article / 'index.mdx'
+    path.write_text(f"import Figure from './Figure';\n\n# {title}\n\n<date>{date}</date>\n\nBody # not a title\n")
+    return path
+
+
+@pytest.mark.parametrize('value', ['5 December 2025', '5 Dec 2025', '2025-12-05', 'December 5, 2025', ' Dec 5, 2025 '])
+def test_parse_date_formats(value):
+    assert parse_date(value).date().isoformat() == '2025-12-05'
+
+
+def test_parse_date_rejects_unknown_formats():
+    with pytest.raises(ValueError):
+        parse_date('05/12/2025')
+
+
+def test_parse_article_extracts_slug_title_and_date(tmp_path):
+    write_article(tmp_path, 'demon', "Passive Velocity Sorting: A Geometric Maxwell's Demon?", '28 February 2026')
+    assert parse_article(str(tmp_path), 'demon/index.mdx') == {
+        'slug': 'demon',
+        'title': "Passive Velocity Sorting: A Geometric Maxwell's Demon?",
+        'date': '28 Feb 2026',
+        'fileName': 'demon/index.mdx',
+    }
+
+
+@pytest.mark.parametrize('content, message', [
+    ('<date>1 Jan 2025</date>\n', 'title is empty'),
+    ('# Title\n', 'date is empty or invalid'),
+    ('# Title\n<date>sometime</date>\n', 'date is empty or invalid'),
+])
+def test_parse_article_rejects_incomplete_articles(tmp_path, content, message):
+    (tmp_path / 'broken').mkdir()
+    (tmp_path / 'broken' / 'index.mdx').write_text(content)
+    with pytest.raises(ValueError, match=message):
+        parse_article(str(tmp_path), 'broken/index.mdx')
+
+
+def test_load_registry_sorts_newest_first(tmp_path):
+    write_article(tmp_path, 'old', 'Old', '1 Jan 2024')
+    write_article(tmp_path, 'new', 'New', '28 Feb 2026')
+    write_article(tmp_path, 'same-day', 'Same day', '28 Feb 2026')
+    items = load_registry(str(tmp_path), cache_path=None)
+    assert [item['slug'] for item in items] == ['new', 'same-day', 'old']
+
+
+def test_load_registry_reparses_only_changed_files(tmp_path, monkeypatch):
+    blog_dir = tmp_path / 'blog'
+    cache_path = str(tmp_path / 'cache' / 'registry.json')
+    write_article(blog_dir, 'first', 'First', '1 Jan 2025')
+    second = write_article(blog_dir, 'second', 'Second', '2 Jan 2025')
+    assert len(load_registry(str(blog_dir), cache_path)) == 2
+
+    parsed = []
+    real_parse = blog_registry.parse_article
+    monkeypatch.setattr(blog_registry, 'parse_article', lambda *args: parsed.append(args[1]) or real_parse(*args))
+    assert [item['title'] for item in load_registry(str(blog_dir), cache_path)] == ['Second', 'First']
+    assert parsed == []
+
+    second.write_text(second.read_text().replace('# Second', '# Second, revised'))
+    os.utime(second, ns=(second.stat().st_atime_ns, second.stat().st_mtime_ns + 1_000_000))
+    assert load_registry(str(blog_dir), cache_path)[0]['title'] == 'Second, revised'
+    assert parsed == ['second/index.mdx']
+
+
+def test_load_registry_forgets_deleted_articles(tmp_path):
+    blog_dir = tmp_path / 'blog'
+    cache_path = str(tmp_path / 'registry.json')
+    write_article(blog_dir, 'first', 'First', '1 Jan 2025')
+    removed = write_article(blog_dir, 'removed', 'Removed', '2 Jan 2025')
+    load_registry(str(blog_dir), cache_path)
+
+    os.remove(removed)
+    assert [item['slug'] for item in load_registry(str(blog_dir), cache_path)] == ['first']
+    assert list(blog_registry.load_cache(cache_path)) == ['first/index.mdx']
+
+
+def test_js_registry_keeps_titles_with_escaped_quotes(tmp_path):
+    registry = tmp_path / 'blog-registry.js'
+    registry.write_text(
+        "export const blogRegistry = [\n"
+        "  { slug: 'demon', title: 'Passive Velocity Sorting: A Geometric Maxwell\\'s Demon?', date: '28 Feb 2026' },\n"
+        "  { slug: \"uat\", title: \"The \\\"Universal\\\" Approximation Theorem\", date: '1 Jan 2026' },\n"
+        "  { slug: 'plain', title: 'Plain', date: '2 Jan 2026' },\n"
+        "];\n"
+    )
+    assert generator.parse_blog_registry(str(registry)) == [
+        {'slug': 'demon', 'title': "Passive Velocity Sorting: A Geometric Maxwell's Demon?"},
+        {'slug': 'uat', 'title': 'The "Universal" Approximation Theorem'},
+        {'slug': 'plain', 'title': 'Plain'},
+    ]
+
+
+def test_json_registry_round_trip(tmp_path):
+    write_article(tmp_path / 'blog', 'first', 'Première', '1 Jan 2025')
+    items = load_registry(str(tmp_path / 'blog'), cache_path=None)
+    path = tmp_path / 'blog-registry.json'
+    blog_registry.write_json_registry(items, str(path))
+    assert json.loads(path.read_text(encoding='utf-8')) == items
+    assert generator.parse_blog_registry(str(path)) == items
@@ -0,0 +1,82 @@
+import json
+import os
+
+import pytest
+
+import generate_blog_pdfs as generator
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A minimal project: one shell component, two articles and an output dir"""
+    shell = tmp_path / 'src' / 'components' / 'BlogShell'
+    shell.mkdir(parents=True)
+    (shell / 'BlogShell.js').write_text('export default () => null;\n')
+    (shell / 'blog-registry.js').write_text('export const blogs = [];\n')
+    (shell / 'BlogShell.stories.js').write_text('export default {};\n')
+    for slug in ('first', 'second'):
+        article = tmp_path / 'src' / 'blog' / slug
+        article.mkdir(parents=True)
+        (article / 'index.mdx').write_text(f'# {slug}\n')
+    output = tmp_path / 'public' / 'pdfs'
+    output.mkdir(parents=True)
+
+    monkeypatch.setattr(generator, 'PROJECT_ROOT', str(tmp_path))
+    monkeypatch.setattr(generator, 'BLOG_DIR', str(tmp_path / 'src' / 'blog'))
+    monkeypatch.setattr(generator, 'SHARED_INPUTS', [str(shell)])
+    monkeypatch.setattr(generator, 'OUTPUT_DIR', str(output))
+    monkeypatch.setattr(generator, 'MANIFEST_PATH', str(output / '.build-manifest.json'))
+    return tmp_path
+
+
+def test_input_hash_follows_the_article_and_shared_inputs(project):
+    shared = generator.compute_shared_hash()
+    first = generator.compute_input_hash('first', shared)
+    assert first == generator.compute_input_hash('first', generator.compute_shared_hash())
+    assert first != generator.compute_input_hash('second', shared)
+
+    (project / 'src' / 'blog' / 'first' / 'figure.svg').write_text('<svg/>')
+    assert generator.compute_input_hash('first', shared) != first
+
+    (project / 'src' / 'components' / 'BlogShell' / 'BlogShell.js').write_text('export default () => 1;\n')
+    assert generator.compute_shared_hash() != shared
+
+
+def test_registry_and_stories_do_not_invalidate_every_pdf(project):
+    shared = generator.compute_shared_hash()
+    shell = project / 'src' / 'components' / 'BlogShell'
+    (shell / 'blog-registry.js').write_text('export const blogs = [{}];\n')
+    (shell / 'BlogShell.stories.js').write_text('export default { title: "x" };\n')
+    (shell / '.DS_Store').write_bytes(b'\0')
+    assert generator.compute_shared_hash() == shared
+
+
+def test_settings_change_the_shared_hash(project):
+    assert generator.compute_shared_hash({'optimize': None}) != generator.compute_shared_hash({'optimize': 150})
+    assert generator.compute_shared_hash() == generator.compute_shared_hash({})
+
+
+def test_up_to_date_needs_matching_hash_and_pdf(project):
+    manifest = {'version': generator.MANIFEST_VERSION, 'articles': {'first': {'hash': 'abc'}}}
+    assert not generator.is_up_to_date(manifest, 'first', 'abc')  # no PDF yet
+
+    (project / 'public' / 'pdfs' / 'first.pdf').write_bytes(b'%PDF-1.7')
+    assert generator.is_up_to_date(manifest, 'first', 'abc')
+    assert not generator.is_up_to_date(manifest, 'first', 'def')
+    assert not generator.is_up_to_date(manifest, 'second', 'abc')
+
+
+def test_manifest_round_trip(project):
+    manifest = generator.load_manifest()
+    assert manifest == {'version': generator.MANIFEST_VERSION, 'articles': {}}
+
+    manifest['articles']['first'] = {'hash': 'abc'}
+    generator.save_manifest(manifest)
+    assert generator.load_manifest() == manifest
+    assert os.listdir(project / 'public' / 'pdfs') == ['.build-manifest.json']
+
+
+@pytest.mark.parametrize('content', ['{not json', json.dumps({'version': 0, 'articles': {'first': {'hash': 'abc'}}})])
+def test_unreadable_or_outdated_manifest_starts_fresh(project, content):
+    (project / 'public' / 'pdfs' / '.build-manifest.json').write_text(content)
+    assert generator.load_manifest() == {'version': generator.MANIFEST_VERSION, 'articles': {}}
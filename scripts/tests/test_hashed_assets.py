@@ -0,0 +1,82 @@
+import hashlib
+import json
+import re
+
+import pytest
+
+from hashed_assets import (
+    IMMUTABLE_CACHE, SHORT_CACHE, firebase_headers, hashed_name, publish_hashed, remove_hashed,
+    update_firebase_headers,
+)
+
+DIGEST = hashlib.sha256(b'pdf').hexdigest()
+
+
+def test_hashed_name_keeps_stem_and_extension():
+    assert hashed_name('my-article.pdf', DIGEST) == f"my-article.{DIGEST[:8]}.pdf"
+    assert hashed_name('all-blog-pdfs.zip', 'abcdef0123456789') == 'all-blog-pdfs.abcdef01.zip'
+
+
+def test_publish_hashed_copies_and_drops_older_versions(tmp_path):
+    pdf = tmp_path / 'article.pdf'
+    pdf.write_bytes(b'first')
+    first = publish_hashed(str(pdf), '1' * 64)
+    assert (tmp_path / first).read_bytes() == b'first'
+
+    pdf.write_bytes(b'second')
+    second = publish_hashed(str(pdf), '2' * 64)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['article.22222222.pdf', 'article.pdf']
+    assert (tmp_path / second).read_bytes() == b'second'
+
+    # A rewrite of the plain file must not change the published copy
+    pdf.write_bytes(b'third')
+    assert (tmp_path / second).read_bytes() == b'second'
+
+
+def test_remove_hashed_only_touches_copies_of_that_name(tmp_path):
+    for name in ('article.pdf', 'article.0123abcd.pdf', 'article-two.0123abcd.pdf', 'article.0123abcd.zip',
+                 'article.notahash.pdf'):
+        (tmp_path / name).write_bytes(b'')
+    remove_hashed(str(tmp_path), 'article.pdf')
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        'article-two.0123abcd.pdf', 'article.0123abcd.zip', 'article.notahash.pdf', 'article.pdf',
+    ]
+
+
+def cache_control(path):
+    """Cache-Control the generated rules give `path` (the last matching rule wins, as on Firebase)"""
+    value = None
+    for rule in firebase_headers():
+        if re.search(rule['regex'], path):
+            value = rule['headers'][0]['value']
+    return value
+
+
+@pytest.mark.parametrize('path, expected', [
+    (f"/pdfs/article.{DIGEST[:8]}.pdf", IMMUTABLE_CACHE),
+    ('/pdfs/all-blog-pdfs.0123abcd.zip', IMMUTABLE_CACHE),
+    ('/pdfs/article.pdf', SHORT_CACHE),
+    ('/pdfs/all-blog-pdfs.zip', SHORT_CACHE),
+    ('/pdfs/index.html', SHORT_CACHE),
+    ('/pdfs/', SHORT_CACHE),
+    ('/pdfs/previews/article-400.webp', None),
+    ('/blog/article', None),
+])
+def test_firebase_headers_cache_hashed_files_for_a_year(path, expected):
+    assert cache_control(path) == expected
+
+
+def test_update_firebase_headers_keeps_other_rules_and_is_idempotent(tmp_path):
+    config_path = tmp_path / 'firebase.json'
+    other = {'source': '**/*.@(js|css)', 'headers': [{'key': 'Cache-Control', 'value': 'max-age=60'}]}
+    stale = {'regex': '^/pdfs/old$', 'headers': []}
+    config_path.write_text(json.dumps({'hosting': {'public': 'build', 'headers': [other, stale]}}))
+
+    assert update_firebase_headers(str(config_path))
+    hosting = json.loads(config_path.read_text())['hosting']
+    assert hosting['public'] == 'build'
+    assert hosting['headers'] == [other] + firebase_headers()
+
+    before = config_path.read_text()
+    assert not update_firebase_headers(str(config_path))
+    assert config_path.read_text() == before
@@ -0,0 +1,123 @@
+import json
+import os
+
+import pytest
+
+import generate_blog_pdfs as generator
+import merge_pdf_shards
+from pdf_catalog import PdfCatalog
+from render_scheduler import RenderHistory
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    output = tmp_path / 'pdfs'
+    output.mkdir()
+    monkeypatch.setattr(generator, 'OUTPUT_DIR', str(output))
+    return output
+
+
+def write_shard(directory, shard, count, renders):
+    """A shard's outputs: {slug: (render seconds, updated)} PDFs with catalog, manifest and history"""
+    directory.mkdir(exist_ok=True)
+    suffix = f"shard-{shard}-of-{count}.json"
+    catalog = PdfCatalog(str(directory / f".catalog.{suffix}"))
+    manifest = {'version': generator.MANIFEST_VERSION, 'articles': {}}
+    history = RenderHistory(str(directory / f".render-history.{suffix}"))
+    for slug, (seconds, updated) in renders.items():
+        pdf = directory / f"{slug}.pdf"
+        pdf.write_bytes(f"%PDF-1.7 {slug} shard {shard}\n<< /Type /Page >>\n".encode())
+        entry = catalog.record({'slug': slug, 'title': slug.title()}, str(pdf), seconds)
+        entry['updated'] = updated
+        manifest['articles'][slug] = {'hash': f"{slug}-{shard}"}
+        history.record(slug, seconds)
+        (directory / 'previews').mkdir(exist_ok=True)
+        (directory / 'previews' / f"{slug}-400.webp").write_bytes(b'webp')
+    catalog.save()
+    generator.save_manifest(manifest, str(directory / f".build-manifest.{suffix}"))
+    history.save()
+
+
+def test_find_shards_pairs_the_files_of_each_shard(tmp_path):
+    write_shard(tmp_path, 1, 2, {'a': (1.0, '2026-01-01T00:00:00')})
+    write_shard(tmp_path, 2, 2, {'b': (1.0, '2026-01-01T00:00:00')})
+    shards = merge_pdf_shards.find_shards([str(tmp_path)])
+    assert [os.path.basename(catalog) for _, catalog, _, _ in shards] == [
+        '.catalog.shard-1-of-2.json', '.catalog.shard-2-of-2.json',
+    ]
+    for _, _, manifest_path, history_path in shards:
+        assert os.path.exists(manifest_path) and os.path.exists(history_path)
+
+
+def test_merge_copies_pdfs_previews_and_entries(tmp_path, output_dir):
+    write_shard(tmp_path / 'one', 1, 2, {'a': (3.0, '2026-01-01T00:00:00')})
+    write_shard(tmp_path / 'two', 2, 2, {'b': (2.0, '2026-01-01T00:00:00')})
+    shards = merge_pdf_shards.find_shards([str(tmp_path / 'one'), str(tmp_path / 'two')])
+    catalog = PdfCatalog(str(output_dir / '.catalog.json'))
+    manifest = generator.load_manifest(str(output_dir / '.build-manifest.json'))
+
+    merged = merge_pdf_shards.merge_shards(shards, catalog, manifest)
+    assert sorted(merged) == ['a', 'b']
+    assert (output_dir / 'a.pdf').read_bytes() == (tmp_path / 'one' / 'a.pdf').read_bytes()
+    assert (output_dir / 'previews' / 'b-400.webp').exists()
+    assert catalog.get('a')['render_seconds'] == 3.0
+    assert catalog.get('b')['bytes'] == (output_dir / 'b.pdf').stat().st_size
+    assert manifest['articles'] == {'a': {'hash': 'a-1'}, 'b': {'hash': 'b-2'}}
+
+    history = RenderHistory(str(tmp_path / 'history.json'))
+    history.record('c', 9.0)
+    merge_pdf_shards.merge_histories(shards, history)
+    assert history.durations == {'a': [3.0], 'b': [2.0], 'c': [9.0]}
+
+
+def test_merge_keeps_the_newer_render_of_a_duplicated_slug(tmp_path, output_dir):
+    write_shard(tmp_path / 'one', 1, 2, {'a': (1.0, '2026-03-01T00:00:00')})
+    write_shard(tmp_path / 'two', 2, 2, {'a': (5.0, '2026-01-01T00:00:00')})
+    shards = merge_pdf_shards.find_shards([str(tmp_path / 'one'), str(tmp_path / 'two')])
+    catalog = PdfCatalog(str(output_dir / '.catalog.json'))
+    manifest = generator.load_manifest(str(output_dir / '.build-manifest.json'))
+
+    merge_pdf_shards.merge_shards(shards, catalog, manifest)
+    assert catalog.get('a')['render_seconds'] == 1.0
+    assert manifest['articles']['a'] == {'hash': 'a-1'}
+    assert (output_dir / 'a.pdf').read_bytes() == (tmp_path / 'one' / 'a.pdf').read_bytes()
+
+
+def test_merge_skips_entries_whose_pdf_is_missing(tmp_path, output_dir):
+    write_shard(tmp_path, 1, 1, {'a': (1.0, '2026-01-01T00:00:00'), 'b': (1.0, '2026-01-01T00:00:00')})
+    os.remove(tmp_path / 'b.pdf')
+    catalog = PdfCatalog(str(output_dir / '.catalog.json'))
+    manifest = generator.load_manifest(str(output_dir / '.build-manifest.json'))
+    assert list(merge_pdf_shards.merge_shards(merge_pdf_shards.find_shards([str(tmp_path)]), catalog, manifest)) == ['a']
+    assert catalog.get('b') is None
+
+
+def test_merge_in_place_leaves_the_pdfs_alone(output_dir):
+    write_shard(output_dir, 1, 1, {'a': (1.0, '2026-01-01T00:00:00')})
+    before = (output_dir / 'a.pdf').stat().st_mtime_ns
+    catalog = PdfCatalog(str(output_dir / '.catalog.json'))
+    manifest = generator.load_manifest(str(output_dir / '.build-manifest.json'))
+    merge_pdf_shards.merge_shards(merge_pdf_shards.find_shards([str(output_dir)]), catalog, manifest)
+    assert (output_dir / 'a.pdf').stat().st_mtime_ns == before
+    assert catalog.get('a')['file'] == 'a.pdf'
+
+
+def test_merge_reports_combines_and_removes_shard_reports(tmp_path):
+    for shard, slug in ((1, 'a'), (2, 'b')):
+        (tmp_path / f"render-report.shard-{shard}-of-2.json").write_text(json.dumps({
+            'spans': [{'slug': slug, 'stage': 'article', 'start': 0.0, 'duration': float(shard), 'thread': 1}],
+            'metrics': {slug: {'JSHeapUsedSize': 1024}},
+        }))
+        (tmp_path / f"render-trace.shard-{shard}-of-2.json").write_text(json.dumps({
+            'traceEvents': [{'ph': 'X', 'name': 'article', 'pid': shard}],
+        }))
+
+    assert merge_pdf_shards.merge_reports(str(tmp_path)) == 2
+    report = json.loads((tmp_path / 'render-report.json').read_text())
+    assert sorted(span['slug'] for span in report['spans']) == ['a', 'b']
+    assert report['stages']['article']['count'] == 2
+    assert set(report['metrics']) == {'a', 'b'}
+    trace = json.loads((tmp_path / 'render-trace.json').read_text())
+    assert sorted(event['pid'] for event in trace['traceEvents']) == [1, 2]
+    assert sorted(os.listdir(tmp_path)) == ['render-report.json', 'render-trace.json']
+    assert merge_pdf_shards.merge_reports(str(tmp_path)) == 0
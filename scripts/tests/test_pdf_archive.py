@@ -0,0 +1,144 @@
+import os
+import zipfile
+
+import pdf_archive
+from pdf_archive import PdfArchive
+
+
+def write(path, data, mtime=1_700_000_000):
+    path.write_bytes(data)
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def compressible(size):
+    return b"%PDF-1.7 " + b"stream of text " * (size // 15)
+
+
+def incompressible(size, seed):
+    state = seed
+    data = bytearray()
+    while len(data) < size:
+        state = (state * 6364136223846793005 + 1442695040888963407) % 2 ** 64
+        data += state.to_bytes(8, 'little')
+    return bytes(data[:size])
+
+
+def build(zip_path, members):
+    archive = PdfArchive(zip_path)
+    size = archive.close(members)
+    assert size == os.path.getsize(zip_path)
+    return archive
+
+
+def contents(zip_path):
+    with zipfile.ZipFile(zip_path) as archive:
+        assert archive.testzip() is None
+        return {info.filename: archive.read(info.filename) for info in archive.infolist()}
+
+
+def leftovers(directory):
+    """Temporary archive files left in `directory`"""
+    return [name for name in os.listdir(directory) if name.endswith(('.tmp', '.rebuild'))]
+
+
+def raw_members(zip_path):
+    """{name: (compress_type, compressed bytes)} straight from the file"""
+    result = {}
+    with zipfile.ZipFile(zip_path) as archive, open(zip_path, 'rb') as f:
+        for info in archive.infolist():
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = int.from_bytes(f.read(2), 'little'), int.from_bytes(f.read(2), 'little')
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            result[info.filename] = (info.compress_type, f.read(info.compress_size))
+    return result
+
+
+def test_first_build_picks_compression_per_member(tmp_path):
+    text = write(tmp_path / 'text.pdf', compressible(200_000))
+    noise = write(tmp_path / 'noise.pdf', incompressible(200_000, 1))
+    zip_path = str(tmp_path / 'all.zip')
+    archive = build(zip_path, {'text.pdf': text, 'noise.pdf': noise})
+
+    assert archive.stats == {'added': 2, 'reused': 0, 'stored': 1, 'deflated': 1}
+    assert contents(zip_path) == {'text.pdf': compressible(200_000), 'noise.pdf': incompressible(200_000, 1)}
+    types = {name: compress_type for name, (compress_type, _) in raw_members(zip_path).items()}
+    assert types == {'text.pdf': zipfile.ZIP_DEFLATED, 'noise.pdf': zipfile.ZIP_STORED}
+
+
+def test_unchanged_members_are_copied_raw(tmp_path):
+    text = write(tmp_path / 'text.pdf', compressible(200_000))
+    noise = write(tmp_path / 'noise.pdf', incompressible(100_000, 2))
+    zip_path = str(tmp_path / 'all.zip')
+    members = {'text.pdf': text, 'noise.pdf': noise}
+    build(zip_path, members)
+    before = raw_members(zip_path)
+
+    archive = build(zip_path, members)
+    assert archive.stats['reused'] == 2 and archive.stats['added'] == 0
+    assert raw_members(zip_path) == before
+    assert contents(zip_path) == {'text.pdf': compressible(200_000), 'noise.pdf': incompressible(100_000, 2)}
+
+
+def test_changed_added_and_removed_members(tmp_path):
+    keep = write(tmp_path / 'keep.pdf', compressible(50_000))
+    edit = write(tmp_path / 'edit.pdf', compressible(60_000))
+    gone = write(tmp_path / 'gone.pdf', compressible(70_000))
+    zip_path = str(tmp_path / 'all.zip')
+    build(zip_path, {'keep.pdf': keep, 'edit.pdf': edit, 'gone.pdf': gone})
+
+    write(tmp_path / 'edit.pdf', compressible(65_000), mtime=1_700_000_100)
+    new = write(tmp_path / 'new.pdf', incompressible(10_000, 3))
+    archive = build(zip_path, {'keep.pdf': keep, 'edit.pdf': edit, 'new.pdf': new})
+
+    assert archive.stats['reused'] == 1 and archive.stats['added'] == 2
+    assert contents(zip_path) == {
+        'keep.pdf': compressible(50_000),
+        'edit.pdf': compressible(65_000),
+        'new.pdf': incompressible(10_000, 3),
+    }
+
+
+def test_streamed_member_not_in_final_set_is_dropped(tmp_path):
+    keep = write(tmp_path / 'keep.pdf', compressible(40_000))
+    zip_path = str(tmp_path / 'all.zip')
+    build(zip_path, {'keep.pdf': keep})
+
+    late = write(tmp_path / 'late.pdf', compressible(30_000))
+    archive = PdfArchive(zip_path)
+    archive.add('late.pdf', late)  # added while rendering, then dropped from the run
+    archive.close({'keep.pdf': keep})
+
+    assert contents(zip_path) == {'keep.pdf': compressible(40_000)}
+    assert leftovers(tmp_path) == []
+
+
+def test_abort_keeps_the_previous_archive(tmp_path):
+    keep = write(tmp_path / 'keep.pdf', compressible(20_000))
+    zip_path = str(tmp_path / 'all.zip')
+    build(zip_path, {'keep.pdf': keep})
+
+    archive = PdfArchive(zip_path)
+    archive.add('other.pdf', write(tmp_path / 'other.pdf', compressible(10_000)))
+    archive.abort()
+
+    assert contents(zip_path) == {'keep.pdf': compressible(20_000)}
+    assert leftovers(tmp_path) == []
+
+
+def test_temp_file_is_per_process(tmp_path):
+    zip_path = str(tmp_path / 'all.zip')
+    archive = PdfArchive(zip_path)
+    assert archive.tmp_path == f"{zip_path}.{os.getpid()}.tmp"
+    archive.abort()
+
+
+def test_reuse_falls_back_to_recompressing_without_zipfile_internals(tmp_path, monkeypatch):
+    text = write(tmp_path / 'text.pdf', compressible(100_000))
+    zip_path = str(tmp_path / 'all.zip')
+    build(zip_path, {'text.pdf': text})
+
+    monkeypatch.setattr(pdf_archive, 'ZIPFILE_INTERNALS', ('no_such_attribute',))
+    archive = build(zip_path, {'text.pdf': text})
+    assert archive.stats['reused'] == 1
+    assert contents(zip_path) == {'text.pdf': compressible(100_000)}
@@ -0,0 +1,80 @@
+import json
+
+from pdf_catalog import CATALOG_VERSION, PdfCatalog, count_pdf_pages
+
+
+def write_pdf(path, pages=1):
+    path.write_bytes(b'%PDF-1.7\n' + b'1 0 obj << /Type /Pages >> endobj\n' + b'<< /Type /Page >>\n' * pages)
+    return path
+
+
+def test_record_describes_the_pdf(tmp_path):
+    catalog = PdfCatalog(str(tmp_path / '.catalog.json'))
+    pdf = write_pdf(tmp_path / 'first.pdf', pages=3)
+    entry = catalog.record({'slug': 'first', 'title': 'First', 'date': '5 Dec 2025'}, str(pdf), 1.5)
+    assert entry['file'] == 'first.pdf'
+    assert entry['pages'] == 3 == count_pdf_pages(str(pdf))
+    assert entry['bytes'] == pdf.stat().st_size
+    assert entry['render_seconds'] == 1.5
+
+    # A re-description without a render keeps the known render time
+    assert catalog.record({'slug': 'first', 'title': 'First'}, str(pdf))['render_seconds'] == 1.5
+
+
+def test_select_returns_known_slugs_newest_first(tmp_path):
+    catalog = PdfCatalog(str(tmp_path / '.catalog.json'))
+    catalog.entries = {
+        'old': {'slug': 'old', 'date': '1 Jan 2024'},
+        'new': {'slug': 'new', 'date': '28 Feb 2026'},
+        'undated': {'slug': 'undated', 'date': ''},
+        'mid': {'slug': 'mid', 'date': '2025-06-01'},
+    }
+    selected = catalog.select(['undated', 'old', 'missing', 'new', 'mid'])
+    assert [entry['slug'] for entry in selected] == ['new', 'mid', 'old', 'undated']
+    assert catalog.select(['old']) == [catalog.entries['old']]
+
+
+def test_adopt_takes_the_entry_for_the_copied_file(tmp_path):
+    shard = PdfCatalog(str(tmp_path / 'shard.json'))
+    source = write_pdf(tmp_path / 'first.pdf')
+    entry = shard.record({'slug': 'first', 'title': 'First'}, str(source), 2.0)
+
+    copied = write_pdf(tmp_path / 'copy.pdf', pages=2)
+    catalog = PdfCatalog(str(tmp_path / '.catalog.json'))
+    adopted = catalog.adopt(entry, str(copied))
+    assert adopted['file'] == 'copy.pdf'
+    assert adopted['bytes'] == copied.stat().st_size
+    assert adopted['mtime_ns'] == copied.stat().st_mtime_ns
+    assert adopted['sha256'] == entry['sha256'] and adopted['render_seconds'] == 2.0
+    assert catalog.get('first') is adopted
+    assert shard.get('first')['file'] == 'first.pdf'  # the shard's entry is left alone
+
+
+def test_drop_missing_forgets_removed_articles(tmp_path):
+    catalog = PdfCatalog(str(tmp_path / '.catalog.json'))
+    catalog.entries = {slug: {'slug': slug} for slug in ('kept', 'removed', 'also-kept')}
+    catalog.drop_missing(['kept', 'also-kept', 'never-rendered'])
+    assert sorted(catalog.entries) == ['also-kept', 'kept']
+
+
+def test_ensure_rereads_only_changed_files(tmp_path):
+    catalog = PdfCatalog(str(tmp_path / '.catalog.json'))
+    pdf = write_pdf(tmp_path / 'first.pdf')
+    entry = catalog.record({'slug': 'first', 'title': 'First'}, str(pdf))
+    assert catalog.ensure({'slug': 'first', 'title': 'Renamed'}, str(pdf)) is entry
+    assert entry['title'] == 'Renamed'
+
+    write_pdf(pdf, pages=4)
+    assert catalog.ensure({'slug': 'first', 'title': 'Renamed'}, str(pdf))['pages'] == 4
+
+
+def test_save_round_trip_and_version(tmp_path):
+    path = tmp_path / '.catalog.json'
+    catalog = PdfCatalog(str(path))
+    catalog.record({'slug': 'first', 'title': 'Première'}, str(write_pdf(tmp_path / 'first.pdf')))
+    catalog.save()
+    assert PdfCatalog(str(path)).entries == catalog.entries
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith('.tmp')] == []
+
+    path.write_text(json.dumps({'version': CATALOG_VERSION + 1, 'articles': catalog.entries}))
+    assert PdfCatalog(str(path)).entries == {}
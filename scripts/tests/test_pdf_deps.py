@@ -0,0 +1,22 @@
+import pytest
+
+import pdf_deps
+
+
+def test_available_dependencies_pass(monkeypatch):
+    monkeypatch.setattr(pdf_deps, 'pikepdf', object())
+    monkeypatch.setattr(pdf_deps, 'Image', object())
+    pdf_deps.require_pikepdf("PDF optimization", pillow=True)
+
+
+def test_missing_dependencies_are_named(monkeypatch):
+    monkeypatch.setattr(pdf_deps, 'pikepdf', None)
+    monkeypatch.setattr(pdf_deps, 'Image', None)
+    with pytest.raises(RuntimeError, match=r"^The book PDF needs pikepdf \(pip install pikepdf\)$"):
+        pdf_deps.require_pikepdf("The book PDF")
+    with pytest.raises(RuntimeError, match=r"needs pikepdf and Pillow \(pip install pikepdf pillow\)"):
+        pdf_deps.require_pikepdf("PDF optimization", pillow=True)
+
+    monkeypatch.setattr(pdf_deps, 'pikepdf', object())
+    with pytest.raises(RuntimeError, match=r"^PDF optimization needs Pillow \(pip install pillow\)$"):
+        pdf_deps.require_pikepdf("PDF optimization", pillow=True)
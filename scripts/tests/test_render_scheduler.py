@@ -0,0 +1,139 @@
+import threading
+
+import pytest
+
+import render_scheduler
+from render_scheduler import MAX_ATTEMPTS, RenderHistory, RenderJob, RenderScheduler, assign_shards, parse_shard
+
+
+def make_history(tmp_path, durations):
+    history = RenderHistory(str(tmp_path / 'history.json'))
+    for slug, seconds in durations.items():
+        history.record(slug, seconds)
+    return history
+
+
+def make_scheduler(tmp_path, slugs, durations=None):
+    history = make_history(tmp_path, durations or {})
+    return RenderScheduler([(index, {'slug': slug}) for index, slug in enumerate(slugs)], history)
+
+
+def drain(scheduler):
+    """Slugs in the order next() hands them out, finishing each as a success"""
+    order = []
+    while (job := scheduler.next()) is not None:
+        order.append(job.blog['slug'])
+        scheduler.finish(job, True)
+    return order
+
+
+def test_unknown_articles_first_then_slowest(tmp_path):
+    scheduler = make_scheduler(tmp_path, ['fast', 'new-a', 'slow', 'new-b', 'medium'],
+                               {'fast': 1.0, 'slow': 9.0, 'medium': 4.0})
+    assert drain(scheduler) == ['new-a', 'new-b', 'slow', 'medium', 'fast']
+
+
+def test_history_uses_slowest_recent_render(tmp_path):
+    history = make_history(tmp_path, {})
+    for seconds in [1.0, 8.0] + [2.0] * (render_scheduler.HISTORY_LENGTH - 1):
+        history.record('article', seconds)
+    assert history.expected('article') == 8.0
+    history.record('article', 2.0)  # pushes 8.0 out of the window
+    assert history.expected('article') == 2.0
+    assert history.expected('missing') is None
+
+
+def test_history_round_trip_and_subset(tmp_path):
+    history = make_history(tmp_path, {'a': 1.5, 'b': 2.5})
+    history.save()
+    assert RenderHistory(history.path).durations == {'a': [1.5], 'b': [2.5]}
+
+    shard_path = str(tmp_path / 'shard.json')
+    history.save(shard_path, slugs={'b'})
+    assert RenderHistory(shard_path).durations == {'b': [2.5]}
+
+
+def test_failure_is_retried_with_backoff_then_failed(tmp_path, monkeypatch):
+    monkeypatch.setattr(render_scheduler, 'BACKOFF_SECONDS', 0)
+    scheduler = make_scheduler(tmp_path, ['broken', 'fine'])
+    attempts = 0
+    while (job := scheduler.next()) is not None:
+        if job.blog['slug'] == 'broken':
+            attempts += 1
+            assert job.final == (attempts == MAX_ATTEMPTS)
+            delay = scheduler.finish(job, False)
+            assert (delay is None) == (attempts == MAX_ATTEMPTS)
+        else:
+            scheduler.finish(job, True)
+    assert attempts == MAX_ATTEMPTS
+    assert scheduler.succeeded == [(1, {'slug': 'fine'})]
+    assert scheduler.failed == [(0, {'slug': 'broken'})]
+    assert scheduler.in_flight == 0
+
+
+def test_backoff_doubles(tmp_path, monkeypatch):
+    monkeypatch.setattr(render_scheduler, 'BACKOFF_SECONDS', 2)
+    scheduler = make_scheduler(tmp_path, ['broken'])
+    job = scheduler.next()
+    assert scheduler.finish(job, False) == 2
+    # Re-queued with a not-before time; bring it forward instead of sleeping
+    scheduler.heap = [(0, count, queued) for _, count, queued in scheduler.heap]
+    job = scheduler.next()
+    assert scheduler.finish(job, False) == 4
+
+
+def test_waiting_worker_wakes_when_last_job_finishes(tmp_path):
+    scheduler = make_scheduler(tmp_path, ['only'])
+    job = scheduler.next()
+    result = []
+    waiter = threading.Thread(target=lambda: result.append(scheduler.next()))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive()  # the job is in flight, so it might still be re-queued
+    scheduler.finish(job, True)
+    waiter.join(5)
+    assert not waiter.is_alive()
+    assert result == [None]
+
+
+def test_abandon_fails_queued_jobs(tmp_path):
+    scheduler = make_scheduler(tmp_path, ['a', 'b', 'c'])
+    job = scheduler.next()
+    scheduler.finish(job, True)
+    scheduler.abandon()
+    assert scheduler.next() is None
+    assert sorted(scheduler.failed) == [(1, {'slug': 'b'}), (2, {'slug': 'c'})]
+
+
+def test_deadlines(tmp_path):
+    unknown = RenderJob(0, {'slug': 'a'}, None)
+    unknown.attempt = 1
+    assert unknown.deadlines(60000, 30000) == (60000, 30000)
+    unknown.attempt = 2
+    assert unknown.deadlines(60000, 30000) == (120000, render_scheduler.MAX_READY_DEADLINE)
+
+    quick = RenderJob(0, {'slug': 'b'}, 0.5)
+    quick.attempt = 1
+    assert quick.deadlines(60000, 30000) == (render_scheduler.MIN_TIMEOUT, render_scheduler.MIN_READY_DEADLINE)
+
+
+def test_parse_shard():
+    assert parse_shard('2/4') == (2, 4)
+    for value in ('0/4', '5/4', '2', 'a/b'):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_assign_shards_balances_and_covers_every_slug():
+    costs = {'a': 10.0, 'b': 7.0, 'c': 5.0, 'd': 4.0, 'e': 3.0, 'f': None}
+    shards = assign_shards(costs, 3)
+    assert sorted(slug for shard in shards for slug in shard) == sorted(costs)
+    default = (10 + 7 + 5 + 4 + 3) / 5
+    loads = [sum(costs[slug] if costs[slug] is not None else default for slug in shard) for shard in shards]
+    assert max(loads) - min(loads) <= 10.0
+    assert shards[0][0] == 'a'
+
+
+def test_assign_shards_is_deterministic():
+    costs = {f"article-{i}": float(i % 3) for i in range(20)}
+    assert assign_shards(costs, 4) == assign_shards(dict(reversed(list(costs.items()))), 4)
@@ -0,0 +1,91 @@
+import contextlib
+import threading
+
+import generate_blog_pdfs
+import render_scheduler
+
+
+class FakeContext:
+    def new_page(self):
+        return object()
+
+    def route(self, *args):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self, broken_after=None):
+        self.contexts = 0
+        self.broken_after = broken_after
+
+    def new_context(self):
+        self.contexts += 1
+        if self.broken_after is not None and self.contexts > self.broken_after:
+            raise RuntimeError("browser crashed")
+        return FakeContext()
+
+    def close(self):
+        pass
+
+
+class FakeHistory:
+    def expected(self, slug):
+        return None
+
+    def record(self, slug, seconds):
+        pass
+
+
+def fake_playwright(monkeypatch, browsers):
+    """Hand each worker the next browser from `browsers`"""
+    lock = threading.Lock()
+
+    def launch(**kwargs):
+        with lock:
+            return browsers.pop(0)
+
+    chromium = type('Chromium', (), {'launch': staticmethod(launch)})
+    driver = type('Playwright', (), {'chromium': chromium})
+    monkeypatch.setattr(generate_blog_pdfs, 'sync_playwright', lambda: contextlib.nullcontext(driver))
+    monkeypatch.setattr(generate_blog_pdfs.MemoryMonitor, 'start_for', staticmethod(lambda browser: None))
+    monkeypatch.setattr(generate_blog_pdfs, 'generate_pdf', lambda page, slug, **kwargs: True)
+    monkeypatch.setattr(render_scheduler, 'BACKOFF_SECONDS', 0)
+
+
+def render(slugs, workers, **kwargs):
+    """render_blogs() on a thread, so a hang fails the test instead of the run"""
+    result = []
+    thread = threading.Thread(
+        target=lambda: result.append(generate_blog_pdfs.render_blogs(
+            [(index, {'slug': slug}) for index, slug in enumerate(slugs)], workers, FakeHistory(), **kwargs
+        )),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive(), "render_blogs() hung"
+    succeeded, failed = result[0]
+    return [blog['slug'] for _, blog in succeeded], [blog['slug'] for _, blog in failed]
+
+
+def test_exception_after_render_fails_the_job_instead_of_hanging(monkeypatch):
+    fake_playwright(monkeypatch, [FakeBrowser(), FakeBrowser()])
+
+    def on_rendered(blog):
+        if blog['slug'] == 'b':
+            raise OSError("disk full")
+
+    assert render(['a', 'b', 'c', 'd'], 2, on_rendered=on_rendered) == (['a', 'c', 'd'], ['b'])
+
+
+def test_failed_recycle_leaves_the_queue_to_other_workers(monkeypatch):
+    fake_playwright(monkeypatch, [FakeBrowser(broken_after=1), FakeBrowser()])
+    assert render(list('abcdef'), 2, recycle_after=1) == (list('abcdef'), [])
+
+
+def test_failed_recycle_of_the_last_worker_fails_the_rest(monkeypatch):
+    fake_playwright(monkeypatch, [FakeBrowser(broken_after=1)])
+    assert render(list('abc'), 1, recycle_after=1) == (['a'], ['b', 'c'])
@@ -0,0 +1,88 @@
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+mpmath = pytest.importorskip('mpmath')
+
+ARTICLE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'src', 'blog', 'infinitely-fat-tan-conjecture',
+)
+sys.path.insert(0, ARTICLE_DIR)
+
+from shifted_tan import PI_BITS, check, reduce_mod_pi, reduce_scalar, shifted_tan  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def precision():
+    with mpmath.workprec(PI_BITS + 200):
+        yield
+
+
+def reference_tan(x, scale, shift):
+    return float(mpmath.tan(mpmath.mpf(x) / mpmath.mpf(scale) - mpmath.mpf(shift)))
+
+
+def ulps(value, reference):
+    return abs(value - reference) / np.spacing(abs(reference))
+
+
+@pytest.mark.parametrize('shift', [2.0, -3.5, 1e8, 12345.678, 1e15, -1e15, 2.0 ** 80, 1e100, 1e300, 1.7e308])
+def test_reduce_scalar_matches_mpmath(shift):
+    hi, lo = reduce_scalar(shift)
+    exact = mpmath.mpf(shift)
+    reduced = exact - mpmath.nint(exact / mpmath.pi) * mpmath.pi
+    assert abs(hi) <= math.pi / 2 + 1e-15
+    assert abs(lo) <= np.spacing(abs(hi))
+    assert abs(mpmath.mpf(hi) + mpmath.mpf(lo) - reduced) < mpmath.mpf(2) ** -100
+
+
+@pytest.mark.parametrize('shift', [0.0, 1.5, -math.pi / 2, math.inf, -math.inf])
+def test_reduce_scalar_passes_small_and_infinite_shifts_through(shift):
+    assert reduce_scalar(shift) == (shift, 0.0)
+    assert math.isnan(reduce_scalar(math.nan)[0])
+
+
+def test_reduce_mod_pi_keeps_the_shape():
+    shifts = np.array([[1e20, 5.0], [1e20, 1e300]])
+    hi, lo = reduce_mod_pi(shifts)
+    assert hi.shape == lo.shape == shifts.shape
+    assert hi[0, 0] == hi[1, 0] == reduce_scalar(1e20)[0]
+
+
+@pytest.mark.parametrize('P', [1.0, 1e8, 1e15, 1e100, 1e299])
+def test_shifted_tan_matches_mpmath(P):
+    x = np.linspace(-10, 10, 41)
+    values = shifted_tan(x, 2 * P, P)
+    for xi, value in zip(x, values):
+        assert ulps(value, reference_tan(xi, 2 * P, P)) <= 4
+
+
+def test_shifted_tan_beats_plain_float64():
+    report = check(samples=200)
+    assert report['max_ulps'] <= 4
+    assert report['naive_max_ulps'] > 1e6
+
+
+def test_shifted_tan_keeps_relative_accuracy_next_to_a_pole():
+    # x/scale - shift lands within ~1e-12 of -π/2 + kπ
+    P = 1e20
+    hi, lo = reduce_scalar(P)
+    x = 2 * P * (hi + lo - math.pi / 2 + 1e-12)
+    assert ulps(shifted_tan(x, 2 * P, P), reference_tan(x, 2 * P, P)) <= 4
+
+
+def test_shifted_tan_broadcasts_and_returns_floats_for_scalars():
+    assert isinstance(shifted_tan(1.0, 2e10, 1e10), float)
+    values = shifted_tan(np.array([[0.5], [1.5]]), np.array([2e10, 4e10]), np.array([1e10, 2e10]))
+    assert values.shape == (2, 2)
+    assert ulps(values[1, 0], reference_tan(1.5, 2e10, 1e10)) <= 4
+
+
+def test_small_scales_reduce_x_over_scale_too():
+    x = np.array([1e6, -3e7, 123456.789])
+    for xi, value in zip(x, shifted_tan(x, 0.5, 0.25)):
+        assert ulps(value, reference_tan(xi, 0.5, 0.25)) <= 4
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Convergence sweep: how does the scale a in -arccoth(x/a) relate to P?
+
+For every P on a log grid, tan(x/(2P) - P) (evaluated with the exact-reduction
+kernel in shifted_tan.py) is compared with -arccoth(x/a) for every a on a
+second log grid, over a shared x window. Sup and L2 (RMS) errors are
+computed for each arccoth branch (x > a and x < -a) and for both together,
+with numpy broadcasting over (P, a, x). The P axis is processed in chunks
+sized to a memory budget, optionally across a process pool.
+
+Outputs, next to this script:
+    convergence_sweep.png   log10 error heatmaps over (P, a) with the best a(P)
+    convergence_sweep.csv   best-fit a for each P with its errors
+
+Usage:
+    python convergence_sweep.py [--p-range 1,1e6] [--a-range 0.01,5] [--processes N] ...
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from shifted_tan import shifted_tan
+
+NORMS = ('sup', 'l2')
+MIN_BRANCH_FRACTION = 0.1  # a branch covering less of the window is not scored
+BRANCHES = ('negative', 'positive', 'both')
+
+
+def parse_range(value):
+    """'1,1e6' -> (1.0, 1e6)"""
+    low, high = (float(part) for part in value.split(','))
+    if not 0 < low < high:
+        raise argparse.ArgumentTypeError("ranges must be 'low,high' with 0 < low < high")
+    return low, high
+
+
+def branch_masks(a, x, margin):
+    """Boolean (len(a), len(x)) masks of the x samples on each arccoth branch
+
+    Points within `margin`·a of the singularities are left out: both
+    functions are steep there and would decide every norm on their own.
+    A branch with less than MIN_BRANCH_FRACTION of its half of the window
+    left is dropped, so a large a cannot win by leaving almost nothing to
+    compare.
+    """
+    edge = a[:, None] * (1 + margin)
+    negative = x[None, :] <= -edge
+    positive = x[None, :] >= edge
+    minimum = MIN_BRANCH_FRACTION * len(x) / 2
+    negative &= negative.sum(axis=1, keepdims=True) >= minimum
+    positive &= positive.sum(axis=1, keepdims=True) >= minimum
+    return {'negative': negative, 'positive': positive, 'both': negative | positive}
+
+
+def sweep_chunk(P, a, x, margin):
+    """Norms for one chunk of P: {'<norm>_<branch>': (len(P), len(a)) array}
+
+    The error array is (len(P), len(a), len(x)); tan depends only on (P, x)
+    and arccoth only on (a, x), so each is evaluated once and broadcast.
+    """
+    tan = shifted_tan(x[None, :], 2 * P[:, None], P[:, None])[:, None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        arccoth = -np.arctanh(a[:, None] / x[None, :])[None, :, :]  # arccoth(x/a) = arctanh(a/x)
+        error = np.abs(tan - arccoth)
+
+    results = {}
+    for branch, mask in branch_masks(a, x, margin).items():
+        count = mask.sum(axis=1)
+        empty = count == 0  # a too wide for the window: nothing left on this branch
+        masked = np.where(mask[None, :, :], error, 0.0)
+        results[f'sup_{branch}'] = np.where(empty, np.nan, masked.max(axis=2))
+        results[f'l2_{branch}'] = np.where(empty, np.nan, np.sqrt((masked ** 2).sum(axis=2) / np.maximum(count, 1)))
+    return results
+
+
+def chunk_rows(n_a, n_x, max_bytes):
+    """P values per chunk so the (P, a, x) temporaries fit in `max_bytes`"""
+    per_row = n_a * n_x * 8 * 4  # error, masked copy, its square and a where() result
+    return max(1, int(max_bytes // per_row))
+
+
+def run_sweep(P, a, x, margin=0.05, max_bytes=256 << 20, processes=1):
+    """Norms over the full (P, a) grid, computed chunk by chunk along P"""
+    rows = chunk_rows(len(a), len(x), max_bytes)
+    chunks = [P[start:start + rows] for start in range(0, len(P), rows)]
+    if processes > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            parts = list(pool.map(sweep_chunk, chunks, repeat(a), repeat(x), repeat(margin)))
+    else:
+        parts = [sweep_chunk(chunk, a, x, margin) for chunk in chunks]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def best_fit(a, errors):
+    """a minimising each row of `errors`, refined on a parabola in log a
+
+    Rows without a finite error give NaN.
+    """
+    log_a = np.log(a)
+    finite = np.isfinite(errors)
+    filled = np.where(finite, errors, np.inf)
+    best = np.argmin(filled, axis=1)
+    fit = np.exp(log_a[best])
+
+    inner = (best > 0) & (best < len(a) - 1)
+    rows = np.flatnonzero(inner)
+    left, mid, right = (filled[rows, best[rows] + offset] for offset in (-1, 0, 1))
+    curvature = left - 2 * mid + right
+    ok = np.isfinite(curvature) & (curvature > 0)
+    step = log_a[1] - log_a[0]
+    offset = np.where(ok, 0.5 * (left - right) / np.where(ok, curvature, 1), 0.0)
+    fit[rows] = np.exp(log_a[best[rows]] + np.clip(offset, -0.5, 0.5) * step)
+    fit[~finite.any(axis=1)] = np.nan
+    return fit
+
+
+def plot_sweep(P, a, results, fit, output_path):
+    fig, axes = plt.subplots(1, 3, figsize=(20, 6))
+    panels = [
+        ('l2_both', "L2 (RMS) error, both branches"),
+        ('sup_both', "Sup error, both branches"),
+    ]
+    for ax, (key, title) in zip(axes, panels):
+        with np.errstate(divide='ignore'):
+            values = np.log10(results[key]).T
+        mesh = ax.pcolormesh(P, a, np.ma.masked_invalid(values), shading='auto', cmap='viridis')
+        fig.colorbar(mesh, ax=ax, label="log10 error")
+        ax.plot(P, fit, "w-", linewidth=1.5, label="best a(P)")
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel("P", fontsize=12)
+        ax.set_ylabel("a", fontsize=12)
+        ax.set_title(title, fontsize=13)
+        ax.legend(loc="upper left", fontsize=9)
+
+    ax = axes[2]
+    best_rows = np.arange(len(P))
+    best_columns = np.argmin(np.where(np.isfinite(results['l2_both']), results['l2_both'], np.inf), axis=1)
+    for branch, style in (('negative', "b:"), ('positive', "g:"), ('both', "k-")):
+        ax.plot(P, results[f'l2_{branch}'][best_rows, best_columns], style, linewidth=1.5, label=f"L2, {branch}")
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_xlabel("P", fontsize=12)
+    ax.set_ylabel("error at the best a", fontsize=12)
+    ax.set_title("Remaining error at the best-fit a(P)", fontsize=13)
+    ax.grid(True, alpha=0.3)
+    ax.legend(fontsize=9)
+
+    plt.suptitle(
+        "Convergence sweep: tan(x/(2P) - P) vs -arccoth(x/a)",
+        fontsize=16,
+        fontweight="bold",
+    )
+    plt.tight_layout()
+    plt.savefig(output_path, dpi=100, bbox_inches="tight")
+    plt.close(fig)
+
+
+def write_csv(path, P, fit, results):
+    columns = [f'{norm}_{branch}' for norm in NORMS for branch in BRANCHES]
+    best = np.argmin(np.where(np.isfinite(results['l2_both']), results['l2_both'], np.inf), axis=1)
+    rows = np.arange(len(P))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(','.join(['P', 'best_a'] + columns) + '\n')
+        for row in rows:
+            values = [P[row], fit[row]] + [results[column][row, best[row]] for column in columns]
+            f.write(','.join(f"{value:.9g}" for value in values) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep P and a and fit a(P) for tan(x/(2P) - P) -> -arccoth(x/a)")
+    parser.add_argument('--p-range', type=parse_range, default=(1.0, 1e6), help="P grid bounds (default: 1,1e6)")
+    parser.add_argument('--p-count', type=int, default=240, help="P values, log-spaced (default: 240)")
+    parser.add_argument('--a-range', type=parse_range, default=(0.01, 5.0), help="a grid bounds (default: 0.01,5)")
+    parser.add_argument('--a-count', type=int, default=200, help="a values, log-spaced (default: 200)")
+    parser.add_argument('--x-max', type=float, default=10.0, help="x window is [-X, X] (default: 10)")
+    parser.add_argument('--x-count', type=int, default=2000, help="x samples (default: 2000)")
+    parser.add_argument(
+        '--margin', type=float, default=0.05,
+        help="leave out |x| < (1 + margin)·a around the arccoth singularities (default: 0.05)",
+    )
+    parser.add_argument('--max-memory', type=int, default=256, help="MB per chunk of the (P, a, x) grid (default: 256)")
+    parser.add_argument('--processes', type=int, default=1, help="worker processes for the chunks (default: 1)")
+    args = parser.parse_args()
+
+    P = np.logspace(*np.log10(args.p_range), args.p_count)
+    a = np.logspace(*np.log10(args.a_range), args.a_count)
+    x = np.linspace(-args.x_max, args.x_max, args.x_count)
+
+    results = run_sweep(P, a, x, args.margin, args.max_memory << 20, args.processes)
+    fit = best_fit(a, results['l2_both'])
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    plot_sweep(P, a, results, fit, os.path.join(script_dir, "convergence_sweep.png"))
+    write_csv(os.path.join(script_dir, "convergence_sweep.csv"), P, fit, results)
+
+    # A minimum on the edge of the a grid only says the best a lies beyond it
+    on_edge = np.isclose(fit, a[0]) | np.isclose(fit, a[-1])
+    fitted = np.isfinite(fit) & ~on_edge
+    print("Convergence sweep: tan(x/(2P) - P) vs -arccoth(x/a)")
+    print("-" * 50)
+    print(f"Grid: {len(P)} P x {len(a)} a x {len(x)} x, |x| <= {args.x_max:g}")
+    print(f"Best-fit a inside the a range for {fitted.sum()} of {len(P)} values of P ({on_edge.sum()} on its edge)")
+    if fitted.sum() >= 2:
+        slope, intercept = np.polyfit(np.log(P[fitted]), np.log(fit[fitted]), 1)
+        print(f"Power-law fit over those: a ≈ {np.exp(intercept):.3g}·P^{slope:.3f}")
+    print("Per-P results written to convergence_sweep.csv")
+
+
+if __name__ == "__main__":
+    main()
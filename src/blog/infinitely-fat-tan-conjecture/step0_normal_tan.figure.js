@@ -0,0 +1,63 @@
+// Generated by scripts/figure_export.py from step0_normal_tan.py; do not edit.
+
+import step0NormalTanPng from './step0_normal_tan.png';
+import step0NormalTanSvg from './step0_normal_tan.svg';
+import step0NormalTanPrintPng from './step0_normal_tan-print.png';
+import step0NormalTan640Webp from './step0_normal_tan-640.webp';
+import step0NormalTan960Webp from './step0_normal_tan-960.webp';
+import step0NormalTan1280Webp from './step0_normal_tan-1280.webp';
+import step0NormalTan1920Webp from './step0_normal_tan-1920.webp';
+
+const figure = {
+  width: 1390,
+  height: 495,
+  fallback: {
+    bytes: 65840,
+    width: 1390,
+    height: 495,
+    src: step0NormalTanPng,
+  },
+  vector: {
+    bytes: 60774,
+    src: step0NormalTanSvg,
+  },
+  print: {
+    bytes: 114664,
+    width: 2779,
+    height: 990,
+    src: step0NormalTanPrintPng,
+  },
+  sources: [
+    {
+      type: 'image/webp',
+      srcSet: [
+        {
+          bytes: 12632,
+          width: 640,
+          height: 228,
+          src: step0NormalTan640Webp,
+        },
+        {
+          bytes: 21504,
+          width: 960,
+          height: 342,
+          src: step0NormalTan960Webp,
+        },
+        {
+          bytes: 30676,
+          width: 1280,
+          height: 456,
+          src: step0NormalTan1280Webp,
+        },
+        {
+          bytes: 46686,
+          width: 1920,
+          height: 684,
+          src: step0NormalTan1920Webp,
+        },
+      ],
+    },
+  ],
+};
+
+export default figure;
@@ -7,27 +7,27 @@ Shows the regular periodic tan function with its characteristic jumps
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
+
+# figure_export lives in the repository's scripts/ directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts"))
+from figure_export import export_figure
+from tan_sampling import neg_arccoth_curve, tan_curve, tan_poles
 
 # Set up the figure
 fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
 
-# Step 0: Normal tan function
-x = np.linspace(-2 * np.pi, 2 * np.pi, 1000)
-y_tan = np.tan(x)
-
-# Handle discontinuities by setting large values to NaN
-y_tan_clean = np.where(np.abs(y_tan) > 10, np.nan, y_tan)
+# Step 0: Normal tan function, sampled adaptively with NaN breaks at the poles
+x, y_tan = tan_curve(-2 * np.pi, 2 * np.pi, ylim=(-5, 5))
 
 # Left plot: Regular tan
-ax1.plot(x, y_tan_clean, "b:", linewidth=2, label="tan(x)")
+ax1.plot(x, y_tan, "b:", linewidth=2, label="tan(x)")
 ax1.axhline(y=0, color="k", linestyle="-", alpha=0.3, linewidth=0.5)
 ax1.axvline(x=0, color="k", linestyle="-", alpha=0.3, linewidth=0.5)
 
 # Add vertical lines at discontinuities
-for k in range(-2, 3):
-    x_disc = (k + 0.5) * np.pi
-    if -2 * np.pi <= x_disc <= 2 * np.pi:
-        ax1.axvline(x=x_disc, color="r", linestyle="--", alpha=0.5, linewidth=1)
+for _, x_disc in tan_poles(-2 * np.pi, 2 * np.pi):
+    ax1.axvline(x=x_disc, color="r", linestyle="--", alpha=0.5, linewidth=1)
 
 ax1.set_xlim(-2 * np.pi, 2 * np.pi)
 ax1.set_ylim(-5, 5)
@@ -44,15 +44,9 @@ ax1.set_xticks(pi_ticks)
 ax1.set_xticklabels(pi_labels)
 
 # Right plot: Show -arccoth for comparison
-# arccoth is defined for |x| > 1, so we plot two branches
-x_arccoth_pos = np.linspace(1.1, 2 * np.pi, 500)
-y_arccoth_pos = -np.arctanh(1 / x_arccoth_pos)  # arccoth(x) = arctanh(1/x)
-
-x_arccoth_neg = np.linspace(-2 * np.pi, -1.1, 500)
-y_arccoth_neg = -np.arctanh(1 / x_arccoth_neg)
-
-ax2.plot(x_arccoth_pos, y_arccoth_pos, "g:", linewidth=2, label="-arccoth(x)")
-ax2.plot(x_arccoth_neg, y_arccoth_neg, "g:", linewidth=2)
+# arccoth is defined for |x| > 1: both branches, broken across the gap
+x_arccoth, y_arccoth = neg_arccoth_curve(-2 * np.pi, 2 * np.pi, ylim=(-5, 5))
+ax2.plot(x_arccoth, y_arccoth, "g:", linewidth=2, label="-arccoth(x)")
 ax2.axhline(y=0, color="k", linestyle="-", alpha=0.3, linewidth=0.5)
 ax2.axvline(x=0, color="k", linestyle="-", alpha=0.3, linewidth=0.5)
 ax2.axvline(
@@ -82,7 +76,8 @@ plt.tight_layout()
 # Save to the same directory as the script
 script_dir = os.path.dirname(os.path.abspath(__file__))
 output_path = os.path.join(script_dir, "step0_normal_tan.png")
-plt.savefig(output_path, dpi=100, bbox_inches="tight")
+# PNG plus SVG, responsive WebP/AVIF and a print-resolution copy
+export_figure(fig, output_path, dpi=100, script_name=os.path.basename(__file__), bbox_inches="tight")
 plt.close()
 
 print("Step 0: Normal tan function")
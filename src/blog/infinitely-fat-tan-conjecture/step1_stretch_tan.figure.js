@@ -0,0 +1,63 @@
+// Generated by scripts/figure_export.py from step1_stretch_tan.py; do not edit.
+
+import step1StretchTanPng from './step1_stretch_tan.png';
+import step1StretchTanSvg from './step1_stretch_tan.svg';
+import step1StretchTanPrintPng from './step1_stretch_tan-print.png';
+import step1StretchTan640Webp from './step1_stretch_tan-640.webp';
+import step1StretchTan960Webp from './step1_stretch_tan-960.webp';
+import step1StretchTan1280Webp from './step1_stretch_tan-1280.webp';
+import step1StretchTan1920Webp from './step1_stretch_tan-1920.webp';
+
+const figure = {
+  width: 1390,
+  height: 985,
+  fallback: {
+    bytes: 136871,
+    width: 1390,
+    height: 985,
+    src: step1StretchTanPng,
+  },
+  vector: {
+    bytes: 108400,
+    src: step1StretchTanSvg,
+  },
+  print: {
+    bytes: 192673,
+    width: 2779,
+    height: 1970,
+    src: step1StretchTanPrintPng,
+  },
+  sources: [
+    {
+      type: 'image/webp',
+      srcSet: [
+        {
+          bytes: 21214,
+          width: 640,
+          height: 454,
+          src: step1StretchTan640Webp,
+        },
+        {
+          bytes: 36650,
+          width: 960,
+          height: 681,
+          src: step1StretchTan960Webp,
+        },
+        {
+          bytes: 54240,
+          width: 1280,
+          height: 907,
+          src: step1StretchTan1280Webp,
+        },
+        {
+          bytes: 85644,
+          width: 1920,
+          height: 1361,
+          src: step1StretchTan1920Webp,
+        },
+      ],
+    },
+  ],
+};
+
+export default figure;
@@ -7,6 +7,12 @@ Shows how stretching the period makes tan look less oscillatory
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
+
+# figure_export lives in the repository's scripts/ directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts"))
+from figure_export import export_figure
+from tan_sampling import neg_arccoth_curve, tan_curve, tan_poles
 
 # Set up the figure
 fig, axes = plt.subplots(2, 2, figsize=(14, 10))
@@ -14,55 +20,43 @@ fig, axes = plt.subplots(2, 2, figsize=(14, 10))
 # Different values of P (stretching factor)
 P_values = [1, 3, 10, 100]
 x_range = 10
+y_view = (-5, 5)
 
 for idx, P in enumerate(P_values):
     ax = axes[idx // 2, idx % 2]
 
-    # Create x values centered at 0
-    x = np.linspace(-x_range, x_range, 2000)
-
     # Stretched tan: tan(x/(2P))
     # Period is now 2πP instead of π
-    y_tan = np.tan(x / (2 * P))
-
-    # Handle discontinuities
-    y_tan_clean = np.where(np.abs(y_tan) > 10, np.nan, y_tan)
+    x, y_tan = tan_curve(-x_range, x_range, 2 * P, ylim=y_view)
 
     # Plot stretched tan
-    ax.plot(x, y_tan_clean, "b:", linewidth=2, label=f"tan(x/{2*P})")
+    ax.plot(x, y_tan, "b:", linewidth=2, label=f"tan(x/{2*P})")
 
     # Mark discontinuities
     # Discontinuities occur when x/(2P) = (k + 0.5)π
     # So x = 2P(k + 0.5)π
-    for k in range(-int(x_range / (P * np.pi)) - 1, int(x_range / (P * np.pi)) + 2):
-        x_disc = 2 * P * (k + 0.5) * np.pi
-        if -x_range <= x_disc <= x_range:
-            ax.axvline(x=x_disc, color="r", linestyle="--", alpha=0.5, linewidth=0.5)
-            if P <= 10:  # Only label for smaller P values
-                ax.text(
-                    x_disc,
-                    ax.get_ylim()[1] * 0.8,
-                    f"{k+0.5}π",
-                    rotation=90,
-                    fontsize=8,
-                    alpha=0.7,
-                )
-
-    # Also plot -arccoth for reference (both branches)
+    for k, x_disc in tan_poles(-x_range, x_range, 2 * P):
+        ax.axvline(x=x_disc, color="r", linestyle="--", alpha=0.5, linewidth=0.5)
+        if P <= 10:  # Only label for smaller P values
+            ax.text(
+                x_disc,
+                y_view[1] * 0.8,
+                f"{k+0.5}π",
+                rotation=90,
+                fontsize=8,
+                alpha=0.7,
+            )
+
+    # Also plot -arccoth for reference (both branches, cached across subplots)
     # arccoth is defined for |x| > 1
-    x_arccoth_pos = np.linspace(1.1, x_range, 500)
-    y_arccoth_pos = -np.arctanh(1 / x_arccoth_pos)
-    ax.plot(x_arccoth_pos, y_arccoth_pos, "g--", linewidth=1, alpha=0.5, label="-arccoth(x)")
-
-    x_arccoth_neg = np.linspace(-x_range, -1.1, 500)
-    y_arccoth_neg = -np.arctanh(1 / x_arccoth_neg)
-    ax.plot(x_arccoth_neg, y_arccoth_neg, "g--", linewidth=1, alpha=0.5)
+    x_arccoth, y_arccoth = neg_arccoth_curve(-x_range, x_range, ylim=y_view)
+    ax.plot(x_arccoth, y_arccoth, "g--", linewidth=1, alpha=0.5, label="-arccoth(x)")
 
     ax.axhline(y=0, color="k", linestyle="-", alpha=0.3, linewidth=0.5)
     ax.axvline(x=0, color="k", linestyle="-", alpha=0.3, linewidth=0.5)
 
     ax.set_xlim(-x_range, x_range)
-    ax.set_ylim(-5, 5)
+    ax.set_ylim(*y_view)
     ax.set_xlabel("x", fontsize=10)
     ax.set_ylabel("y", fontsize=10)
 
@@ -87,7 +81,8 @@ plt.tight_layout()
 # Save to the same directory as the script
 script_dir = os.path.dirname(os.path.abspath(__file__))
 output_path = os.path.join(script_dir, "step1_stretch_tan.png")
-plt.savefig(output_path, dpi=100, bbox_inches="tight")
+# PNG plus SVG, responsive WebP/AVIF and a print-resolution copy
+export_figure(fig, output_path, dpi=100, script_name=os.path.basename(__file__), bbox_inches="tight")
 plt.close()
 
 print("Step 1: Stretching tan by 2-infinity")
@@ -0,0 +1,63 @@
+// Generated by scripts/figure_export.py from step2_shift_transform.py; do not edit.
+
+import step2ShiftTransformPng from './step2_shift_transform.png';
+import step2ShiftTransformSvg from './step2_shift_transform.svg';
+import step2ShiftTransformPrintPng from './step2_shift_transform-print.png';
+import step2ShiftTransform640Webp from './step2_shift_transform-640.webp';
+import step2ShiftTransform960Webp from './step2_shift_transform-960.webp';
+import step2ShiftTransform1280Webp from './step2_shift_transform-1280.webp';
+import step2ShiftTransform1920Webp from './step2_shift_transform-1920.webp';
+
+const figure = {
+  width: 1990,
+  height: 482,
+  fallback: {
+    bytes: 126844,
+    width: 1990,
+    height: 482,
+    src: step2ShiftTransformPng,
+  },
+  vector: {
+    bytes: 127589,
+    src: step2ShiftTransformSvg,
+  },
+  print: {
+    bytes: 236465,
+    width: 3980,
+    height: 959,
+    src: step2ShiftTransformPrintPng,
+  },
+  sources: [
+    {
+      type: 'image/webp',
+      srcSet: [
+        {
+          bytes: 12508,
+          width: 640,
+          height: 154,
+          src: step2ShiftTransform640Webp,
+        },
+        {
+          bytes: 22730,
+          width: 960,
+          height: 231,
+          src: step2ShiftTransform960Webp,
+        },
+        {
+          bytes: 35818,
+          width: 1280,
+          height: 308,
+          src: step2ShiftTransform1280Webp,
+        },
+        {
+          bytes: 58868,
+          width: 1920,
+          height: 463,
+          src: step2ShiftTransform1920Webp,
+        },
+      ],
+    },
+  ],
+};
+
+export default figure;
@@ -7,6 +7,12 @@ Shows how shifting by P (half the 2∞ period) creates the final transformation
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+import sys
+
+# figure_export lives in the repository's scripts/ directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "scripts"))
+from figure_export import export_figure
+from tan_sampling import neg_arccoth_curve, tan_curve
 
 # Set up the figure - 3 subplots now
 fig, axes = plt.subplots(1, 3, figsize=(20, 5))
@@ -19,44 +25,29 @@ x_range = 10
 for idx, P in enumerate(P_values):
     ax = axes[idx]
 
-    # Create x values centered at 0
-    x = np.linspace(-x_range, x_range, 2000)
-
     # First plot: phase 0 (no shift), Second and third plots: with shift of π/2
     if idx == 0:
         # Phase 0: just stretched, no shift
-        argument = x / (2 * P)
         shift_amount = 0
     else:
         # With shift of π/2
         shift_amount = np.pi / 2
-        argument = x / (2 * P) - shift_amount
-
-    y_tan_shifted = np.tan(argument)
 
-    # Handle discontinuities
-    y_tan_shifted_clean = np.where(np.abs(y_tan_shifted) > 10, np.nan, y_tan_shifted)
+    # tan(x/(2P) - shift), sampled adaptively with NaN breaks at the poles
+    x, y_tan_shifted = tan_curve(-x_range, x_range, 2 * P, shift_amount, ylim=(-2, 2))
 
     # Plot the transformed tan (dotted line)
     if idx == 0:
-        ax.plot(x, y_tan_shifted_clean, "b:", linewidth=2, label="tan(x/π)")
+        ax.plot(x, y_tan_shifted, "b:", linewidth=2, label="tan(x/π)")
     elif idx == 1:
-        ax.plot(x, y_tan_shifted_clean, "b:", linewidth=2, label="tan(x/π - π/2)")
+        ax.plot(x, y_tan_shifted, "b:", linewidth=2, label="tan(x/π - π/2)")
     else:
-        ax.plot(x, y_tan_shifted_clean, "b:", linewidth=2, label="tan(x/2π - π/2)")
+        ax.plot(x, y_tan_shifted, "b:", linewidth=2, label="tan(x/2π - π/2)")
 
     # Plot -arccoth(x) - unchanged throughout, both branches, dotted
-    # Positive branch
-    x_arccoth_pos = np.linspace(1.1, x_range, 500)
-    y_arccoth_pos = -np.arctanh(1 / x_arccoth_pos)  # -arccoth(x)
-    ax.plot(
-        x_arccoth_pos, y_arccoth_pos, "g:", linewidth=2, alpha=0.7, label="-arccoth(x)"
-    )
-
-    # Negative branch
-    x_arccoth_neg = np.linspace(-x_range, -1.1, 500)
-    y_arccoth_neg = -np.arctanh(1 / x_arccoth_neg)
-    ax.plot(x_arccoth_neg, y_arccoth_neg, "g:", linewidth=2, alpha=0.7)
+    # (evaluated once and shared by all three subplots)
+    x_arccoth, y_arccoth = neg_arccoth_curve(-x_range, x_range, ylim=(-2, 2))
+    ax.plot(x_arccoth, y_arccoth, "g:", linewidth=2, alpha=0.7, label="-arccoth(x)")
 
     # Mark -arccoth singularities at ±1 (always the same)
     ax.axvline(
@@ -122,7 +113,8 @@ plt.tight_layout()
 # Save to the same directory as the script
 script_dir = os.path.dirname(os.path.abspath(__file__))
 output_path = os.path.join(script_dir, "step2_shift_transform.png")
-plt.savefig(output_path, dpi=100, bbox_inches="tight")
+# PNG plus SVG, responsive WebP/AVIF and a print-resolution copy
+export_figure(fig, output_path, dpi=100, script_name=os.path.basename(__file__), bbox_inches="tight")
 plt.close()
 
 print("Step 2: The Complete Transformation")
@@ -146,3 +138,4 @@ print("  - The result: A single non-repeating branch that matches -arccoth!")
 print()
 print("Note: The exact relationship between P and a (the scaling in -arccoth(x/a))")
 print("      requires further investigation. Here we used a ≈ P for visualization.")
+print("      convergence_sweep.py sweeps P and a and fits a(P).")
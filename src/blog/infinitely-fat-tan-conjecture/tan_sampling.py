@@ -0,0 +1,140 @@
+"""
+Pole-aware adaptive sampling for the tan / -arccoth figures
+
+A uniform np.linspace grid spends most of its points where the curves are
+flat, and cutting it with np.where(np.abs(y) > 10, np.nan, y) ends every
+branch at an arbitrary height next to an asymptote. Here the singularities
+are computed analytically instead: each smooth branch is sampled on its own
+interval, refined only where the visible curve bends, and joined to the next
+branch through a NaN placed exactly at the pole, so matplotlib breaks the
+line there and nowhere else.
+
+Curves are cached by their parameters, so the -arccoth reference drawn in
+every subplot is evaluated once per script.
+"""
+
+import functools
+import math
+
+import numpy as np
+
+from shifted_tan import reduce_scalar, shifted_tan
+
+INITIAL_POINTS = 16   # per branch, before refinement
+TOLERANCE = 2e-4      # largest allowed chord error, as a fraction of the view
+MAX_DEPTH = 20        # refinement passes; each can halve an interval
+POLE_GAP = 1e-9       # distance kept from a tan pole, relative to the stretch
+LOG_POLE_GAP = 1e-14  # same for the logarithmic arccoth singularity
+VIEW_MARGIN = 0.01    # clip this far outside the view before measuring error
+
+
+def tan_poles(lo, hi, scale=1.0, shift=0.0):
+    """[(k, x)] for the poles of tan(x/scale - shift) with lo <= x <= hi
+
+    x/scale - shift = (k + 1/2)π, so x = scale·((k + 1/2)π + shift). The
+    shift is reduced modulo π first (k counts from the reduced shift), so
+    the poles stay exact for the huge shifts of the 1∞ limit.
+    """
+    shift = sum(reduce_scalar(shift))
+    first = math.ceil((lo / scale - shift) / np.pi - 0.5)
+    last = math.floor((hi / scale - shift) / np.pi - 0.5)
+    return [(k, scale * ((k + 0.5) * np.pi + shift)) for k in range(first, last + 1)]
+
+
+def refine(f, x, ylim, tol=TOLERANCE):
+    """Insert midpoints wherever the on-screen curve departs from its chords
+
+    The error of each interval is the distance of f(midpoint) from the chord,
+    measured in view units with y clipped just outside `ylim`, so points are
+    spent where the curve visibly bends and not on its off-screen tail.
+    """
+    x = np.asarray(x, dtype=float)
+    y = f(x)
+    width = x[-1] - x[0]
+    low, high = ylim
+    margin = VIEW_MARGIN * (high - low)
+
+    def view(values):
+        return np.clip(values, low - margin, high + margin) / (high - low)
+
+    todo = np.ones(len(x) - 1, dtype=bool)
+    for _ in range(MAX_DEPTH):
+        left = np.flatnonzero(todo)
+        if not len(left):
+            break
+        mid = (x[left] + x[left + 1]) / 2
+        y_mid = f(mid)
+        dx = (x[left + 1] - x[left]) / width
+        dy = view(y[left + 1]) - view(y[left])
+        deviation = np.abs(view(y_mid) - (view(y[left]) + view(y[left + 1])) / 2)
+        bent = deviation / np.hypot(1, dy / np.maximum(dx, np.finfo(float).tiny)) > tol
+
+        split = np.zeros(len(todo), dtype=bool)
+        split[left[bent]] = True
+        x = np.insert(x, left[bent] + 1, mid[bent])
+        y = np.insert(y, left[bent] + 1, y_mid[bent])
+        todo = np.repeat(split, np.where(split, 2, 1))
+    return x, y
+
+
+def trim_offscreen(x, y, ylim):
+    """Drop points inside runs that stay beyond the same edge of the view
+
+    A chord between two points above (or below) the view stays above it, so
+    only the first and last point of such a run affect the drawing.
+    """
+    side = np.where(y > ylim[1], 1, np.where(y < ylim[0], -1, 0))
+    keep = np.ones(len(x), dtype=bool)
+    keep[1:-1] = ~((side[1:-1] != 0) & (side[:-2] == side[1:-1]) & (side[2:] == side[1:-1]))
+    return x[keep], y[keep]
+
+
+def sample_branches(f, branches, ylim, tol=TOLERANCE):
+    """Sample f on each (lo, hi) branch and join them with NaN breaks
+
+    Consecutive branches are separated by one NaN point halfway between
+    them; for branches ending symmetrically around a pole that is the pole.
+    """
+    xs, ys = [], []
+    for lo, hi in branches:
+        if xs:
+            xs.append([(xs[-1][-1] + lo) / 2])
+            ys.append([np.nan])
+        x, y = refine(f, np.linspace(lo, hi, INITIAL_POINTS), ylim, tol)
+        x, y = trim_offscreen(x, y, ylim)
+        xs.append(x)
+        ys.append(y)
+    x, y = np.concatenate(xs), np.concatenate(ys)
+    # Shared between subplots through the cache, so keep them read-only
+    x.flags.writeable = False
+    y.flags.writeable = False
+    return x, y
+
+
+@functools.lru_cache(maxsize=None)
+def tan_curve(lo, hi, scale=1.0, shift=0.0, ylim=(-5, 5), tol=TOLERANCE):
+    """(x, y) for tan(x/scale - shift) on [lo, hi], broken at every pole"""
+    gap = POLE_GAP * abs(scale)
+    edges = [lo] + [x for _, x in tan_poles(lo, hi, scale, shift) for x in (x - gap, x + gap)] + [hi]
+    branches = [(a, b) for a, b in zip(edges[::2], edges[1::2]) if b > a]
+
+    def f(x):
+        return shifted_tan(x, scale, shift)
+
+    return sample_branches(f, branches, ylim, tol)
+
+
+@functools.lru_cache(maxsize=None)
+def neg_arccoth_curve(lo, hi, a=1.0, ylim=(-5, 5), tol=TOLERANCE):
+    """(x, y) for -arccoth(x/a) on [lo, hi]
+
+    arccoth is only real for |x| > a; both branches are sampled up to the
+    logarithmic singularities at ±a, with one NaN break across the gap.
+    """
+    edge = a * (1 + LOG_POLE_GAP)
+    branches = [(l, h) for l, h in ((lo, min(hi, -edge)), (max(lo, edge), hi)) if h > l]
+
+    def f(x):
+        return -np.arctanh(a / x)  # arccoth(x/a) = arctanh(a/x)
+
+    return sample_branches(f, branches, ylim, tol)
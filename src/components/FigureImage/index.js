@@ -0,0 +1,66 @@
+import PropTypes from 'prop-types';
+
+// Largest image a high-DPI screen would fetch for the figure at full width
+function largestRasterBytes({ width, sources }) {
+  return Math.max(
+    ...sources.map(({ srcSet }) => {
+      const sorted = [...srcSet].sort((a, b) => a.width - b.width);
+      const adequate = sorted.find((candidate) => candidate.width >= 2 * width);
+      return (adequate || sorted[sorted.length - 1]).bytes;
+    }),
+  );
+}
+
+// Renders a figure exported by scripts/figure_export.py: the SVG when it is
+// no heavier than the raster it replaces, otherwise AVIF/WebP picked by width,
+// and the high-DPI PNG when printing (the PDFs).
+function FigureImage({ figure, alt }) {
+  const { width, height, fallback, vector, sources } = figure;
+  const useVector = vector && (!sources.length || vector.bytes <= largestRasterBytes(figure));
+  const sizes = `(max-width: ${width}px) 100vw, ${width}px`;
+
+  return (
+    <picture>
+      <source media="print" srcSet={figure.print.src} />
+      {useVector ? (
+        <source type="image/svg+xml" srcSet={vector.src} />
+      ) : (
+        sources.map(({ type, srcSet }) => (
+          <source
+            key={type}
+            type={type}
+            srcSet={srcSet.map((candidate) => `${candidate.src} ${candidate.width}w`).join(', ')}
+            sizes={sizes}
+          />
+        ))
+      )}
+      <img src={fallback.src} alt={alt} width={width} height={height} style={{ width: '100%', height: 'auto' }} />
+    </picture>
+  );
+}
+
+const asset = PropTypes.shape({
+  src: PropTypes.string.isRequired,
+  bytes: PropTypes.number.isRequired,
+  width: PropTypes.number,
+  height: PropTypes.number,
+});
+
+FigureImage.propTypes = {
+  figure: PropTypes.shape({
+    width: PropTypes.number.isRequired,
+    height: PropTypes.number.isRequired,
+    fallback: asset.isRequired,
+    vector: asset,
+    print: asset.isRequired,
+    sources: PropTypes.arrayOf(
+      PropTypes.shape({
+        type: PropTypes.string.isRequired,
+        srcSet: PropTypes.arrayOf(asset).isRequired,
+      }),
+    ).isRequired,
+  }).isRequired,
+  alt: PropTypes.string.isRequired,
+};
+
+export default FigureImage;